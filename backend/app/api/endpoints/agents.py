@@ -3,6 +3,7 @@
 """
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
@@ -18,6 +19,8 @@ from app.crud.agent import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+_AGENT_LIST_ADAPTER = TypeAdapter(list[AgentResponse])
+
 
 @router.get("", response_model=AgentListResponse)
 async def list_agents_endpoint(
@@ -26,7 +29,7 @@ async def list_agents_endpoint(
 ):
     """사용자의 에이전트 목록을 반환합니다."""
     agents = await list_agents(db, current_user.id)
-    return AgentListResponse(agents=[AgentResponse.model_validate(a) for a in agents])
+    return AgentListResponse(agents=_AGENT_LIST_ADAPTER.validate_python(agents, from_attributes=True))
 
 
 @router.post("", response_model=AgentResponse)
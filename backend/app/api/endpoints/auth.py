@@ -4,6 +4,7 @@
 - 로그인
 - Rate Limiting (Redis 기반)
 """
+import asyncio
 import logging
 import json
 from fastapi import APIRouter, Depends, HTTPException, status, Request
@@ -11,7 +12,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
-from app.core.security import create_access_token, verify_password, get_dummy_hash
+from app.core.security import create_access_token, verify_password_constant_time
 from app.schemas.user import UserCreate, UserResponse, Token
 from app.crud.user import create_user, get_user_by_email
 from app.core.config import settings
@@ -307,13 +308,16 @@ async def login(
     # 1. 유저 조회
     user = await get_user_by_email(db, form_data.username)
 
-    # 2. 비밀번호 검증 (타이밍 공격 방지를 위해 항상 검증 수행)
-    if user:
-        password_valid = verify_password(form_data.password, user.hashed_password)
-    else:
-        # 사용자가 없어도 동일한 시간 소요하도록 더미 해시 검증
-        verify_password(form_data.password, get_dummy_hash())
-        password_valid = False
+    # 2. 비밀번호 검증 (사용자 유무와 무관하게 동일한 해시 연산, 워커 스레드에서 실행)
+    password_valid, new_hash = await asyncio.to_thread(
+        verify_password_constant_time,
+        form_data.password,
+        user.hashed_password if user else None,
+    )
+    if password_valid and new_hash:
+        # 구식(bcrypt) 해시 → argon2id로 자동 업그레이드
+        user.hashed_password = new_hash
+        await db.commit()
 
     if not user or not password_valid:
         logger.warning(f"로그인 실패: {form_data.username}")
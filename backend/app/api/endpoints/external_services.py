@@ -49,8 +49,8 @@ async def list_services(
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    services = await list_external_services(db, current_user.id)
-    return {"services": [_to_response(s) for s in services]}
+    rows = await list_external_services(db, current_user.id)
+    return {"services": [ExternalServiceResponse(**row._mapping) for row in rows]}
 
 
 @router.post("", response_model=ExternalServiceResponse)
@@ -2,14 +2,14 @@
 대화 피드백 API 엔드포인트
 """
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, and_, Integer
+from sqlalchemy import Row, select, func, and_, update, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.feedback import (
-    FeedbackCreate, FeedbackUpdate, FeedbackResponse, FeedbackListResponse,
-    TrainingDatasetCreate, TrainingDatasetResponse, DatasetListResponse
+    FeedbackCreate, FeedbackBatchCreate, FeedbackBatchResponse, FeedbackUpdate, FeedbackResponse, FeedbackListResponse,
+    TrainingDatasetCreate, TrainingDatasetResponse, DatasetListResponse, DatasetFormat,
 )
 from app.models.conversation_feedback import ConversationFeedback, TrainingDataset
 from app.models.user import User
@@ -52,15 +52,34 @@ async def create_feedback(
 
     db.add(new_feedback)
     await db.commit()
-    await db.refresh(new_feedback)
 
     logger.info(f"Feedback created: user={current_user.id}, session={feedback.session_id}, rating={feedback.rating}")
     return new_feedback
 
 
+@router.post("/feedback/batch", response_model=FeedbackBatchResponse)
+async def create_feedbacks_batch(
+    data: FeedbackBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """대화 피드백 일괄 생성 (단일 INSERT ... RETURNING)"""
+    for i, feedback in enumerate(data.feedbacks):
+        if feedback.rating is None and feedback.is_positive is None and not feedback.feedback_text:
+            raise HTTPException(400, f"feedbacks[{i}]: 평가 데이터가 없습니다 (rating, is_positive, feedback_text 중 하나는 필수)")
+
+    rows = [{**fb.model_dump(), "user_id": current_user.id} for fb in data.feedbacks]
+    ids = await ConversationFeedback.bulk_create(db, rows)
+    await db.commit()
+
+    logger.info(f"Feedback batch created: user={current_user.id}, count={len(ids)}")
+    return FeedbackBatchResponse(ids=ids)
+
+
 @router.get("/feedback", response_model=FeedbackListResponse)
 async def list_feedbacks(
     session_id: Optional[str] = Query(None, description="특정 세션만 필터링"),
+    kb_id: Optional[str] = Query(None, description="해당 KB를 사용한 피드백만 필터링"),
     min_rating: Optional[int] = Query(None, ge=1, le=5, description="최소 별점"),
     only_positive: Optional[bool] = Query(None, description="긍정 평가만"),
     skip: int = Query(0, ge=0),
@@ -74,6 +93,9 @@ async def list_feedbacks(
 
     if session_id:
         filters.append(ConversationFeedback.session_id == session_id)
+    if kb_id:
+        # kb_ids @> '["kb_id"]' — GIN 인덱스(ix_fb_kb_ids_gin)로 DB에서 필터링
+        filters.append(ConversationFeedback.kb_ids.contains([kb_id]))
     if min_rating:
         filters.append(ConversationFeedback.rating >= min_rating)
     if only_positive is True:
@@ -97,7 +119,7 @@ async def list_feedbacks(
 
     # 통계
     stats_stmt = select(
-        func.count(ConversationFeedback.id).label("total"),
+        func.count().label("total"),  # ix_fb_listing(INCLUDE rating, flags)만으로 계산
         func.sum(func.cast(ConversationFeedback.is_positive == True, Integer)).label("positive"),
         func.count(ConversationFeedback.rating).label("has_rating"),
         func.avg(ConversationFeedback.rating).label("avg_rating"),
@@ -166,7 +188,6 @@ async def update_feedback(
         feedback.is_included_in_training = update_data.is_included_in_training
 
     await db.commit()
-    await db.refresh(feedback)
 
     return feedback
 
@@ -288,31 +309,26 @@ async def build_dataset(
     if dataset.only_positive:
         filters.append(ConversationFeedback.is_positive == True)
 
-    # 피드백 조회
-    fb_stmt = select(ConversationFeedback).where(and_(*filters))
-    fb_result = await db.execute(fb_stmt)
-    feedbacks = fb_result.scalars().all()
-
-    # 데이터셋에 할당
-    for fb in feedbacks:
-        fb.dataset_id = dataset_id
-        fb.is_included_in_training = True
-
-    # 통계 업데이트
-    dataset.total_examples = len(feedbacks)
-    dataset.verified_examples = sum(1 for fb in feedbacks if fb.is_verified)
+    # 단일 UPDATE로 데이터셋에 할당 — total/verified 통계는 DB 트리거(trg_fb_dataset_counts)가 갱신
+    assign_stmt = (
+        update(ConversationFeedback)
+        .where(and_(*filters))
+        .values(dataset_id=dataset_id, is_included_in_training=True)
+        .execution_options(synchronize_session=False)
+    )
+    assigned = (await db.execute(assign_stmt)).rowcount
 
     await db.commit()
     await db.refresh(dataset)
 
-    logger.info(f"Dataset {dataset_id} built: {len(feedbacks)} examples")
-    return {"message": f"{len(feedbacks)}개 예제가 데이터셋에 추가되었습니다", "dataset": dataset}
+    logger.info(f"Dataset {dataset_id} built: {assigned} examples")
+    return {"message": f"{assigned}개 예제가 데이터셋에 추가되었습니다", "dataset": dataset}
 
 
 @router.get("/datasets/{dataset_id}/export")
 async def export_dataset(
     dataset_id: int,
-    format: str = Query("chat", pattern="^(chat|completion|instruction|tool_calling)$"),
+    format: DatasetFormat = Query("chat"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -332,15 +348,8 @@ async def export_dataset(
     if not dataset:
         raise HTTPException(404, "데이터셋을 찾을 수 없습니다")
 
-    # 데이터셋에 포함된 피드백 조회
-    fb_stmt = select(ConversationFeedback).where(
-        ConversationFeedback.dataset_id == dataset_id,
-        ConversationFeedback.is_included_in_training == True,
-    )
-    fb_result = await db.execute(fb_stmt)
-    feedbacks = fb_result.scalars().all()
-
-    if not feedbacks:
+    # total_examples는 트리거가 유지 → 피드백을 조회하지 않고 빈 데이터셋 판별
+    if not dataset.total_examples:
         raise HTTPException(400, "데이터셋이 비어있습니다. 먼저 빌드를 실행하세요.")
 
     # JSONL 생성
@@ -349,8 +358,9 @@ async def export_dataset(
 
     export_file = temp_dir / f"dataset_{dataset_id}_{format}.jsonl"
 
+    written = 0
     with open(export_file, "w", encoding="utf-8") as f:
-        for fb in feedbacks:
+        async for fb in iter_feedback_rows(db, dataset_id):
             if format == "chat":
                 # OpenAI chat format
                 entry = {
@@ -377,13 +387,14 @@ async def export_dataset(
                 }
 
             f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            written += 1
 
     # 경로 저장
     dataset.is_exported = True
     dataset.export_path = str(export_file)
     await db.commit()
 
-    logger.info(f"Dataset {dataset_id} exported: {len(feedbacks)} examples to {export_file}")
+    logger.info(f"Dataset {dataset_id} exported: {written} examples to {export_file}")
 
     return FileResponse(
         path=export_file,
@@ -419,6 +430,30 @@ async def delete_dataset(
 # 헬퍼 함수
 # ============================================================
 
+_EXPORT_YIELD_PER = 1000
+
+
+async def iter_feedback_rows(db: AsyncSession, dataset_id: int) -> AsyncIterator[Row]:
+    """데이터셋 피드백을 내보내기에 필요한 컬럼만 서버측 커서로 반환합니다.
+    ORM 객체를 만들지 않고 1000행 단위로 가져오므로 데이터셋 크기와 무관하게 메모리 사용이 일정합니다."""
+    stmt = (
+        select(
+            ConversationFeedback.user_message,
+            ConversationFeedback.ai_message,
+            ConversationFeedback.tool_calls_json,
+        )
+        .where(
+            ConversationFeedback.dataset_id == dataset_id,
+            ConversationFeedback.is_included_in_training == True,
+        )
+        .order_by(ConversationFeedback.id)
+        .execution_options(yield_per=_EXPORT_YIELD_PER)
+    )
+    result = await db.stream(stmt)
+    async for row in result:
+        yield row
+
+
 def _build_tool_calling_entry(fb) -> dict:
     """
     피드백을 Qwen2.5 tool calling 학습 데이터 형식으로 변환합니다.
@@ -8,7 +8,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -26,6 +26,8 @@ from app.services.finetuning_service import FineTuningService
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+_JOB_LIST_ADAPTER = TypeAdapter(list[FineTuningJobResponse])
+
 
 # ============================================================
 # 백그라운드 태스크
@@ -253,7 +255,6 @@ async def create_finetuning_job(
 
     db.add(new_job)
     await db.commit()
-    await db.refresh(new_job)
 
     from app.core.config import settings
 
@@ -301,7 +302,9 @@ async def list_finetuning_jobs(
     )
     result = await db.execute(stmt)
     jobs = result.scalars().all()
-    return {"jobs": jobs, "total": len(jobs)}
+    return FineTuningJobListResponse(
+        jobs=_JOB_LIST_ADAPTER.validate_python(jobs, from_attributes=True), total=len(jobs)
+    )
 
 
 @router.get("/jobs/{job_id}", response_model=FineTuningJobResponse)
@@ -1,13 +1,25 @@
 import os
+import json
+import time
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Optional
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from qdrant_client import models as qdrant_models
+from qdrant_client.http.exceptions import UnexpectedResponse
 from app.services.ingestion import get_ingestion_service
-from app.services.graph_store import get_graph_store_service
-from app.services.vector_store import get_vector_store_service
+from app.services.graph_store import GraphStoreService, get_graph_store_service
+from app.services.vector_store import VectorStoreService, get_vector_store_service
 from app.services.qdrant_resolver import resolve_qdrant_client
+from app.services.vdb.qdrant_store import quantization_search_params
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.core.config import settings
@@ -23,7 +35,7 @@ from app.schemas.knowledge_base import (
 from app.crud.knowledge_base import (
     list_knowledge_bases, get_knowledge_base, create_knowledge_base,
     update_knowledge_base, delete_knowledge_base as crud_delete_kb,
-    create_knowledge_file, get_files_for_kb,
+    create_knowledge_file, stream_files_for_kb,
 )
 from app.crud.user_settings import get_user_settings
 
@@ -31,6 +43,103 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_KB_LIST_ADAPTER = TypeAdapter(list[KnowledgeBaseResponse])
+
+# Cache: (collection_name, user_id) -> (QdrantStore, created_timestamp) — 최근 사용 순 LRU
+_image_store_cache: "OrderedDict[Tuple[str, int], Tuple[object, float]]" = OrderedDict()
+_IMAGE_STORE_TTL_SECONDS = 300  # 5분
+_IMAGE_STORE_MAXSIZE = 256
+
+
+def _get_image_search_store(client, collection_name: str, user_id: int, embeddings):
+    """이미지 검색용 QdrantStore를 (컬렉션, 사용자) 단위로 재사용합니다."""
+    from app.services.vdb.qdrant_store import QdrantStore
+
+    key = (collection_name, user_id)
+    now = time.time()
+    cached = _image_store_cache.get(key)
+    if cached is not None:
+        store, created_at = cached
+        # 클라이언트가 바뀐 경우(외부 Qdrant 재연결 등)에도 새로 생성
+        if store.client is client and now - created_at < _IMAGE_STORE_TTL_SECONDS:
+            _image_store_cache.move_to_end(key)
+            return store
+        del _image_store_cache[key]
+
+    store = QdrantStore(
+        client=client,
+        collection_name=collection_name,
+        embeddings=embeddings,
+        embedding_dimension=settings.EMBEDDING_DIMENSION,
+        user_id=user_id,
+    )
+    for expired in [k for k, (_, t) in _image_store_cache.items() if now - t >= _IMAGE_STORE_TTL_SECONDS]:
+        del _image_store_cache[expired]
+    _image_store_cache[key] = (store, now)
+    while len(_image_store_cache) > _IMAGE_STORE_MAXSIZE:
+        _image_store_cache.popitem(last=False)
+    return store
+
+
+# Cache: (user_id, kb_id, source) -> (total, created_timestamp)
+# 청크 페이지 스크롤 시 매 요청마다 count RPC를 보내지 않도록 짧게 캐시
+_total_cache: dict[Tuple[int, str, Optional[str]], Tuple[int, float]] = {}
+_TOTAL_CACHE_TTL_SECONDS = 30
+_TOTAL_CACHE_MAXSIZE = 4096
+
+
+def _get_cached_total(user_id: int, kb_id: str, source: Optional[str]) -> Optional[int]:
+    key = (user_id, kb_id, source)
+    cached = _total_cache.get(key)
+    if cached is not None:
+        total, created_at = cached
+        if time.time() - created_at < _TOTAL_CACHE_TTL_SECONDS:
+            return total
+        del _total_cache[key]
+    return None
+
+
+def _set_cached_total(user_id: int, kb_id: str, source: Optional[str], total: int):
+    if len(_total_cache) >= _TOTAL_CACHE_MAXSIZE:
+        # 가장 오래된 항목 제거 (dict 삽입 순서)
+        _total_cache.pop(next(iter(_total_cache)), None)
+    _total_cache[(user_id, kb_id, source)] = (total, time.time())
+
+
+def _invalidate_total_cache(user_id: int, kb_id: str):
+    """KB의 청크 수가 바뀌면 해당 KB의 모든 source 캐시를 무효화합니다."""
+    for key in [k for k in _total_cache if k[0] == user_id and k[1] == kb_id]:
+        _total_cache.pop(key, None)
+
+
+# 존재가 확인된 컬렉션: collection_name -> 확인 시각
+# TTL 동안은 사전 collection_exists RPC 없이 바로 조회 (다른 워커/관리자가 삭제한 경우 TTL 후 재확인,
+# 그 전에 "not found" 응답을 받으면 즉시 제거). kb_{kb_id} 이름은 KB마다 고유하므로 클라이언트와 무관
+_known_collections: dict[str, float] = {}
+_KNOWN_COLLECTION_TTL_SECONDS = 60
+
+
+def _is_collection_missing(e: Exception) -> bool:
+    """Qdrant 작업이 컬렉션 부재(404)로 실패했는지 확인합니다."""
+    return isinstance(e, UnexpectedResponse) and e.status_code == 404
+
+
+def _collection_exists(client, collection_name: str) -> bool:
+    """TTL 내에 존재가 확인된 컬렉션은 RPC 없이 True를 반환합니다."""
+    now = time.time()
+    checked_at = _known_collections.get(collection_name)
+    if checked_at is not None and now - checked_at < _KNOWN_COLLECTION_TTL_SECONDS:
+        return True
+    if client.collection_exists(collection_name):
+        _known_collections[collection_name] = now
+        return True
+    _known_collections.pop(collection_name, None)
+    return False
+
+
+def _forget_collection(collection_name: str):
+    _known_collections.pop(collection_name, None)
+
 
 # ============================================================
 # 지식 베이스 CRUD
@@ -43,7 +152,7 @@ async def list_bases(
 ):
     """사용자의 지식 베이스 목록을 반환합니다."""
     rows = await list_knowledge_bases(db, current_user.id)
-    return KnowledgeBaseListResponse(bases=[KnowledgeBaseResponse(**r) for r in rows])
+    return KnowledgeBaseListResponse(bases=_KB_LIST_ADAPTER.validate_python(rows))
 
 
 @router.post("/bases", response_model=KnowledgeBaseResponse)
@@ -130,12 +239,14 @@ async def delete_base(
     deleted = await crud_delete_kb(db, current_user.id, kb_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="지식 베이스를 찾을 수 없습니다.")
+    _invalidate_total_cache(current_user.id, kb_id)
 
     # Qdrant 컬렉션 삭제
     try:
         vector_service = get_vector_store_service()
         client = vector_service.get_client(ext_client)
         collection_name = f"kb_{kb_id}"
+        _forget_collection(collection_name)
         if client.collection_exists(collection_name):
             client.delete_collection(collection_name)
             logger.info(f"Qdrant collection deleted: {collection_name}")
@@ -233,6 +344,9 @@ async def upload_file(
         file_record_id=file_record_id,
         vision_model=vision_model,
     )
+    # 청크 수가 바뀌므로 업로드 시점과 인덱싱 완료 후(백그라운드 태스크는 순서대로 실행) 모두 무효화
+    _invalidate_total_cache(current_user.id, kb_id)
+    background_tasks.add_task(_invalidate_total_cache, current_user.id, kb_id)
 
     return {
         "message": f"파일({original_filename}) 업로드가 시작되었습니다. 백그라운드에서 처리 중입니다.",
@@ -249,17 +363,15 @@ async def upload_file(
 async def get_files_list(
     kb_id: str,
     current_user: User = Depends(get_current_user),
+    vector_service: VectorStoreService = Depends(get_vector_store_service),
     db: AsyncSession = Depends(get_db),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 여부"),
 ):
     """지식 베이스의 소스 파일 목록과 파일별 청크 수를 반환합니다."""
     ext_client = await resolve_qdrant_client(db, current_user.id, kb_id)
-    vector_service = get_vector_store_service()
     client = vector_service.get_client(ext_client)
     collection_name = f"kb_{kb_id}"
 
-    if not client.collection_exists(collection_name):
-        return {"files": [], "kb_id": kb_id}
-
     user_filter = qdrant_models.Filter(
         must=[qdrant_models.FieldCondition(
             key="metadata.user_id",
@@ -269,38 +381,46 @@ async def get_files_list(
 
     # 최대 2000개 스캔하여 고유 소스 파일과 청크 수 집계 (이미지 메타데이터 포함)
     file_data = {}  # source -> {count, metadata}
-    scroll_offset = None
-    scanned = 0
-    while scanned < 2000:
-        points, next_off = client.scroll(
-            collection_name=collection_name,
-            scroll_filter=user_filter,
-            limit=200,
-            offset=scroll_offset,
-            with_payload=True,  # 전체 payload 가져오기
-            with_vectors=False,
-        )
-        if not points:
-            break
-        for p in points:
-            metadata = (p.payload or {}).get("metadata", {})
-            src = metadata.get("source", "unknown")
-
-            if src not in file_data:
-                # 첫 번째 청크 메타데이터 저장 (이미지 정보 포함)
-                file_data[src] = {
-                    "count": 0,
-                    "content_type": metadata.get("content_type", "text"),
-                    "thumbnail_path": metadata.get("thumbnail_path"),
-                    "image_path": metadata.get("image_path"),
-                    "image_size": metadata.get("image_size"),
-                    "image_dimensions": metadata.get("image_dimensions"),
-                }
-            file_data[src]["count"] += 1
-        scanned += len(points)
-        scroll_offset = next_off
-        if not next_off:
-            break
+    try:
+        scroll_offset = None
+        scanned = 0
+        while scanned < 2000:
+            points, next_off = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=user_filter,
+                limit=200,
+                offset=scroll_offset,
+                with_payload=True,  # 전체 payload 가져오기
+                with_vectors=False,
+            )
+            if not points:
+                break
+            for p in points:
+                metadata = (p.payload or {}).get("metadata", {})
+                src = metadata.get("source", "unknown")
+
+                if src not in file_data:
+                    # 첫 번째 청크 메타데이터 저장 (이미지 정보 포함)
+                    file_data[src] = {
+                        "count": 0,
+                        "content_type": metadata.get("content_type", "text"),
+                        "thumbnail_path": metadata.get("thumbnail_path"),
+                        "image_path": metadata.get("image_path"),
+                        "image_size": metadata.get("image_size"),
+                        "image_dimensions": metadata.get("image_dimensions"),
+                    }
+                file_data[src]["count"] += 1
+            scanned += len(points)
+            scroll_offset = next_off
+            if not next_off:
+                break
+    except UnexpectedResponse as e:
+        if not _is_collection_missing(e):
+            raise
+        # 컬렉션이 아직 없음
+        if stream:
+            return _ndjson_response("file", [], {"kb_id": kb_id})
+        return {"files": [], "kb_id": kb_id}
 
     files = []
     qdrant_sources = set()
@@ -332,8 +452,7 @@ async def get_files_list(
     kb_row = await get_knowledge_base(db, current_user.id, kb_id)
     if kb_row:
         try:
-            db_files = await get_files_for_kb(db, kb_row.id)
-            for kf in db_files:
+            async for kf in stream_files_for_kb(db, kb_row.id):
                 if kf.original_filename not in qdrant_sources and kf.status in ("processing", "error"):
                     files.append({
                         "source": kf.original_filename,
@@ -346,6 +465,8 @@ async def get_files_list(
         except Exception as e:
             logger.warning(f"DB 파일 목록 조회 실패 (무시): {e}")
 
+    if stream:
+        return _ndjson_response("file", files, {"kb_id": kb_id})
     return {"files": files, "kb_id": kb_id}
 
 
@@ -354,17 +475,14 @@ async def delete_file_chunks(
     kb_id: str,
     source: str = Query(..., description="삭제할 소스 파일 경로"),
     current_user: User = Depends(get_current_user),
+    vector_service: VectorStoreService = Depends(get_vector_store_service),
     db: AsyncSession = Depends(get_db),
 ):
     """소스 파일에 해당하는 모든 청크를 Qdrant에서 영구 삭제합니다."""
     ext_client = await resolve_qdrant_client(db, current_user.id, kb_id)
-    vector_service = get_vector_store_service()
     client = vector_service.get_client(ext_client)
     collection_name = f"kb_{kb_id}"
 
-    if not client.collection_exists(collection_name):
-        raise HTTPException(status_code=404, detail="컬렉션이 존재하지 않습니다.")
-
     delete_filter = qdrant_models.Filter(
         must=[
             qdrant_models.FieldCondition(
@@ -379,11 +497,16 @@ async def delete_file_chunks(
     )
 
     # 삭제 전 개수 확인
-    before_count = client.count(
-        collection_name=collection_name,
-        count_filter=delete_filter,
-        exact=True
-    ).count
+    try:
+        before_count = client.count(
+            collection_name=collection_name,
+            count_filter=delete_filter,
+            exact=True
+        ).count
+    except UnexpectedResponse as e:
+        if not _is_collection_missing(e):
+            raise
+        raise HTTPException(status_code=404, detail="컬렉션이 존재하지 않습니다.")
 
     if before_count == 0:
         raise HTTPException(status_code=404, detail="해당 파일의 청크가 없습니다.")
@@ -394,6 +517,8 @@ async def delete_file_chunks(
         points_selector=qdrant_models.FilterSelector(filter=delete_filter),
     )
 
+    _invalidate_total_cache(current_user.id, kb_id)
+
     logger.info(f"Deleted {before_count} chunks for source={source} in {collection_name} by user {current_user.id}")
 
     return {
@@ -404,25 +529,67 @@ async def delete_file_chunks(
     }
 
 
+def _format_chunk(point, with_score: bool = False) -> dict:
+    """Qdrant point를 청크 응답 dict로 변환합니다."""
+    payload = point.payload or {}
+    meta = payload.get("metadata", {})
+    content_type = meta.get("content_type", "text")
+    chunk_data = {
+        "id": str(point.id),
+        "text": payload.get("page_content", ""),
+        "metadata": meta,
+        "chunk_index": meta.get("chunk_index", 0),
+        "source": meta.get("source", "unknown"),
+    }
+    if with_score:
+        # query_points는 항상 ScoredPoint를 반환하므로 score 속성이 존재함
+        score = point.score
+        chunk_data["score"] = round(score, 4) if score is not None else None
+    chunk_data["content_type"] = content_type
+    # 이미지 메타데이터 추가
+    if content_type == "image":
+        chunk_data.update({
+            "image_path": meta.get("image_path"),
+            "thumbnail_path": meta.get("thumbnail_path"),
+            "caption": meta.get("caption"),
+            "ocr_text": meta.get("ocr_text"),
+            "image_dimensions": meta.get("image_dimensions"),
+        })
+    return chunk_data
+
+
+def _ndjson_response(kind: str, rows, tail: dict) -> StreamingResponse:
+    """
+    행 단위 NDJSON 스트리밍 응답을 생성합니다.
+
+    각 행은 {"type": kind, kind: {...}} 한 줄로 전송되고,
+    마지막 줄에 {"type": "done", ...tail} 이 전송됩니다.
+    """
+    def _stream():
+        for row in rows:
+            yield json.dumps({"type": kind, kind: row}, ensure_ascii=False) + "\n"
+        yield json.dumps({"type": "done", **tail}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
 @router.get("/{kb_id}/chunks")
 async def get_chunks(
     kb_id: str,
     current_user: User = Depends(get_current_user),
+    vector_service: VectorStoreService = Depends(get_vector_store_service),
     db: AsyncSession = Depends(get_db),
     offset: Optional[str] = Query(None, description="페이지 오프셋 (Qdrant point ID)"),
     limit: int = Query(20, ge=1, le=100, description="페이지당 청크 수"),
     search: Optional[str] = Query(None, description="청크 내용 검색어 (시맨틱 검색)"),
     source: Optional[str] = Query(None, description="소스 파일 경로 필터"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 여부"),
 ):
     """지식 베이스의 청크를 조회합니다."""
     ext_client = await resolve_qdrant_client(db, current_user.id, kb_id)
-    vector_service = get_vector_store_service()
     client = vector_service.get_client(ext_client)
     collection_name = f"kb_{kb_id}"
 
-    if not client.collection_exists(collection_name):
-        return {"chunks": [], "total": 0, "next_offset": None, "kb_id": kb_id}
-
     filter_conditions = [
         qdrant_models.FieldCondition(
             key="metadata.user_id",
@@ -439,87 +606,76 @@ async def get_chunks(
 
     user_filter = qdrant_models.Filter(must=filter_conditions)
 
-    # 총 개수
-    total = client.count(
-        collection_name=collection_name,
-        count_filter=user_filter,
-        exact=True
-    ).count
+    def _count_total() -> int:
+        return client.count(
+            collection_name=collection_name,
+            count_filter=user_filter,
+            exact=False
+        ).count
 
-    chunks = []
+    # 총 개수 (근사값, 짧은 TTL 캐시)
+    total = _get_cached_total(current_user.id, kb_id, source)
 
-    if search and search.strip():
-        # 시맨틱 검색 (named vector "dense" 사용)
-        query_vector = vector_service.embeddings.embed_query(search)
-        results = client.query_points(
-            collection_name=collection_name,
-            query=query_vector,
-            using="dense",
-            query_filter=user_filter,
-            limit=limit,
-            with_payload=True,
-        )
-        for point in results.points:
-            payload = point.payload or {}
-            meta = payload.get("metadata", {})
-            chunk_data = {
-                "id": str(point.id),
-                "text": payload.get("page_content", ""),
-                "metadata": meta,
-                "chunk_index": meta.get("chunk_index", 0),
-                "source": meta.get("source", "unknown"),
-                "score": round(point.score, 4) if hasattr(point, 'score') and point.score else None,
-                "content_type": meta.get("content_type", "text"),
-            }
-            # 이미지 메타데이터 추가
-            if meta.get("content_type") == "image":
-                chunk_data.update({
-                    "image_path": meta.get("image_path"),
-                    "thumbnail_path": meta.get("thumbnail_path"),
-                    "caption": meta.get("caption"),
-                    "ocr_text": meta.get("ocr_text"),
-                    "image_dimensions": meta.get("image_dimensions"),
-                })
-            chunks.append(chunk_data)
-        return {"chunks": chunks, "total": total, "next_offset": None, "kb_id": kb_id}
-    else:
-        # 스크롤 (페이지네이션)
-        scroll_offset = offset if offset else None
-        points, next_offset = client.scroll(
-            collection_name=collection_name,
-            scroll_filter=user_filter,
-            limit=limit,
-            offset=scroll_offset,
-            with_payload=True,
-            with_vectors=False,
-        )
-        for point in points:
-            payload = point.payload or {}
-            meta = payload.get("metadata", {})
-            chunk_data = {
-                "id": str(point.id),
-                "text": payload.get("page_content", ""),
-                "metadata": meta,
-                "chunk_index": meta.get("chunk_index", 0),
-                "source": meta.get("source", "unknown"),
-                "content_type": meta.get("content_type", "text"),
-            }
-            # 이미지 메타데이터 추가
-            if meta.get("content_type") == "image":
-                chunk_data.update({
-                    "image_path": meta.get("image_path"),
-                    "thumbnail_path": meta.get("thumbnail_path"),
-                    "caption": meta.get("caption"),
-                    "ocr_text": meta.get("ocr_text"),
-                    "image_dimensions": meta.get("image_dimensions"),
-                })
-            chunks.append(chunk_data)
-        return {
-            "chunks": chunks,
-            "total": total,
-            "next_offset": str(next_offset) if next_offset else None,
-            "kb_id": kb_id
-        }
+    is_search = bool(search and search.strip())
+    try:
+        if is_search:
+            # 시맨틱 검색: 쿼리 임베딩과 count RPC를 병렬 실행
+            embed_task = asyncio.to_thread(vector_service.embeddings.embed_query, search)
+            if total is None:
+                query_vector, total = await asyncio.gather(embed_task, asyncio.to_thread(_count_total))
+                _set_cached_total(current_user.id, kb_id, source, total)
+            else:
+                query_vector = await embed_task
+
+            # named vector "dense" 사용
+            results = await asyncio.to_thread(
+                client.query_points,
+                collection_name=collection_name,
+                query=query_vector,
+                using="dense",
+                query_filter=user_filter,
+                limit=limit,
+                with_payload=True,
+                search_params=quantization_search_params(),
+            )
+            points = results.points
+            next_offset = None
+        else:
+            if total is None:
+                total = _count_total()
+                _set_cached_total(current_user.id, kb_id, source, total)
+
+            # 스크롤 (페이지네이션)
+            scroll_offset = offset if offset else None
+            points, next_offset = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=user_filter,
+                limit=limit,
+                offset=scroll_offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+    except UnexpectedResponse as e:
+        if not _is_collection_missing(e):
+            raise
+        # 컬렉션이 아직 없음
+        if stream:
+            return _ndjson_response("chunk", [], {"total": 0, "next_offset": None, "kb_id": kb_id})
+        return {"chunks": [], "total": 0, "next_offset": None, "kb_id": kb_id}
+
+    tail = {
+        "total": total,
+        "next_offset": str(next_offset) if next_offset else None,
+        "kb_id": kb_id,
+    }
+
+    # 스트리밍: point를 변환하는 대로 한 줄씩 전송 (전체 리스트 미생성)
+    if stream:
+        rows = (_format_chunk(point, with_score=is_search) for point in points)
+        return _ndjson_response("chunk", rows, tail)
+
+    chunks = [_format_chunk(point, with_score=is_search) for point in points]
+    return {"chunks": chunks, **tail}
 
 
 # ============================================================
@@ -530,31 +686,37 @@ async def get_chunks(
 async def get_kb_stats(
     kb_id: str,
     current_user: User = Depends(get_current_user),
+    graph_service: GraphStoreService = Depends(get_graph_store_service),
+    vector_service: VectorStoreService = Depends(get_vector_store_service),
     db: AsyncSession = Depends(get_db),
 ):
     """지식 베이스의 통계를 반환합니다."""
     ext_client = await resolve_qdrant_client(db, current_user.id, kb_id)
-    vector_service = get_vector_store_service()
     client = vector_service.get_client(ext_client)
-    graph_service = get_graph_store_service()
     collection_name = f"kb_{kb_id}"
 
     # 청크 수
     chunk_count = 0
     file_count = 0
-    if client.collection_exists(collection_name):
-        user_filter = qdrant_models.Filter(
-            must=[qdrant_models.FieldCondition(
-                key="metadata.user_id",
-                match=qdrant_models.MatchValue(value=current_user.id)
-            )]
-        )
+    user_filter = qdrant_models.Filter(
+        must=[qdrant_models.FieldCondition(
+            key="metadata.user_id",
+            match=qdrant_models.MatchValue(value=current_user.id)
+        )]
+    )
+    try:
         chunk_count = client.count(
             collection_name=collection_name,
             count_filter=user_filter,
             exact=True
         ).count
+        collection_found = True
+    except UnexpectedResponse as e:
+        if not _is_collection_missing(e):
+            raise
+        collection_found = False
 
+    if collection_found:
         # 고유 소스 파일 수 (최대 500개 스캔)
         try:
             points, _ = client.scroll(
@@ -612,9 +774,9 @@ async def get_kb_stats(
 async def get_graph_data(
     kb_id: str = Query("default_kb"),
     current_user: User = Depends(get_current_user),
+    graph_service: GraphStoreService = Depends(get_graph_store_service),
 ):
     """지식 베이스의 그래프 데이터를 조회합니다."""
-    graph_service = get_graph_store_service()
 
     if not graph_service.graph:
         return {"nodes": [], "edges": [], "message": "Neo4j에 연결되어 있지 않습니다."}
@@ -673,9 +835,9 @@ async def create_graph_node(
     node: NodeCreate,
     kb_id: str = Query("default_kb"),
     current_user: User = Depends(get_current_user),
+    graph_service: GraphStoreService = Depends(get_graph_store_service),
 ):
     """그래프에 노드를 추가합니다."""
-    graph_service = get_graph_store_service()
     if not graph_service.graph:
         raise HTTPException(status_code=503, detail="Neo4j에 연결되어 있지 않습니다.")
 
@@ -711,9 +873,9 @@ async def update_graph_node(
     node_id: str,
     node: NodeUpdate,
     current_user: User = Depends(get_current_user),
+    graph_service: GraphStoreService = Depends(get_graph_store_service),
 ):
     """그래프 노드를 수정합니다."""
-    graph_service = get_graph_store_service()
     if not graph_service.graph:
         raise HTTPException(status_code=503, detail="Neo4j에 연결되어 있지 않습니다.")
 
@@ -755,9 +917,9 @@ async def update_graph_node(
 async def delete_graph_node(
     node_id: str,
     current_user: User = Depends(get_current_user),
+    graph_service: GraphStoreService = Depends(get_graph_store_service),
 ):
     """그래프 노드와 연결된 관계를 삭제합니다."""
-    graph_service = get_graph_store_service()
     if not graph_service.graph:
         raise HTTPException(status_code=503, detail="Neo4j에 연결되어 있지 않습니다.")
 
@@ -781,9 +943,9 @@ async def create_graph_edge(
     edge: EdgeCreate,
     kb_id: str = Query("default_kb"),
     current_user: User = Depends(get_current_user),
+    graph_service: GraphStoreService = Depends(get_graph_store_service),
 ):
     """그래프에 관계(엣지)를 추가합니다."""
-    graph_service = get_graph_store_service()
     if not graph_service.graph:
         raise HTTPException(status_code=503, detail="Neo4j에 연결되어 있지 않습니다.")
 
@@ -817,9 +979,9 @@ async def create_graph_edge(
 async def delete_graph_edge(
     edge_id: str,
     current_user: User = Depends(get_current_user),
+    graph_service: GraphStoreService = Depends(get_graph_store_service),
 ):
     """그래프 관계(엣지)를 삭제합니다."""
-    graph_service = get_graph_store_service()
     if not graph_service.graph:
         raise HTTPException(status_code=503, detail="Neo4j에 연결되어 있지 않습니다.")
 
@@ -839,52 +1001,51 @@ async def delete_graph_edge(
 # 멀티모달 검색 (이미지로 검색)
 # ============================================================
 
-@router.post("/{kb_id}/search-by-image")
-async def search_by_image(
-    kb_id: str,
-    image: UploadFile = File(...),
-    content_type_filter: Optional[str] = Query(None, description="text | image | None (둘 다)"),
-    top_k: int = Query(5, ge=1, le=20, description="반환할 문서 수"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """
-    이미지를 업로드하여 CLIP 기반 멀티모달 검색을 수행합니다.
+# 진행 중인 이미지 검색: (sha256, user_id, kb_id, filter, top_k) -> Task
+_inflight_image_searches: dict[tuple, asyncio.Task] = {}
 
-    Args:
-        kb_id: 지식 베이스 ID
-        image: 검색할 이미지 파일
-        content_type_filter: "text" (텍스트만), "image" (이미지만), None (둘 다)
-        top_k: 반환할 결과 수
 
-    Returns:
-        검색된 문서 리스트 (텍스트 청크 또는 이미지)
-    """
-    import tempfile
-    from pathlib import Path
-    from app.services.clip_embeddings import get_clip_embeddings
-    from app.services.vdb.qdrant_store import QdrantStore
+def _forget_inflight(key: tuple, task: asyncio.Task) -> None:
+    if _inflight_image_searches.get(key) is task:
+        del _inflight_image_searches[key]
+    if not task.cancelled():
+        task.exception()  # 대기자가 모두 취소돼도 "never retrieved" 경고 방지
 
-    # 이미지 파일 검증
-    ext = Path(image.filename or "").suffix.lower()
-    if ext not in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
-        raise HTTPException(400, f"지원하지 않는 이미지 형식입니다: {ext}")
 
-    # Qdrant 클라이언트 resolve
-    ext_client = await resolve_qdrant_client(db, current_user.id, kb_id)
-    vector_service = get_vector_store_service()
-    client = vector_service.get_client(ext_client)
-    collection_name = f"kb_{kb_id}"
+async def _single_flight(key: tuple, factory):
+    """
+    같은 key의 요청이 진행 중이면 그 결과를 기다려 공유하고,
+    없으면 factory()를 별도 태스크로 실행합니다.
 
-    if not client.collection_exists(collection_name):
-        raise HTTPException(404, "지식 베이스가 존재하지 않습니다.")
+    모든 요청이 태스크를 shield로 기다리므로, 먼저 시작한 요청이 취소(클라이언트 연결 종료)되어도
+    검색은 계속되고 나머지 대기 요청은 정상적으로 결과를 받습니다.
+    """
+    task = _inflight_image_searches.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        _inflight_image_searches[key] = task
+        task.add_done_callback(functools.partial(_forget_inflight, key))
+    return await asyncio.shield(task)
+
+
+async def _run_image_search(
+    content: bytes,
+    ext: str,
+    client,
+    collection_name: str,
+    user_id: int,
+    embeddings,
+    content_type_filter: Optional[str],
+    top_k: int,
+) -> list:
+    """이미지 바이트로 CLIP 임베딩을 만들고 멀티모달 검색 결과를 포맷팅합니다."""
+    from app.services.clip_embeddings import get_clip_embeddings
 
     # 임시 파일로 저장
     temp_file = None
     try:
         # 이미지 임시 저장
         with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            content = await image.read()
             tmp.write(content)
             temp_file = tmp.name
 
@@ -892,16 +1053,9 @@ async def search_by_image(
         clip = get_clip_embeddings()
         query_vector = clip.embed_image(temp_file)
 
-        # QdrantStore를 통해 멀티모달 검색
-        store = QdrantStore(
-            client=client,
-            collection_name=collection_name,
-            embeddings=vector_service.embeddings,
-            embedding_dimension=settings.EMBEDDING_DIMENSION,
-            user_id=current_user.id,
-        )
+        # QdrantStore를 통해 멀티모달 검색 (캐시된 store 재사용)
+        store = _get_image_search_store(client, collection_name, user_id, embeddings)
 
-        import asyncio
         results = await asyncio.get_running_loop().run_in_executor(
             None,
             lambda: asyncio.run(store.multimodal_search(
@@ -923,20 +1077,79 @@ async def search_by_image(
                 "image_path": metadata.get("image_path") if metadata.get("content_type") == "image" else None,
                 "image_dimensions": metadata.get("image_dimensions") if metadata.get("content_type") == "image" else None,
             })
+        return formatted_results
+
+    finally:
+        # 임시 파일 삭제
+        if temp_file and Path(temp_file).exists():
+            Path(temp_file).unlink()
 
-        return {
-            "kb_id": kb_id,
-            "query_type": "image",
-            "content_type_filter": content_type_filter,
-            "results": formatted_results,
-            "total": len(formatted_results),
-        }
 
+@router.post("/{kb_id}/search-by-image")
+async def search_by_image(
+    kb_id: str,
+    image: UploadFile = File(...),
+    content_type_filter: Optional[str] = Query(None, description="text | image | None (둘 다)"),
+    top_k: int = Query(5, ge=1, le=20, description="반환할 문서 수"),
+    current_user: User = Depends(get_current_user),
+    vector_service: VectorStoreService = Depends(get_vector_store_service),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    이미지를 업로드하여 CLIP 기반 멀티모달 검색을 수행합니다.
+
+    Args:
+        kb_id: 지식 베이스 ID
+        image: 검색할 이미지 파일
+        content_type_filter: "text" (텍스트만), "image" (이미지만), None (둘 다)
+        top_k: 반환할 결과 수
+
+    Returns:
+        검색된 문서 리스트 (텍스트 청크 또는 이미지)
+    """
+    # 이미지 파일 검증
+    ext = Path(image.filename or "").suffix.lower()
+    if ext not in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
+        raise HTTPException(400, f"지원하지 않는 이미지 형식입니다: {ext}")
+
+    # Qdrant 클라이언트 resolve
+    ext_client = await resolve_qdrant_client(db, current_user.id, kb_id)
+    client = vector_service.get_client(ext_client)
+    collection_name = f"kb_{kb_id}"
+
+    if not _collection_exists(client, collection_name):
+        raise HTTPException(404, "지식 베이스가 존재하지 않습니다.")
+
+    content = await image.read()
+
+    # 동일 이미지 + 동일 검색 조건의 동시 요청은 하나의 검색 결과를 공유
+    flight_key = (
+        hashlib.sha256(content).hexdigest(),
+        current_user.id, kb_id, content_type_filter, top_k,
+    )
+
+    try:
+        formatted_results = await _single_flight(
+            flight_key,
+            lambda: _run_image_search(
+                content, ext, client, collection_name, current_user.id,
+                vector_service.embeddings, content_type_filter, top_k,
+            ),
+        )
+    except UnexpectedResponse as e:
+        if not _is_collection_missing(e):
+            logger.error(f"Image search failed: {e}", exc_info=True)
+            raise HTTPException(500, f"이미지 검색 실패: {str(e)}")
+        _forget_collection(collection_name)
+        raise HTTPException(404, "지식 베이스가 존재하지 않습니다.")
     except Exception as e:
         logger.error(f"Image search failed: {e}", exc_info=True)
         raise HTTPException(500, f"이미지 검색 실패: {str(e)}")
 
-    finally:
-        # 임시 파일 삭제
-        if temp_file and Path(temp_file).exists():
-            Path(temp_file).unlink()
+    return {
+        "kb_id": kb_id,
+        "query_type": "image",
+        "content_type_filter": content_type_filter,
+        "results": formatted_results,
+        "total": len(formatted_results),
+    }
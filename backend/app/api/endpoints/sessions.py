@@ -1,8 +1,11 @@
 """
 채팅 세션 API 엔드포인트
 """
+import json
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
@@ -14,14 +17,34 @@ from app.schemas.session import (
     MessageCreate, MessageResponse,
 )
 from app.crud.session import (
-    list_sessions, get_session, create_session, update_session, delete_session,
-    add_message, get_messages,
+    list_sessions, get_session_header, create_session, update_session, delete_session,
+    get_session_pk, add_message, add_messages_bulk, get_messages, stream_messages,
 )
 from app.crud.agent import get_agent
+from app.services.cache_service import get_cache_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# 리스트 검증용 TypeAdapter (스키마 컴파일 1회, 리스트 전체를 단일 validator로 처리)
+_SESSION_LIST_ADAPTER = TypeAdapter(list[SessionResponse])
+_MSG_LIST_ADAPTER = TypeAdapter(list[MessageResponse])
+
+
+async def _ndjson_messages(msgs, session_id: str):
+    """
+    메시지를 행 단위 NDJSON으로 전송합니다 (knowledge 파일/청크 스트리밍과 동일한 형식).
+
+    각 행은 {"type": "message", "message": {...}} 한 줄, 마지막 줄은 {"type": "done", ...}.
+    """
+    count = 0
+    async for m in msgs:
+        # dict를 거치지 않고 pydantic-core에서 바로 JSON 직렬화
+        row = MessageResponse.model_validate(m).model_dump_json()
+        count += 1
+        yield f'{{"type":"message","message":{row}}}\n'
+    yield json.dumps({"type": "done", "session_id": session_id, "count": count}, ensure_ascii=False) + "\n"
+
 
 @router.get("", response_model=SessionListResponse)
 async def list_sessions_endpoint(
@@ -32,7 +55,7 @@ async def list_sessions_endpoint(
 ):
     """세션 목록을 반환합니다 (최신순)."""
     rows = await list_sessions(db, current_user.id, limit, offset)
-    return SessionListResponse(sessions=[SessionResponse(**r) for r in rows])
+    return SessionListResponse(sessions=_SESSION_LIST_ADAPTER.validate_python(rows))
 
 
 @router.post("", response_model=SessionResponse)
@@ -64,19 +87,32 @@ async def get_session_endpoint(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """세션 상세 + 메시지를 반환합니다."""
-    s = await get_session(db, current_user.id, session_id)
+    """세션 상세 + 메시지를 반환합니다 (히스토리는 updated_at 리비전 단위로 캐시)."""
+    s = await get_session_header(db, current_user.id, session_id)
     if not s:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
 
-    agent_id_str = None
-    if s.agent:
-        agent_id_str = s.agent.agent_id
+    # 메시지 추가/세션 수정 시 updated_at이 바뀌므로 별도 무효화 없이 새 키로 이동
+    cache = get_cache_service()
+    revision = int(s.updated_at.timestamp() * 1_000_000) if s.updated_at else 0
+    messages = None
+    cached = await cache.get_session_history(current_user.id, session_id, revision)
+    if cached is not None:
+        # json.loads → validate_python 2단계 대신 pydantic-core에서 한 번에 파싱+검증
+        try:
+            messages = _MSG_LIST_ADAPTER.validate_json(cached)
+        except ValidationError as e:
+            logger.warning(f"세션 히스토리 캐시 손상 — DB에서 다시 조회: {e.error_count()} errors")
+    if messages is None:
+        rows = await get_messages(db, s.id, limit=None)
+        messages = _MSG_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+        await cache.set_session_history(
+            current_user.id, session_id, revision, _MSG_LIST_ADAPTER.dump_json(messages),
+        )
 
-    messages = [MessageResponse.model_validate(m) for m in s.messages]
     return SessionDetailResponse(
         id=s.id, session_id=s.session_id, title=s.title,
-        agent_id=agent_id_str, message_count=len(messages),
+        agent_id=s.agent_id_str, message_count=len(messages),
         created_at=s.created_at, updated_at=s.updated_at,
         messages=messages,
     )
@@ -124,13 +160,28 @@ async def add_message_endpoint(
     db: AsyncSession = Depends(get_db),
 ):
     """세션에 메시지를 추가합니다."""
-    s = await get_session(db, current_user.id, session_id)
-    if not s:
+    session_pk = await get_session_pk(db, current_user.id, session_id)
+    if session_pk is None:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
-    msg = await add_message(db, s.id, data.role, data.content, data.thinking, data.metadata_json)
+    msg = await add_message(db, session_pk, data.role, data.content, data.thinking, data.metadata_json)
     return MessageResponse.model_validate(msg)
 
 
+@router.post("/{session_id}/messages/batch", response_model=list[MessageResponse])
+async def add_messages_batch_endpoint(
+    session_id: str,
+    data: list[MessageCreate],
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """여러 메시지(예: user + assistant 턴)를 한 번의 커밋으로 추가합니다."""
+    session_pk = await get_session_pk(db, current_user.id, session_id)
+    if session_pk is None:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    msgs = await add_messages_bulk(db, session_pk, [m.model_dump() for m in data])
+    return _MSG_LIST_ADAPTER.validate_python(msgs, from_attributes=True)
+
+
 @router.get("/{session_id}/messages")
 async def get_messages_endpoint(
     session_id: str,
@@ -138,10 +189,16 @@ async def get_messages_endpoint(
     db: AsyncSession = Depends(get_db),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 여부"),
 ):
     """세션의 메시지를 조회합니다."""
-    s = await get_session(db, current_user.id, session_id)
-    if not s:
+    session_pk = await get_session_pk(db, current_user.id, session_id)
+    if session_pk is None:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
-    msgs = await get_messages(db, s.id, limit, offset)
-    return {"messages": [MessageResponse.model_validate(m) for m in msgs]}
+    if stream:
+        return StreamingResponse(
+            _ndjson_messages(stream_messages(db, session_pk, limit, offset), session_id),
+            media_type="application/x-ndjson",
+        )
+    msgs = await get_messages(db, session_pk, limit, offset)
+    return {"messages": _MSG_LIST_ADAPTER.validate_python(msgs, from_attributes=True)}
@@ -6,19 +6,27 @@
 - DB 연결 관리 (DB 영구 저장)
 - MCP 서버 관리 (DB 영구 저장)
 """
+import asyncio
 import logging
-import uuid
+import re
+import time
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 import httpx
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import case, create_engine, delete, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.settings import (
     BackendConfigResponse,
     ApiKeyCreate,
     ApiKeyResponse,
-    ApiKeysListResponse
+    ApiKeysListResponse,
+    AvailableModelsResponse,
+    McpServerListResponse,
+    OllamaModelsResponse,
 )
 from app.schemas.user_settings import UserSettingsResponse, UserSettingsUpdate
 from app.schemas.db_connection import (
@@ -32,13 +40,15 @@ from app.models.user import User
 from app.models.db_connection import DbConnection
 from app.models.mcp_server import McpServer
 from app.core.config import settings
-from app.core.encryption import decrypt_value, encrypt_value
+from app.core.encryption import adecrypt_value, adecrypt_values, aencrypt_value
 from app.services.cache_service import get_cache_service
-from app.db.session import get_db
+from app.services.http_client import get_http_client
+from app.db.session import AsyncSessionLocal, get_db
 from app.crud.user_settings import get_or_create_settings, update_user_settings
 from app.crud.api_key import (
     get_api_keys_for_user,
     get_api_key_value,
+    mask_api_key,
     save_api_key as crud_save_api_key,
     delete_api_key as crud_delete_api_key,
 )
@@ -48,29 +58,87 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-async def get_db_connection_for_user(user_id: int, conn_id: str) -> dict | None:
-    """내부 서비스에서 DB 연결 설정을 조회합니다 (자체 DB 세션 사용)."""
-    from app.db.session import AsyncSessionLocal
+def _short_id() -> str:
+    """URL-safe 8자 식별자 (48비트 난수, uuid4 앞 8자리 32비트보다 충돌 확률 낮음)"""
+    return secrets.token_urlsafe(6)
+
+
+# 한국어 특화 모델 식별 (모델명 부분 일치, 대소문자 무시)
+KOREAN_MODELS = ("exaone", "eeve", "bllossom", "kullm", "ko-", "korean")
+_KOREAN_RE = re.compile("|".join(re.escape(k) for k in KOREAN_MODELS), re.IGNORECASE)
+
+# Ollama /api/tags 응답 캐시: 동시 요청이 TTL 구간당 한 번만 업스트림을 호출하도록
+_OLLAMA_TAGS_CACHE_KEY = "ollama:tags"
+_OLLAMA_TAGS_URL = f"{settings.OLLAMA_BASE_URL}/api/tags"
+_ollama_cache: dict = {"at": 0.0, "data": None}
+_ollama_lock = asyncio.Lock()
+
+
+async def _fetch_ollama_tags() -> dict:
+    """
+    Ollama /api/tags 응답을 TTL 캐시와 함께 조회합니다.
+    - 프로세스 로컬 캐시 → Redis(워커 간 공유) → Ollama 순으로 확인
+    - 업스트림 실패 시 마지막 캐시 데이터가 있으면 그것을 반환 (없으면 예외 전파)
+    """
+    ttl = settings.OLLAMA_TAGS_CACHE_TTL
+    if ttl and _ollama_cache["data"] is not None and time.monotonic() - _ollama_cache["at"] < ttl:
+        return _ollama_cache["data"]
+
+    async with _ollama_lock:
+        # 락 대기 중 다른 요청이 이미 갱신했을 수 있음
+        if ttl and _ollama_cache["data"] is not None and time.monotonic() - _ollama_cache["at"] < ttl:
+            return _ollama_cache["data"]
+
+        cache = get_cache_service()
+        if ttl:
+            shared = await cache.get_json(_OLLAMA_TAGS_CACHE_KEY)
+            if shared is not None:
+                _ollama_cache.update(at=time.monotonic(), data=shared)
+                return shared
+
+        try:
+            resp = await get_http_client().get(_OLLAMA_TAGS_URL)
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception:
+            if _ollama_cache["data"] is not None:
+                logger.warning("Ollama 모델 목록 조회 실패, 마지막 캐시 데이터 사용")
+                return _ollama_cache["data"]
+            raise
+
+        _ollama_cache.update(at=time.monotonic(), data=data)
+        if ttl:
+            await cache.set_json(_OLLAMA_TAGS_CACHE_KEY, data, ttl=ttl)
+        return data
+
+
+async def get_db_connection_for_user(db: AsyncSession, user_id: int, conn_id: str) -> dict | None:
+    """DB 연결 설정을 조회합니다 (비밀번호 복호화 포함, 호출 측 세션 사용)."""
+    stmt = select(DbConnection).where(
+        DbConnection.user_id == user_id, DbConnection.conn_id == conn_id
+    )
+    result = await db.execute(stmt)
+    conn = result.scalar_one_or_none()
+    if not conn:
+        return None
+    password = ""
+    if conn.encrypted_password:
+        try:
+            password = await adecrypt_value(conn.encrypted_password)
+        except Exception:
+            pass
+    return {
+        "id": conn.conn_id, "name": conn.name, "db_type": conn.db_type,
+        "host": conn.host, "port": conn.port, "database": conn.database,
+        "username": conn.username, "password": password,
+        "schema_metadata": conn.schema_metadata,
+    }
+
+
+async def get_db_connection_for_user_standalone(user_id: int, conn_id: str) -> dict | None:
+    """요청 세션이 없는 내부 서비스용 (자체 DB 세션 사용)."""
     async with AsyncSessionLocal() as db:
-        stmt = select(DbConnection).where(
-            DbConnection.user_id == user_id, DbConnection.conn_id == conn_id
-        )
-        result = await db.execute(stmt)
-        conn = result.scalar_one_or_none()
-        if not conn:
-            return None
-        password = ""
-        if conn.encrypted_password:
-            try:
-                password = decrypt_value(conn.encrypted_password)
-            except Exception:
-                pass
-        return {
-            "id": conn.conn_id, "name": conn.name, "db_type": conn.db_type,
-            "host": conn.host, "port": conn.port, "database": conn.database,
-            "username": conn.username, "password": password,
-            "schema_metadata": conn.schema_metadata,
-        }
+        return await get_db_connection_for_user(db, user_id, conn_id)
 
 
 def _build_connection_uri(conn: dict) -> str:
@@ -85,11 +153,15 @@ def _build_connection_uri(conn: dict) -> str:
     raise ValueError(f"Unsupported db_type: {db_type}")
 
 
-async def get_api_key_for_user(user_id: int, provider: str) -> str | None:
-    """내부 서비스에서 사용자의 API 키를 조회합니다 (자체 DB 세션 사용)."""
-    from app.db.session import AsyncSessionLocal
+async def get_api_key_for_user(db: AsyncSession, user_id: int, provider: str) -> str | None:
+    """사용자의 API 키(복호화)를 조회합니다 (호출 측 세션 사용)."""
+    return await get_api_key_value(db, user_id, provider)
+
+
+async def get_api_key_for_user_standalone(user_id: int, provider: str) -> str | None:
+    """요청 세션이 없는 내부 서비스용 (자체 DB 세션 사용)."""
     async with AsyncSessionLocal() as db:
-        return await get_api_key_value(db, user_id, provider)
+        return await get_api_key_for_user(db, user_id, provider)
 
 
 # ============================================================
@@ -170,16 +242,15 @@ async def list_api_keys(
 ):
     """저장된 API 키 목록을 반환합니다 (마스킹 처리)."""
     key_rows = await get_api_keys_for_user(db, current_user.id)
+    # masked_key 컬럼 추가 이전에 저장된 키만 한 번의 워커 스레드 호출로 복호화 (실패 항목은 None)
+    legacy = [row.encrypted_key for row in key_rows if row.masked_key is None]
+    plains = iter(await adecrypt_values(legacy) if legacy else [])
     keys = []
     for row in key_rows:
-        try:
-            plain = decrypt_value(row.encrypted_key)
-            if len(plain) > 7:
-                masked = plain[:4] + "***" + plain[-3:]
-            else:
-                masked = "***"
-        except Exception:
-            masked = "***"
+        masked = row.masked_key
+        if masked is None:
+            plain = next(plains)
+            masked = mask_api_key(plain) if plain is not None else "***"
         keys.append(ApiKeyResponse(provider=row.provider, masked_key=masked))
     return ApiKeysListResponse(keys=keys)
 
@@ -202,17 +273,11 @@ async def delete_api_key_endpoint(
 # Ollama 모델 목록
 # ============================================================
 
-@router.get("/ollama-models")
+@router.get("/ollama-models", response_model=OllamaModelsResponse, response_model_exclude_none=True)
 async def get_ollama_models(current_user: User = Depends(get_current_user)):
     """Ollama에서 사용 가능한 모델 목록을 반환합니다."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(f"{settings.OLLAMA_BASE_URL}/api/tags")
-            resp.raise_for_status()
-            data = resp.json()
-
-        # 한국어 특화 모델 식별
-        KOREAN_MODELS = {"exaone", "eeve", "bllossom", "kullm", "ko-", "korean"}
+        data = await _fetch_ollama_tags()
 
         models: List[dict] = []
         for m in data.get("models", []):
@@ -222,7 +287,7 @@ async def get_ollama_models(current_user: User = Depends(get_current_user)):
             param_size = m.get("details", {}).get("parameter_size", "")
             family = m.get("details", {}).get("family", "")
             quant = m.get("details", {}).get("quantization_level", "")
-            is_korean = any(k in name.lower() for k in KOREAN_MODELS)
+            is_korean = bool(_KOREAN_RE.search(name))
             models.append({
                 "name": name,
                 "size_gb": size_gb,
@@ -245,7 +310,56 @@ async def get_ollama_models(current_user: User = Depends(get_current_user)):
 # 통합 모델 목록 (Ollama + 외부 API)
 # ============================================================
 
-@router.get("/available-models")
+# 외부 API 모델 카탈로그 (정적, 요청마다 재생성하지 않음)
+_OPENAI_MODELS = (
+    {"name": "gpt-4o", "display_name": "GPT-4o", "provider": "openai", "type": "api"},
+    {"name": "gpt-4o-mini", "display_name": "GPT-4o Mini", "provider": "openai", "type": "api"},
+    {"name": "gpt-4-turbo", "display_name": "GPT-4 Turbo", "provider": "openai", "type": "api"},
+    {"name": "gpt-3.5-turbo", "display_name": "GPT-3.5 Turbo", "provider": "openai", "type": "api"},
+)
+_ANTHROPIC_MODELS = (
+    {"name": "claude-sonnet-4-5-20250929", "display_name": "Claude 4.5 Sonnet", "provider": "anthropic", "type": "api"},
+    {"name": "claude-opus-4-6", "display_name": "Claude Opus 4.6", "provider": "anthropic", "type": "api"},
+    {"name": "claude-haiku-4-5-20251001", "display_name": "Claude 4.5 Haiku", "provider": "anthropic", "type": "api"},
+)
+_GOOGLE_MODELS = (
+    {"name": "gemini-2.0-flash", "display_name": "Gemini 2.0 Flash", "provider": "google", "type": "api"},
+    {"name": "gemini-2.0-pro", "display_name": "Gemini 2.0 Pro", "provider": "google", "type": "api"},
+    {"name": "gemini-1.5-flash", "display_name": "Gemini 1.5 Flash", "provider": "google", "type": "api"},
+)
+_GROQ_MODELS = (
+    {"name": "llama-3.3-70b-versatile", "display_name": "Llama 3.3 70B", "provider": "groq", "type": "api"},
+    {"name": "llama-3.1-8b-instant", "display_name": "Llama 3.1 8B Instant", "provider": "groq", "type": "api"},
+    {"name": "mixtral-8x7b-32768", "display_name": "Mixtral 8x7B", "provider": "groq", "type": "api"},
+)
+
+_PROVIDER_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+# (프로바이더 별칭, 모델 목록) — Google은 프론트엔드에서 'google gemini'로 저장됨
+_PROVIDER_CATALOG = (
+    (("openai",), _OPENAI_MODELS),
+    (("anthropic",), _ANTHROPIC_MODELS),
+    (("google", "gemini"), _GOOGLE_MODELS),
+    (("groq",), _GROQ_MODELS),
+)
+
+
+def _dumps_items(items) -> bytes:
+    """dict 목록을 JSON 배열의 내부 원소(대괄호 제외) 바이트로 직렬화"""
+    return orjson.dumps(list(items))[1:-1]
+
+
+# (프로바이더 별칭, 모델 수, 사전 인코딩된 JSON 원소) — 응답 조립 시 바이트 연결만 수행
+_PROVIDER_CATALOG_JSON = tuple(
+    (aliases, len(catalog), _dumps_items(catalog)) for aliases, catalog in _PROVIDER_CATALOG
+)
+
+
+@router.get(
+    "/available-models",
+    response_class=Response,
+    responses={200: {"model": AvailableModelsResponse, "content": {"application/json": {}}}},
+)
 async def get_available_models(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -255,86 +369,56 @@ async def get_available_models(
     - Ollama 로컬 모델
     - 등록된 API 키로 사용 가능한 외부 모델 (OpenAI, Anthropic 등)
     """
-    all_models = []
-
-    # 1. Ollama 로컬 모델
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(f"{settings.OLLAMA_BASE_URL}/api/tags")
-            resp.raise_for_status()
-            data = resp.json()
+    local_models = []
 
-        # 한국어 특화 모델 식별
-        KOREAN_MODELS = {"exaone", "eeve", "bllossom", "kullm", "ko-", "korean"}
+    # Ollama 조회와 API 키 조회는 서로 독립적이므로 동시에 실행
+    data, key_rows = await asyncio.gather(
+        _fetch_ollama_tags(),
+        get_api_keys_for_user(db, current_user.id),
+        return_exceptions=True,
+    )
 
+    # 1. Ollama 로컬 모델
+    if isinstance(data, BaseException):
+        logger.warning(f"Ollama 모델 로드 실패: {data}")
+    else:
         for m in data.get("models", []):
             name = m.get("name", "")
             param_size = m.get("details", {}).get("parameter_size", "")
             family = m.get("details", {}).get("family", "")
 
             # 한국어 모델 태그
-            is_korean = any(k in name.lower() for k in KOREAN_MODELS)
+            is_korean = bool(_KOREAN_RE.search(name))
             lang_tag = " [한국어]" if is_korean else ""
 
-            all_models.append({
+            local_models.append({
                 "name": name,
                 "provider": "ollama",
                 "display_name": f"{name}{lang_tag} {f'({param_size})' if param_size else ''}".strip(),
                 "type": "local",
                 "is_korean": is_korean,
             })
-    except Exception as e:
-        logger.warning(f"Ollama 모델 로드 실패: {e}")
 
     # 2. 외부 API 모델 (저장된 API 키 확인)
-    from app.crud.api_key import get_api_keys_for_user
-
-    key_rows = await get_api_keys_for_user(db, current_user.id)
-    available_providers = {row.provider for row in key_rows}
-    logger.info(f"사용자 {current_user.id} 등록된 API 프로바이더: {available_providers}")
-
-    # provider 이름 정규화 (프론트엔드에서 'google gemini' 등으로 저장될 수 있음)
-    def has_provider(name: str) -> bool:
-        return any(name in p for p in available_providers)
-
-    # OpenAI 모델
-    if has_provider("openai"):
-        openai_models = [
-            {"name": "gpt-4o", "display_name": "GPT-4o", "provider": "openai", "type": "api"},
-            {"name": "gpt-4o-mini", "display_name": "GPT-4o Mini", "provider": "openai", "type": "api"},
-            {"name": "gpt-4-turbo", "display_name": "GPT-4 Turbo", "provider": "openai", "type": "api"},
-            {"name": "gpt-3.5-turbo", "display_name": "GPT-3.5 Turbo", "provider": "openai", "type": "api"},
-        ]
-        all_models.extend(openai_models)
-
-    # Anthropic 모델
-    if has_provider("anthropic"):
-        anthropic_models = [
-            {"name": "claude-sonnet-4-5-20250929", "display_name": "Claude 4.5 Sonnet", "provider": "anthropic", "type": "api"},
-            {"name": "claude-opus-4-6", "display_name": "Claude Opus 4.6", "provider": "anthropic", "type": "api"},
-            {"name": "claude-haiku-4-5-20251001", "display_name": "Claude 4.5 Haiku", "provider": "anthropic", "type": "api"},
-        ]
-        all_models.extend(anthropic_models)
-
-    # Google AI 모델 (프론트엔드에서 'google gemini'으로 저장됨)
-    if has_provider("google") or has_provider("gemini"):
-        google_models = [
-            {"name": "gemini-2.0-flash", "display_name": "Gemini 2.0 Flash", "provider": "google", "type": "api"},
-            {"name": "gemini-2.0-pro", "display_name": "Gemini 2.0 Pro", "provider": "google", "type": "api"},
-            {"name": "gemini-1.5-flash", "display_name": "Gemini 1.5 Flash", "provider": "google", "type": "api"},
-        ]
-        all_models.extend(google_models)
-
-    # Groq 모델
-    if has_provider("groq"):
-        groq_models = [
-            {"name": "llama-3.3-70b-versatile", "display_name": "Llama 3.3 70B", "provider": "groq", "type": "api"},
-            {"name": "llama-3.1-8b-instant", "display_name": "Llama 3.1 8B Instant", "provider": "groq", "type": "api"},
-            {"name": "mixtral-8x7b-32768", "display_name": "Mixtral 8x7B", "provider": "groq", "type": "api"},
-        ]
-        all_models.extend(groq_models)
-
-    return {"models": all_models, "total": len(all_models)}
+    if isinstance(key_rows, BaseException):
+        logger.warning(f"API 키 목록 조회 실패: {key_rows}")
+        key_rows = []
+    # provider 이름을 토큰 단위로 정규화 (프론트엔드에서 'Google Gemini' 등으로 저장될 수 있음)
+    provider_tokens = {
+        tok for row in key_rows for tok in _PROVIDER_TOKEN_SPLIT.split(row.provider.lower()) if tok
+    }
+    logger.info(f"사용자 {current_user.id} 등록된 API 프로바이더 토큰: {provider_tokens}")
+
+    # 정적 카탈로그는 미리 인코딩한 바이트를 이어 붙이고, Ollama 목록만 요청마다 직렬화
+    parts = [_dumps_items(local_models)] if local_models else []
+    total = len(local_models)
+    for aliases, count, encoded in _PROVIDER_CATALOG_JSON:
+        if not provider_tokens.isdisjoint(aliases):
+            parts.append(encoded)
+            total += count
+
+    body = b'{"models":[' + b",".join(parts) + b'],"total":' + str(total).encode() + b"}"
+    return Response(content=body, media_type="application/json")
 
 
 # ============================================================
@@ -348,8 +432,8 @@ async def create_db_connection(
     db: AsyncSession = Depends(get_db),
 ):
     """외부 DB 연결을 등록합니다."""
-    conn_id = str(uuid.uuid4())[:8]
-    encrypted_pw = encrypt_value(data.password) if data.password else None
+    conn_id = _short_id()
+    encrypted_pw = await aencrypt_value(data.password) if data.password else None
     conn = DbConnection(
         user_id=current_user.id, conn_id=conn_id, name=data.name,
         db_type=data.db_type, host=data.host, port=data.port,
@@ -369,17 +453,14 @@ async def list_db_connections(
     db: AsyncSession = Depends(get_db),
 ):
     """등록된 DB 연결 목록을 반환합니다 (비밀번호 제외)."""
-    stmt = select(DbConnection).where(DbConnection.user_id == current_user.id)
+    # 응답에 필요한 컬럼만 조회 (encrypted_password 제외, ORM 인스턴스 생성 생략)
+    stmt = select(
+        DbConnection.conn_id.label("id"), DbConnection.name, DbConnection.db_type,
+        DbConnection.host, DbConnection.port, DbConnection.database,
+        DbConnection.username, DbConnection.schema_metadata,
+    ).where(DbConnection.user_id == current_user.id)
     result = await db.execute(stmt)
-    rows = result.scalars().all()
-    connections = [
-        DBConnectionResponse(
-            id=c.conn_id, name=c.name, db_type=c.db_type,
-            host=c.host, port=c.port, database=c.database,
-            username=c.username, schema_metadata=c.schema_metadata,
-        )
-        for c in rows
-    ]
+    connections = [DBConnectionResponse(**row) for row in result.mappings()]
     return DBConnectionListResponse(connections=connections)
 
 
@@ -390,17 +471,30 @@ async def delete_db_connection(
     db: AsyncSession = Depends(get_db),
 ):
     """DB 연결을 삭제합니다."""
-    stmt = select(DbConnection).where(
-        DbConnection.user_id == current_user.id, DbConnection.conn_id == conn_id
+    stmt = (
+        delete(DbConnection)
+        .where(DbConnection.user_id == current_user.id, DbConnection.conn_id == conn_id)
+        .returning(DbConnection.name)
     )
-    result = await db.execute(stmt)
-    conn = result.scalar_one_or_none()
-    if not conn:
+    name = (await db.execute(stmt)).scalar_one_or_none()
+    if name is None:
         raise HTTPException(status_code=404, detail="연결을 찾을 수 없습니다.")
-    await db.delete(conn)
     await db.commit()
-    logger.info(f"DB connection deleted: {conn.name}")
-    return {"message": f"{conn.name} 연결이 삭제되었습니다."}
+    logger.info(f"DB connection deleted: {name}")
+    return {"message": f"{name} 연결이 삭제되었습니다."}
+
+
+_DB_TEST_TIMEOUT = 10
+
+
+def _sync_ping(uri: str, db_type: str):
+    """외부 DB에 접속해 SELECT 1을 실행합니다 (동기, 스레드 전용)."""
+    eng = create_engine(uri, connect_args={"connect_timeout": 5} if db_type != "sqlite" else {})
+    try:
+        with eng.connect() as c:
+            c.execute(text("SELECT 1"))
+    finally:
+        eng.dispose()
 
 
 @router.post("/db-connections/{conn_id}/test")
@@ -410,21 +504,53 @@ async def test_db_connection(
     db: AsyncSession = Depends(get_db),
 ):
     """DB 연결을 테스트합니다."""
-    conn_dict = await get_db_connection_for_user(current_user.id, conn_id)
+    conn_dict = await get_db_connection_for_user(db, current_user.id, conn_id)
     if not conn_dict:
         raise HTTPException(status_code=404, detail="연결을 찾을 수 없습니다.")
     try:
-        from sqlalchemy import create_engine, text
         uri = _build_connection_uri(conn_dict)
-        eng = create_engine(uri, connect_args={"connect_timeout": 5} if conn_dict["db_type"] != "sqlite" else {})
-        with eng.connect() as c:
-            c.execute(text("SELECT 1"))
-        eng.dispose()
+        # 동기 드라이버 연결은 워커 스레드에서 실행 (이벤트 루프 블로킹 방지)
+        await asyncio.wait_for(
+            asyncio.to_thread(_sync_ping, uri, conn_dict["db_type"]),
+            timeout=_DB_TEST_TIMEOUT,
+        )
         return {"status": "connected", "detail": f"{conn_dict['name']} 연결 성공"}
+    except asyncio.TimeoutError:
+        return {"status": "disconnected", "detail": f"연결 시간 초과 ({_DB_TEST_TIMEOUT}초)"}
     except Exception as e:
         return {"status": "disconnected", "detail": str(e)}
 
 
+_SCHEMA_WORKERS = 8
+_sql_database_cls = None
+
+
+def _get_sqldb_cls():
+    """langchain_community SQLDatabase 클래스 (무거운 import라 최초 사용 시 1회만 로드)"""
+    global _sql_database_cls
+    if _sql_database_cls is None:
+        from langchain_community.utilities import SQLDatabase
+        _sql_database_cls = SQLDatabase
+    return _sql_database_cls
+
+
+def _sync_table_infos(uri: str) -> list[dict]:
+    """
+    외부 DB의 테이블별 스키마 정보를 조회합니다 (동기, 스레드 전용).
+    메타데이터 반영은 SQLDatabase 생성 시 한 번만 수행되고, 테이블별 샘플 행 조회는 병렬로 실행합니다.
+    """
+    sql_db = _get_sqldb_cls().from_uri(uri)
+    try:
+        names = list(sql_db.get_usable_table_names())
+        if not names:
+            return []
+        with ThreadPoolExecutor(max_workers=min(_SCHEMA_WORKERS, len(names))) as pool:
+            infos = pool.map(lambda name: sql_db.get_table_info_no_throw([name]), names)
+            return [{"name": name, "info": info} for name, info in zip(names, infos)]
+    finally:
+        sql_db._engine.dispose()
+
+
 @router.get("/db-connections/{conn_id}/schema")
 async def get_db_schema(
     conn_id: str,
@@ -432,17 +558,12 @@ async def get_db_schema(
     db: AsyncSession = Depends(get_db),
 ):
     """DB 테이블 스키마를 조회합니다."""
-    conn_dict = await get_db_connection_for_user(current_user.id, conn_id)
+    conn_dict = await get_db_connection_for_user(db, current_user.id, conn_id)
     if not conn_dict:
         raise HTTPException(status_code=404, detail="연결을 찾을 수 없습니다.")
     try:
-        from langchain_community.utilities import SQLDatabase
         uri = _build_connection_uri(conn_dict)
-        sql_db = SQLDatabase.from_uri(uri)
-        tables = []
-        for table_name in sql_db.get_usable_table_names():
-            info = sql_db.get_table_info_no_throw([table_name])
-            tables.append({"name": table_name, "info": info})
+        tables = await asyncio.to_thread(_sync_table_infos, uri)
         return {"tables": tables, "schema_metadata": conn_dict.get("schema_metadata")}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"스키마 조회 실패: {e}")
@@ -456,36 +577,41 @@ async def update_db_metadata(
     db: AsyncSession = Depends(get_db),
 ):
     """DB 연결의 비즈니스 메타데이터를 업데이트합니다."""
-    stmt = select(DbConnection).where(
-        DbConnection.user_id == current_user.id, DbConnection.conn_id == conn_id
+    stmt = (
+        update(DbConnection)
+        .where(DbConnection.user_id == current_user.id, DbConnection.conn_id == conn_id)
+        .values(schema_metadata=data.schema_metadata)
+        .returning(DbConnection.name)
     )
-    result = await db.execute(stmt)
-    conn = result.scalar_one_or_none()
-    if not conn:
+    name = (await db.execute(stmt)).scalar_one_or_none()
+    if name is None:
         raise HTTPException(status_code=404, detail="연결을 찾을 수 없습니다.")
-    conn.schema_metadata = data.schema_metadata
     await db.commit()
-    logger.info(f"DB connection metadata updated: {conn.name}")
-    return {"message": f"{conn.name} 메타데이터가 업데이트되었습니다."}
+    logger.info(f"DB connection metadata updated: {name}")
+    return {"message": f"{name} 메타데이터가 업데이트되었습니다."}
 
 
 # ============================================================
 # MCP 서버 관리 (DB 영구 저장)
 # ============================================================
 
-@router.get("/mcp-servers")
+@router.get("/mcp-servers", response_model=McpServerListResponse)
 async def list_mcp_servers(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """MCP 서버 목록을 반환합니다."""
     stmt = (
-        select(McpServer)
+        select(
+            McpServer.server_id, McpServer.name, McpServer.server_type,
+            McpServer.url, McpServer.command, McpServer.headers_json,
+            McpServer.priority, McpServer.enabled, McpServer.sort_order,
+        )
         .where(McpServer.user_id == current_user.id)
         .order_by(McpServer.sort_order)
     )
     result = await db.execute(stmt)
-    rows = result.scalars().all()
+    rows = result.all()
     return {"servers": [
         {
             # canonical
@@ -506,7 +632,7 @@ async def create_mcp_server(
     db: AsyncSession = Depends(get_db),
 ):
     """MCP 서버를 등록합니다."""
-    server_id = data.get("server_id") or data.get("id") or str(uuid.uuid4())[:8]
+    server_id = data.get("server_id") or data.get("id") or _short_id()
     server_type = data.get("server_type") or data.get("type") or "sse"
     srv = McpServer(
         user_id=current_user.id, server_id=server_id,
@@ -527,16 +653,16 @@ async def delete_mcp_server(
     db: AsyncSession = Depends(get_db),
 ):
     """MCP 서버를 삭제합니다."""
-    stmt = select(McpServer).where(
-        McpServer.user_id == current_user.id, McpServer.server_id == server_id
+    stmt = (
+        delete(McpServer)
+        .where(McpServer.user_id == current_user.id, McpServer.server_id == server_id)
+        .returning(McpServer.name)
     )
-    result = await db.execute(stmt)
-    srv = result.scalar_one_or_none()
-    if not srv:
+    name = (await db.execute(stmt)).scalar_one_or_none()
+    if name is None:
         raise HTTPException(status_code=404, detail="MCP 서버를 찾을 수 없습니다.")
-    await db.delete(srv)
     await db.commit()
-    return {"message": f"MCP 서버 '{srv.name}'가 삭제되었습니다."}
+    return {"message": f"MCP 서버 '{name}'가 삭제되었습니다."}
 
 
 @router.put("/mcp-servers/reorder")
@@ -560,12 +686,17 @@ async def reorder_mcp_servers(
     elif isinstance(data.get("server_ids"), list):
         order = [{"id": sid, "sort_order": idx} for idx, sid in enumerate(data.get("server_ids", []))]
 
-    stmt = select(McpServer).where(McpServer.user_id == current_user.id)
-    result = await db.execute(stmt)
-    servers = {s.server_id: s for s in result.scalars().all()}
-    for item in order:
-        srv = servers.get(item.get("id"))
-        if srv:
-            srv.sort_order = item.get("sort_order", 0)
-    await db.commit()
+    # server_id → sort_order (중복 id는 마지막 값 우선), 단일 UPDATE ... CASE로 반영
+    new_orders = {item["id"]: item.get("sort_order", 0) for item in order if item.get("id")}
+    if new_orders:
+        stmt = (
+            update(McpServer)
+            .where(
+                McpServer.user_id == current_user.id,
+                McpServer.server_id.in_(list(new_orders)),
+            )
+            .values(sort_order=case(new_orders, value=McpServer.server_id, else_=McpServer.sort_order))
+        )
+        await db.execute(stmt)
+        await db.commit()
     return {"message": "정렬 순서가 업데이트되었습니다."}
@@ -3,7 +3,7 @@
 환경변수를 통해 설정을 관리합니다.
 """
 import logging
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
@@ -49,6 +49,10 @@ class Settings(BaseSettings):
     )
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, ge=1, le=1440)
+    ENCRYPTION_KEY_CACHE_DIR: Optional[str] = Field(
+        default=None,
+        description="PBKDF2 파생 마스터 키 캐시 디렉토리 (키가 평문 저장되므로 tmpfs 권장, 미설정 시 캐시 안 함)"
+    )
 
     @field_validator('SECRET_KEY')
     @classmethod
@@ -89,6 +93,14 @@ class Settings(BaseSettings):
         ...,
         description="PostgreSQL 연결 URL"
     )
+    DB_POOL_SIZE: int = Field(default=20, ge=1, description="DB 커넥션 풀 크기 (워커당, 2 워커 × (20+10) ≤ PG 기본 max_connections 100)")
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0, description="풀 초과 허용 커넥션 수")
+    DB_POOL_RECYCLE: int = Field(default=1800, ge=60, description="커넥션 재활용 주기 (초)")
+    DB_POOL_TIMEOUT: int = Field(default=10, ge=1, description="풀 커넥션 대기 타임아웃 (초)")
+    DB_POOL_PREWARM: bool = Field(default=True, description="시작 시 풀 커넥션 미리 생성")
+    MESSAGE_PARTITION_COUNT: int = Field(
+        default=8, ge=1, le=64, description="chat_messages session_pk HASH 파티션 수 (테이블 생성 후 변경 불가)"
+    )
 
     # Qdrant Vector DB
     QDRANT_URL: str = Field(
@@ -96,6 +108,18 @@ class Settings(BaseSettings):
         description="Qdrant Vector DB URL"
     )
     QDRANT_API_KEY: Optional[str] = Field(default=None, description="Qdrant API Key (옵션)")
+    QDRANT_SCALAR_QUANTIZATION: bool = Field(
+        default=True,
+        description="새 KB 컬렉션에 int8 스칼라 양자화 적용 (원본 벡터는 디스크, 양자화 벡터는 RAM)"
+    )
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = Field(
+        default=2.0, ge=1.0, le=10.0,
+        description="양자화 검색 시 oversampling 배수 (원본 벡터로 rescore)"
+    )
+    BM25_VALUE_DTYPE: Literal["float32", "float16", "uint8"] = Field(
+        default="float16",
+        description="BM25 sparse vector 값 저장 타입 (새 KB 컬렉션 인덱스 datatype; uint8은 TF×255 정수)"
+    )
 
     # Redis
     REDIS_URL: str = Field(
@@ -107,6 +131,9 @@ class Settings(BaseSettings):
     # 캐시 설정
     CACHE_TTL_SECONDS: int = Field(default=3600, ge=60, description="캐시 TTL (초)")
     CACHE_ENABLED: bool = Field(default=True, description="캐시 활성화 여부")
+    SESSION_HISTORY_CACHE_TTL: int = Field(
+        default=300, ge=0, description="세션 메시지 히스토리 캐시 TTL (초, updated_at 리비전별 키)"
+    )
 
     # ============================================================
     # Neo4j Graph DB 설정
@@ -125,6 +152,9 @@ class Settings(BaseSettings):
         default="http://localhost:11434",
         description="Ollama 서버 URL"
     )
+    OLLAMA_TAGS_CACHE_TTL: int = Field(
+        default=15, ge=0, description="Ollama 모델 목록(/api/tags) 캐시 TTL (초, 0이면 비활성화)"
+    )
     EMBEDDING_MODEL: str = Field(
         default="BAAI/bge-m3",
         description="임베딩 모델명"
@@ -192,6 +222,14 @@ class Settings(BaseSettings):
     # 멀티모달 성능 최적화
     # ============================================================
     CLIP_BATCH_SIZE: int = Field(default=8, description="CLIP 임베딩 배치 크기")
+    CLIP_COMPILE: bool = Field(
+        default=False,
+        description="CLIP 이미지/텍스트 인코더에 torch.compile 적용 (CUDA 권장, MPS는 자동 제외)"
+    )
+    CLIP_COMPILE_CACHE_DIR: Optional[str] = Field(
+        default=None,
+        description="torch.compile 산출물 캐시 디렉토리 (TORCHINDUCTOR_CACHE_DIR, 미설정 시 torch 기본값)"
+    )
     CAPTION_BATCH_SIZE: int = Field(default=4, description="캡셔닝 배치 크기")
     ENABLE_THUMBNAIL: bool = Field(default=True, description="썸네일 생성 활성화")
     ENABLE_OCR: bool = Field(default=True, description="OCR 활성화")
@@ -5,9 +5,17 @@ Ollama가 GPU를 점유하는 환경에서, 여유 VRAM을 확인하여
 임베딩/리랭커 모델을 GPU 또는 CPU에 자동 배치합니다.
 """
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# torch 모듈 (최초 사용 시 1회 import, 실패 시 False)
+_torch = None
+
+# CUDA 여유 메모리 캐시 — 시작 시 여러 모델이 연달아 디바이스를 조회할 때 드라이버 호출 1회로 제한
+_FREE_MB_TTL = 2.0
+_FREE_MB_CACHE = {"ts": 0.0, "val": 0.0}
+
 # 모델별 예상 VRAM 사용량 (MB)
 _MODEL_VRAM_ESTIMATES = {
     "BAAI/bge-m3": 2200,
@@ -41,7 +49,9 @@ def get_device(model_name: str = "", required_vram_mb: int = 0) -> str:
 
     # auto 모드: GPU 여유 메모리 확인
     try:
-        import torch
+        torch = _get_torch()
+        if torch is None:
+            return "cpu"
 
         if torch.cuda.is_available():
             free_mb = _get_cuda_free_mb()
@@ -49,6 +59,8 @@ def get_device(model_name: str = "", required_vram_mb: int = 0) -> str:
             total_needed = needed_mb + _MARGIN_MB
 
             if free_mb >= total_needed:
+                # 캐시된 여유량에서 예약분 차감 (TTL 내 다음 모델이 같은 VRAM을 중복 계산하지 않도록)
+                _FREE_MB_CACHE["val"] = free_mb - total_needed
                 logger.info(
                     f"[Device] GPU 선택: {model_name or 'model'} "
                     f"(필요: {needed_mb}MB + 마진 {_MARGIN_MB}MB = {total_needed}MB, "
@@ -71,12 +83,27 @@ def get_device(model_name: str = "", required_vram_mb: int = 0) -> str:
     return "cpu"
 
 
+def _get_torch():
+    """torch 모듈을 반환합니다 (미설치 시 None). import는 프로세스당 1회."""
+    global _torch
+    if _torch is None:
+        try:
+            import torch
+            _torch = torch
+        except ImportError:
+            _torch = False
+    return _torch or None
+
+
 def _get_cuda_free_mb() -> float:
-    """현재 CUDA GPU의 여유 메모리(MB)를 반환합니다."""
-    import torch
+    """현재 CUDA GPU의 여유 메모리(MB)를 반환합니다 (짧은 TTL 캐시)."""
+    now = time.monotonic()
+    if now - _FREE_MB_CACHE["ts"] < _FREE_MB_TTL:
+        return _FREE_MB_CACHE["val"]
 
-    free_bytes, total_bytes = torch.cuda.mem_get_info(0)
+    free_bytes, total_bytes = _get_torch().cuda.mem_get_info(0)
     free_mb = free_bytes / (1024 * 1024)
     total_mb = total_bytes / (1024 * 1024)
     logger.debug(f"[Device] GPU 메모리: {free_mb:.0f}MB 여유 / {total_mb:.0f}MB 전체")
+    _FREE_MB_CACHE.update(ts=now, val=free_mb)
     return free_mb
@@ -1,13 +1,23 @@
 """
 암호화 유틸리티
-- Fernet 대칭 암호화 (API 키, 비밀번호 등)
-- SECRET_KEY에서 PBKDF2로 Fernet 키 파생
+- AES-256-GCM 대칭 암호화 (API 키, 비밀번호 등) — 저장 형식 "v2:" + base64(nonce || ciphertext || tag)
+- 기존 Fernet 토큰("gAAAA...")은 복호화만 지원 (접두사로 분기, 재저장 시 v2로 전환)
+- SECRET_KEY에서 PBKDF2로 마스터 키 파생 (ENCRYPTION_KEY_CACHE_DIR 설정 시 파생 결과를 파일로 캐시)
+  주의: 캐시 파일은 마스터 키 평문(0600) — 디스크에 남지 않도록 tmpfs 경로만 지정할 것
+- async 경로용 a* 래퍼는 워커 스레드에서 실행 (이벤트 루프 블로킹 방지)
 """
+import asyncio
 import base64
+import hashlib
+import hmac
 import logging
-from functools import lru_cache
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional
 
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
@@ -16,26 +26,134 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
-@lru_cache()
-def get_fernet() -> Fernet:
-    """SECRET_KEY에서 Fernet 키를 파생하여 반환합니다."""
+_KDF_SALT = b"ai-rag-salt"
+_KDF_ITERATIONS = 100_000
+
+
+def _pbkdf2(secret: bytes) -> bytes:
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
-        salt=b"ai-rag-salt",
-        iterations=100_000,
+        salt=_KDF_SALT,
+        iterations=_KDF_ITERATIONS,
     )
-    key = base64.urlsafe_b64encode(kdf.derive(settings.SECRET_KEY.encode()))
-    return Fernet(key)
+    return kdf.derive(secret)
+
+
+def _key_cache_path(secret: bytes) -> Optional[Path]:
+    """파생 키 캐시 파일 경로 (ENCRYPTION_KEY_CACHE_DIR 아래, 미설정/없는 디렉토리면 캐시하지 않음)"""
+    cache_dir = settings.ENCRYPTION_KEY_CACHE_DIR
+    if not cache_dir or not os.path.isdir(cache_dir):
+        return None
+    digest = hashlib.blake2b(
+        secret + b"\0" + _KDF_SALT + b"\0" + str(_KDF_ITERATIONS).encode(), digest_size=16
+    ).hexdigest()
+    return Path(cache_dir) / f"ai-rag-fernet-{digest}.key"
+
+
+def _derive_or_load_key(secret: bytes) -> bytes:
+    """
+    PBKDF2 파생 키를 머신 단위로 1회만 계산합니다.
+    캐시 파일(0600, 다른 사용자 권한이 있으면 무시)이 있으면 읽고, 없으면 파생 후 O_EXCL로 생성
+    — 워커 N개의 콜드 스타트 비용 제거. 동시 생성 경합에서 진 워커는 기록을 건너뜁니다.
+    캐시 I/O 실패 시에는 매번 파생하는 기존 동작으로 폴백합니다.
+    """
+    path = _key_cache_path(secret)
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_mode & 0o077 == 0:
+                    raw = f.read()
+                    if len(raw) == 32:
+                        return raw
+        except OSError:
+            pass
+
+    raw = _pbkdf2(secret)
+
+    if path is not None:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except OSError as e:
+            logger.debug(f"Fernet key cache write skipped: {e}")
+        else:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+    return raw
+
+
+def _build_fernet(raw_key: bytes) -> Fernet:
+    """파생 키로 Fernet 인스턴스를 만듭니다 (기존 토큰 복호화용)."""
+    return Fernet(base64.urlsafe_b64encode(raw_key))
+
+
+def _build_aesgcm(raw_key: bytes) -> AESGCM:
+    """파생 키에서 라벨로 분리한 AES-256-GCM 키를 만듭니다 (Fernet 키와 재사용하지 않음)."""
+    return AESGCM(hmac.new(raw_key, b"ai-rag-aesgcm-v2", hashlib.sha256).digest())
+
+
+# 프로세스당 1회 생성 (import 시점), 호출마다 캐시 조회 없이 바로 사용
+_RAW_KEY = _derive_or_load_key(settings.SECRET_KEY.encode())
+_FERNET = _build_fernet(_RAW_KEY)
+_AESGCM = _build_aesgcm(_RAW_KEY)
+_V2_PREFIX = "v2:"
+_NONCE_SIZE = 12
+
+
+def _encrypt(data: bytes) -> str:
+    nonce = os.urandom(_NONCE_SIZE)
+    return _V2_PREFIX + base64.urlsafe_b64encode(nonce + _AESGCM.encrypt(nonce, data, None)).decode()
+
+
+def _decrypt(token: str) -> bytes:
+    if token.startswith(_V2_PREFIX):
+        blob = base64.urlsafe_b64decode(token[len(_V2_PREFIX):])
+        return _AESGCM.decrypt(blob[:_NONCE_SIZE], blob[_NONCE_SIZE:], None)
+    return _FERNET.decrypt(token.encode())
+
+
+def get_fernet() -> Fernet:
+    """프로세스 공용 Fernet 인스턴스를 반환합니다 (기존 토큰 호환용)."""
+    return _FERNET
 
 
 def encrypt_value(plaintext: str) -> str:
-    """문자열을 Fernet으로 암호화하여 base64 문자열로 반환합니다."""
-    f = get_fernet()
-    return f.encrypt(plaintext.encode()).decode()
+    """문자열을 AES-GCM으로 암호화하여 "v2:" 접두사 base64 문자열로 반환합니다."""
+    return _encrypt(plaintext.encode())
 
 
 def decrypt_value(ciphertext: str) -> str:
-    """Fernet 암호화된 base64 문자열을 복호화합니다."""
-    f = get_fernet()
-    return f.decrypt(ciphertext.encode()).decode()
+    """암호문을 복호화합니다 (v2 AES-GCM / 기존 Fernet 모두 지원)."""
+    return _decrypt(ciphertext).decode()
+
+
+def decrypt_values(ciphertexts: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """
+    여러 암호문을 한 번에 복호화합니다.
+    빈 값이나 복호화 실패 항목은 None으로 반환합니다 (입력 순서 유지).
+    """
+    out: List[Optional[str]] = []
+    for token in ciphertexts:
+        if not token:
+            out.append(None)
+            continue
+        try:
+            out.append(_decrypt(token).decode())
+        except (InvalidToken, InvalidTag, ValueError, TypeError):
+            out.append(None)
+    return out
+
+
+async def aencrypt_value(plaintext: str) -> str:
+    """encrypt_value를 워커 스레드에서 실행합니다."""
+    return await asyncio.to_thread(encrypt_value, plaintext)
+
+
+async def adecrypt_value(ciphertext: str) -> str:
+    """decrypt_value를 워커 스레드에서 실행합니다."""
+    return await asyncio.to_thread(decrypt_value, ciphertext)
+
+
+async def adecrypt_values(ciphertexts: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """decrypt_values를 워커 스레드에서 실행합니다 (여러 값을 한 번의 스레드 전환으로 처리)."""
+    return await asyncio.to_thread(decrypt_values, list(ciphertexts))
@@ -1,34 +1,106 @@
+import base64
+import hashlib
+import hmac
+import json
+import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from jose import jwt
-from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2-cffi / bcrypt를 직접 호출 (passlib 핸들러 레지스트리·백엔드 탐색 생략)
+# argon2id 우선, 기존 bcrypt 해시는 검증 후 로그인 시 argon2로 재해시
+# parallelism은 해시 파라미터에 기록되므로 호스트 코어 수와 무관하게 고정
+# (호스트마다 다르면 check_needs_rehash가 컨테이너 간에 번갈아 True가 되어 로그인마다 재해시)
+_hasher = PasswordHasher(parallelism=4)
+
+
+def _is_bcrypt(hashed_password: str) -> bool:
+    return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    if _is_bcrypt(hashed_password):
+        try:
+            return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        except ValueError:  # 손상된 bcrypt 해시 (잘못된 salt 등)
+            return False
+    try:
+        return _hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """비밀번호 검증 + 구식 해시(bcrypt, 이전 파라미터 argon2)면 새 argon2 해시를 함께 반환합니다."""
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if _is_bcrypt(hashed_password) or _hasher.check_needs_rehash(hashed_password):
+        return True, _hasher.hash(plain_password)
+    return True, None
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _hasher.hash(password)
 
 
-# 타이밍 공격 방지용 더미 해시 (실제 해시와 동일한 시간 소요)
-_DUMMY_HASH = "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/X4.qL/Z/5p3H3KZnG"
+# 타이밍 공격 방지용 더미 해시 — _hasher로 생성해 실제 해시와 파라미터가 항상 일치
+_DUMMY_HASH = _hasher.hash(secrets.token_hex(16))
 
 
 def get_dummy_hash() -> str:
     """타이밍 공격 방지를 위한 더미 해시 반환"""
     return _DUMMY_HASH
 
+
+def verify_password_constant_time(
+    plain_password: str, hashed_password: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """
+    사용자 존재 여부와 무관하게 동일한 해시 검증을 수행합니다.
+    - hashed_password가 None이면 더미 해시로 같은 연산을 수행하고 결과는 항상 False
+    - 반환: (검증 성공 여부, 업그레이드된 해시 또는 None)
+    """
+    if hashed_password is None:
+        # 재해시 판단 없이 검증만 수행 — 파라미터 차이로 더미 경로만 느려지는 것을 방지
+        verify_password(plain_password, _DUMMY_HASH)
+        return False, None
+    return verify_and_update_password(plain_password, hashed_password)
+
+# HS* 서명용 해시 함수 — 헤더는 모듈 로드 시 한 번만 인코딩
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+# 토큰 발급마다 참조하는 설정값은 import 시점에 스냅샷
+_ALG = settings.ALGORITHM
+_SECRET = settings.SECRET_KEY.encode()
+_EXP = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# jose와 동일한 직렬화 (sort_keys, 공백 없음) → 기존 토큰과 바이트 단위로 호환
+_HEADER_B64 = _b64url(
+    json.dumps({"alg": _ALG, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode()
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     # Python 3.12+ 호환: datetime.now(timezone.utc) 사용
     now = datetime.now(timezone.utc)
-    if expires_delta:
-        expire = now + expires_delta
-    else:
-        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "iat": now})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    expire = now + (expires_delta or _EXP)
+
+    digest = _HMAC_DIGESTS.get(_ALG)
+    if digest is None:
+        # 비대칭 알고리즘(RS*/ES*)은 라이브러리 경로 유지
+        to_encode.update({"exp": expire, "iat": now})
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=_ALG)
+
+    # exp/iat는 jose와 동일하게 정수 epoch(초)로 기록
+    to_encode.update({"exp": int(expire.timestamp()), "iat": int(now.timestamp())})
+    signing_input = _HEADER_B64 + b"." + _b64url(json.dumps(to_encode, separators=(",", ":")).encode())
+    signature = _b64url(hmac.new(_SECRET, signing_input, digest).digest())
+    return (signing_input + b"." + signature).decode("ascii")
@@ -2,30 +2,39 @@
 에이전트 CRUD
 """
 from typing import Optional, List
-from sqlalchemy import select
+from sqlalchemy import Row, select, update, delete, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.agent import Agent
 
 
-async def list_agents(db: AsyncSession, user_id: int) -> List[Agent]:
+# 목록 응답(AgentResponse)에 필요한 컬럼만 조회 — ORM 인스턴스/identity map 생성 생략
+_AGENT_LIST_COLUMNS = (
+    Agent.id, Agent.agent_id, Agent.name, Agent.description, Agent.model,
+    Agent.system_prompt, Agent.icon, Agent.color, Agent.agent_type,
+    Agent.published, Agent.sort_order, Agent.default_tools,
+    Agent.created_at, Agent.updated_at,
+)
+
+
+async def list_agents(db: AsyncSession, user_id: int) -> List[Row]:
     stmt = (
-        select(Agent)
+        select(*_AGENT_LIST_COLUMNS)
         .where(Agent.user_id == user_id)
         .order_by(Agent.sort_order, Agent.created_at)
     )
     result = await db.execute(stmt)
-    return list(result.scalars().all())
+    return list(result.all())
 
 
 async def get_agent(db: AsyncSession, user_id: int, agent_id: str) -> Optional[Agent]:
-    stmt = select(Agent).where(Agent.user_id == user_id, Agent.agent_id == agent_id)
+    stmt = lambda_stmt(lambda: select(Agent).where(Agent.user_id == user_id, Agent.agent_id == agent_id))
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
 async def get_agent_by_pk(db: AsyncSession, pk: int) -> Optional[Agent]:
-    stmt = select(Agent).where(Agent.id == pk)
+    stmt = lambda_stmt(lambda: select(Agent).where(Agent.id == pk))
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -39,21 +48,28 @@ async def create_agent(db: AsyncSession, user_id: int, **kwargs) -> Agent:
 
 
 async def update_agent(db: AsyncSession, user_id: int, agent_id: str, updates: dict) -> Optional[Agent]:
-    agent = await get_agent(db, user_id, agent_id)
-    if not agent:
-        return None
-    for k, v in updates.items():
-        if hasattr(agent, k):
-            setattr(agent, k, v)
+    values = {k: v for k, v in updates.items() if k in Agent.__table__.columns}
+    if not values:
+        return await get_agent(db, user_id, agent_id)
+    # 단일 UPDATE ... RETURNING (SELECT + flush + refresh 왕복 제거)
+    stmt = (
+        update(Agent)
+        .where(Agent.user_id == user_id, Agent.agent_id == agent_id)
+        .values(**values)
+        .returning(Agent)
+    )
+    agent = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    await db.refresh(agent)
     return agent
 
 
 async def delete_agent(db: AsyncSession, user_id: int, agent_id: str) -> bool:
-    agent = await get_agent(db, user_id, agent_id)
-    if not agent:
-        return False
-    await db.delete(agent)
+    # 단일 DELETE ... RETURNING — 세션의 agent_pk는 FK ON DELETE SET NULL로 DB가 처리
+    stmt = (
+        delete(Agent)
+        .where(Agent.user_id == user_id, Agent.agent_id == agent_id)
+        .returning(Agent.id)
+    )
+    deleted = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    return True
+    return deleted is not None
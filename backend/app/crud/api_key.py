@@ -1,25 +1,34 @@
 from typing import Optional, List
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.upsert import upsert_insert
 from app.models.api_key import ApiKey
-from app.core.encryption import encrypt_value, decrypt_value
+from app.core.encryption import aencrypt_value, adecrypt_value
+
+
+def mask_api_key(plain: str) -> str:
+    """API 키 마스킹 (앞 4자 + *** + 뒤 3자, 짧은 키는 *** 만)"""
+    if len(plain) > 7:
+        return plain[:4] + "***" + plain[-3:]
+    return "***"
 
 
 async def get_api_keys_for_user(db: AsyncSession, user_id: int) -> List[ApiKey]:
     """사용자의 모든 API 키를 조회합니다."""
     result = await db.execute(
-        select(ApiKey).where(ApiKey.user_id == user_id)
+        lambda_stmt(lambda: select(ApiKey).where(ApiKey.user_id == user_id))
     )
     return list(result.scalars().all())
 
 
 async def get_api_key_for_user(db: AsyncSession, user_id: int, provider: str) -> Optional[ApiKey]:
     """사용자의 특정 프로바이더 API 키 객체를 반환합니다."""
+    # provider는 컬럼 타입(LowerString)이 바인딩 시 소문자로 정규화
     result = await db.execute(
-        select(ApiKey).where(
-            and_(ApiKey.user_id == user_id, ApiKey.provider == provider.lower())
-        )
+        lambda_stmt(lambda: select(ApiKey).where(
+            and_(ApiKey.user_id == user_id, ApiKey.provider == provider)
+        ))
     )
     return result.scalars().first()
 
@@ -28,40 +37,34 @@ async def get_api_key_value(db: AsyncSession, user_id: int, provider: str) -> Op
     """사용자의 특정 프로바이더 API 키를 복호화하여 반환합니다."""
     key_row = await get_api_key_for_user(db, user_id, provider)
     if key_row:
-        return decrypt_value(key_row.encrypted_key)
+        return await adecrypt_value(key_row.encrypted_key)
     return None
 
 
 async def save_api_key(db: AsyncSession, user_id: int, provider: str, key: str) -> ApiKey:
-    """API 키를 암호화하여 저장합니다 (upsert)."""
-    provider_lower = provider.lower()
-    result = await db.execute(
-        select(ApiKey).where(
-            and_(ApiKey.user_id == user_id, ApiKey.provider == provider_lower)
-        )
-    )
-    existing = result.scalars().first()
-
-    encrypted = encrypt_value(key)
+    """API 키를 암호화하여 저장합니다 (INSERT ... ON CONFLICT DO UPDATE 단일 문장)."""
+    encrypted = await aencrypt_value(key)
+    masked = mask_api_key(key)
 
-    if existing:
-        existing.encrypted_key = encrypted
-        await db.commit()
-        await db.refresh(existing)
-        return existing
-
-    new_key = ApiKey(user_id=user_id, provider=provider_lower, encrypted_key=encrypted)
-    db.add(new_key)
+    stmt = upsert_insert(db, ApiKey).values(
+        user_id=user_id, provider=provider,
+        encrypted_key=encrypted, masked_key=masked,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ApiKey.user_id, ApiKey.provider],
+        set_={"encrypted_key": encrypted, "masked_key": masked},
+    ).returning(ApiKey)
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    key_row = result.scalar_one()
     await db.commit()
-    await db.refresh(new_key)
-    return new_key
+    return key_row
 
 
 async def delete_api_key(db: AsyncSession, user_id: int, provider: str) -> bool:
     """API 키를 삭제합니다."""
     result = await db.execute(
         select(ApiKey).where(
-            and_(ApiKey.user_id == user_id, ApiKey.provider == provider.lower())
+            and_(ApiKey.user_id == user_id, ApiKey.provider == provider)
         )
     )
     key_row = result.scalars().first()
@@ -1,27 +1,42 @@
 """
 외부 서비스 CRUD
 """
-from sqlalchemy import select, delete
+from typing import List
+
+from sqlalchemy import Row, func, select, delete, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.external_service import ExternalService
-from app.core.encryption import encrypt_value, decrypt_value
+from app.core.encryption import aencrypt_value, adecrypt_values
+
+
+# 목록 응답(ExternalServiceResponse)에 필요한 컬럼만 조회 — 암호화된 시크릿(TEXT)은 존재 여부만 DB에서 계산
+_SERVICE_LIST_COLUMNS = (
+    ExternalService.service_id, ExternalService.name, ExternalService.service_type,
+    func.coalesce(ExternalService.url, "").label("url"),
+    func.coalesce(ExternalService.username, "").label("username"),
+    func.coalesce(ExternalService.database, "").label("database"),
+    ExternalService.port, ExternalService.is_default,
+    ExternalService.api_key_encrypted.isnot(None).label("has_api_key"),
+    ExternalService.encrypted_password.isnot(None).label("has_password"),
+    ExternalService.created_at,
+)
 
 
-async def list_external_services(db: AsyncSession, user_id: int):
+async def list_external_services(db: AsyncSession, user_id: int) -> List[Row]:
     result = await db.execute(
-        select(ExternalService)
+        select(*_SERVICE_LIST_COLUMNS)
         .where(ExternalService.user_id == user_id)
         .order_by(ExternalService.created_at.desc())
     )
-    return result.scalars().all()
+    return list(result.all())
 
 
 async def get_external_service(db: AsyncSession, user_id: int, service_id: str):
-    result = await db.execute(
-        select(ExternalService)
+    result = await db.execute(lambda_stmt(
+        lambda: select(ExternalService)
         .where(ExternalService.user_id == user_id, ExternalService.service_id == service_id)
-    )
+    ))
     return result.scalar_one_or_none()
 
 
@@ -38,9 +53,9 @@ async def create_external_service(db: AsyncSession, user_id: int, data: dict) ->
         is_default=data.get("is_default", False),
     )
     if data.get("api_key"):
-        svc.api_key_encrypted = encrypt_value(data["api_key"])
+        svc.api_key_encrypted = await aencrypt_value(data["api_key"])
     if data.get("password"):
-        svc.encrypted_password = encrypt_value(data["password"])
+        svc.encrypted_password = await aencrypt_value(data["password"])
 
     db.add(svc)
     await db.commit()
@@ -53,9 +68,9 @@ async def update_external_service(db: AsyncSession, svc: ExternalService, update
         if key in updates and updates[key] is not None:
             setattr(svc, key, updates[key])
     if "api_key" in updates and updates["api_key"] is not None:
-        svc.api_key_encrypted = encrypt_value(updates["api_key"])
+        svc.api_key_encrypted = await aencrypt_value(updates["api_key"])
     if "password" in updates and updates["password"] is not None:
-        svc.encrypted_password = encrypt_value(updates["password"])
+        svc.encrypted_password = await aencrypt_value(updates["password"])
 
     await db.commit()
     await db.refresh(svc)
@@ -86,14 +101,9 @@ async def get_decrypted_service(db: AsyncSession, user_id: int, service_id: str)
         "database": svc.database,
         "port": svc.port,
     }
+    api_key, password = await adecrypt_values((svc.api_key_encrypted, svc.encrypted_password))
     if svc.api_key_encrypted:
-        try:
-            result["api_key"] = decrypt_value(svc.api_key_encrypted)
-        except Exception:
-            result["api_key"] = None
+        result["api_key"] = api_key
     if svc.encrypted_password:
-        try:
-            result["password"] = decrypt_value(svc.encrypted_password)
-        except Exception:
-            result["password"] = None
+        result["password"] = password
     return result
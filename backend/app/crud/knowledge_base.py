@@ -1,8 +1,8 @@
 """
 지식 베이스 CRUD
 """
-from typing import Optional, List
-from sqlalchemy import select, func
+from typing import AsyncIterator, Optional, List
+from sqlalchemy import select, func, update, delete, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.knowledge_base import KnowledgeBase, KnowledgeFile
@@ -10,18 +10,34 @@ from app.models.knowledge_base import KnowledgeBase, KnowledgeFile
 
 async def list_knowledge_bases(db: AsyncSession, user_id: int) -> List[dict]:
     """사용자의 KB 목록을 파일 수 포함하여 반환합니다."""
+    # KB별 상관 서브쿼리 COUNT — kb_pk 인덱스 탐색으로 처리 (전체 파일 JOIN + GROUP BY 회피)
+    file_count = (
+        select(func.count(KnowledgeFile.id))
+        .where(KnowledgeFile.kb_pk == KnowledgeBase.id)
+        .correlate(KnowledgeBase)
+        .scalar_subquery()
+        .label("file_count")
+    )
     stmt = (
         select(
-            KnowledgeBase,
-            func.count(KnowledgeFile.id).label("file_count")
+            KnowledgeBase.id,
+            KnowledgeBase.kb_id,
+            KnowledgeBase.name,
+            KnowledgeBase.description,
+            KnowledgeBase.chunk_size,
+            KnowledgeBase.chunk_overlap,
+            KnowledgeBase.external_service_id,
+            KnowledgeBase.chunking_method,
+            KnowledgeBase.semantic_threshold,
+            KnowledgeBase.created_at,
+            KnowledgeBase.updated_at,
+            file_count,
         )
-        .outerjoin(KnowledgeFile, KnowledgeFile.kb_pk == KnowledgeBase.id)
         .where(KnowledgeBase.user_id == user_id)
-        .group_by(KnowledgeBase.id)
         .order_by(KnowledgeBase.created_at)
     )
     result = await db.execute(stmt)
-    rows = result.all()
+    # 엔티티 대신 컬럼을 조회해 ORM 인스턴스 생성 생략
     return [
         {
             "id": kb.id,
@@ -33,20 +49,20 @@ async def list_knowledge_bases(db: AsyncSession, user_id: int) -> List[dict]:
             "external_service_id": kb.external_service_id,
             "chunking_method": kb.chunking_method or "fixed",
             "semantic_threshold": kb.semantic_threshold or 0.75,
-            "file_count": file_count,
+            "file_count": kb.file_count,
             "created_at": kb.created_at,
             "updated_at": kb.updated_at,
         }
-        for kb, file_count in rows
+        for kb in result
     ]
 
 
 async def get_knowledge_base(db: AsyncSession, user_id: int, kb_id: str) -> Optional[KnowledgeBase]:
     """KB를 kb_id + user_id로 조회합니다."""
-    stmt = select(KnowledgeBase).where(
+    stmt = lambda_stmt(lambda: select(KnowledgeBase).where(
         KnowledgeBase.user_id == user_id,
         KnowledgeBase.kb_id == kb_id,
-    )
+    ))
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -77,26 +93,31 @@ async def create_knowledge_base(db: AsyncSession, user_id: int, kb_id: str, name
 
 async def update_knowledge_base(db: AsyncSession, user_id: int, kb_id: str,
                                  updates: dict) -> Optional[KnowledgeBase]:
-    """KB를 부분 업데이트합니다."""
-    kb = await get_knowledge_base(db, user_id, kb_id)
-    if not kb:
-        return None
-    for k, v in updates.items():
-        if hasattr(kb, k):
-            setattr(kb, k, v)
+    """KB를 부분 업데이트합니다 (단일 UPDATE ... RETURNING)."""
+    values = {k: v for k, v in updates.items() if k in KnowledgeBase.__table__.columns}
+    if not values:
+        return await get_knowledge_base(db, user_id, kb_id)
+    stmt = (
+        update(KnowledgeBase)
+        .where(KnowledgeBase.user_id == user_id, KnowledgeBase.kb_id == kb_id)
+        .values(**values)
+        .returning(KnowledgeBase)
+    )
+    kb = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    await db.refresh(kb)
     return kb
 
 
 async def delete_knowledge_base(db: AsyncSession, user_id: int, kb_id: str) -> bool:
-    """KB를 삭제합니다."""
-    kb = await get_knowledge_base(db, user_id, kb_id)
-    if not kb:
-        return False
-    await db.delete(kb)
+    """KB를 삭제합니다 (파일 메타데이터는 FK ON DELETE CASCADE로 DB가 삭제)."""
+    stmt = (
+        delete(KnowledgeBase)
+        .where(KnowledgeBase.user_id == user_id, KnowledgeBase.kb_id == kb_id)
+        .returning(KnowledgeBase.id)
+    )
+    deleted = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    return True
+    return deleted is not None
 
 
 # ============================================================
@@ -115,30 +136,35 @@ async def create_knowledge_file(db: AsyncSession, kb_pk: int, filename: str,
     )
     db.add(kf)
     await db.commit()
-    await db.refresh(kf)
     return kf
 
 
 async def update_file_status(db: AsyncSession, file_id: int, status: str,
                               chunk_count: int = 0, error_message: str = None):
     """파일 처리 상태를 업데이트합니다."""
-    stmt = select(KnowledgeFile).where(KnowledgeFile.id == file_id)
-    result = await db.execute(stmt)
-    kf = result.scalar_one_or_none()
-    if kf:
-        kf.status = status
-        kf.chunk_count = chunk_count
-        if error_message:
-            kf.error_message = error_message
-        await db.commit()
+    values = {"status": status, "chunk_count": chunk_count}
+    if error_message:
+        values["error_message"] = error_message
+    await db.execute(update(KnowledgeFile).where(KnowledgeFile.id == file_id).values(**values))
+    await db.commit()
 
 
-async def get_files_for_kb(db: AsyncSession, kb_pk: int) -> List[KnowledgeFile]:
-    """KB의 파일 목록을 반환합니다."""
-    stmt = (
+def _files_for_kb_stmt(kb_pk: int):
+    return (
         select(KnowledgeFile)
         .where(KnowledgeFile.kb_pk == kb_pk)
         .order_by(KnowledgeFile.uploaded_at.desc())
     )
-    result = await db.execute(stmt)
+
+
+async def get_files_for_kb(db: AsyncSession, kb_pk: int) -> List[KnowledgeFile]:
+    """KB의 파일 목록을 반환합니다."""
+    result = await db.execute(_files_for_kb_stmt(kb_pk))
     return list(result.scalars().all())
+
+
+async def stream_files_for_kb(db: AsyncSession, kb_pk: int) -> AsyncIterator[KnowledgeFile]:
+    """KB의 파일을 서버측 커서로 한 행씩 반환합니다 (전체 목록을 메모리에 올리지 않음)."""
+    result = await db.stream_scalars(_files_for_kb_stmt(kb_pk))
+    async for kf in result:
+        yield kf
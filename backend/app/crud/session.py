@@ -2,21 +2,28 @@
 채팅 세션 + 메시지 CRUD
 """
 import uuid
-from typing import Optional, List
-from sqlalchemy import select, func
+from typing import AsyncIterator, Optional, List, Union
+
+import orjson
+from sqlalchemy import Row, select, func, update, delete, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload
 
 from app.models.chat_session import ChatSession, ChatMessage
 from app.models.agent import Agent
 
 
 async def list_sessions(db: AsyncSession, user_id: int, limit: int = 50, offset: int = 0) -> List[dict]:
-    """세션 목록 (메시지 수 포함, 최신순)"""
+    """세션 목록 (메시지 수 포함, 최신순) — 응답에 쓰는 컬럼만 조회"""
     stmt = (
         select(
-            ChatSession,
-            func.count(ChatMessage.id).label("message_count"),
+            ChatSession.id,
+            ChatSession.session_id,
+            ChatSession.title,
+            ChatSession.created_at,
+            ChatSession.updated_at,
+            # session_pk로 세면 ix_msg_session_created만으로 계산 (index-only scan)
+            func.count(ChatMessage.session_pk).label("message_count"),
             Agent.agent_id.label("agent_id_str"),
         )
         .outerjoin(ChatMessage, ChatMessage.session_pk == ChatSession.id)
@@ -28,31 +35,73 @@ async def list_sessions(db: AsyncSession, user_id: int, limit: int = 50, offset:
         .limit(limit)
     )
     result = await db.execute(stmt)
-    rows = result.all()
     return [
         {
-            "id": s.id,
-            "session_id": s.session_id,
-            "title": s.title,
-            "agent_id": agent_id_str,
-            "message_count": msg_count,
-            "created_at": s.created_at,
-            "updated_at": s.updated_at,
+            "id": row.id,
+            "session_id": row.session_id,
+            "title": row.title,
+            "agent_id": row.agent_id_str,
+            "message_count": row.message_count,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
         }
-        for s, msg_count, agent_id_str in rows
+        for row in result
     ]
 
 
+# 메시지가 필요 없는 경로용 로더 옵션을 한 번 구성해 요청마다 재사용
+# - agent는 관계 기본값이 joined (같은 SELECT), messages는 selectin (세션 N개 → IN 쿼리 1회)
+# (임포트 시점에 만들면 모든 모델 로드 전에 매퍼 구성이 일어나므로 첫 호출 시 생성)
+_no_messages_options: tuple = ()
+
+
+def _get_no_messages_options() -> tuple:
+    """
+    메시지가 필요 없는 경로용 (생성/수정 응답) — selectin 기본 로딩 생략
+
+    noload는 identity map의 messages를 "로드된 빈 목록"으로 남겨 같은 세션의 이후 get_session이
+    []를 반환하므로, 미로드 상태로 두는 raiseload 사용 (이후 조회 시 정상 로드)
+    """
+    global _no_messages_options
+    if not _no_messages_options:
+        _no_messages_options = (raiseload(ChatSession.messages),)
+    return _no_messages_options
+
+
 async def get_session(db: AsyncSession, user_id: int, session_id: str) -> Optional[ChatSession]:
     stmt = (
         select(ChatSession)
-        .options(selectinload(ChatSession.messages))
         .where(ChatSession.user_id == user_id, ChatSession.session_id == session_id)
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def get_session_header(db: AsyncSession, user_id: int, session_id: str) -> Optional[Row]:
+    """세션 메타데이터 + 에이전트 ID만 조회 (메시지 로드 없음)"""
+    stmt = (
+        select(
+            ChatSession.id,
+            ChatSession.session_id,
+            ChatSession.title,
+            Agent.agent_id.label("agent_id_str"),
+            ChatSession.created_at,
+            ChatSession.updated_at,
+        )
+        .outerjoin(Agent, Agent.id == ChatSession.agent_pk)
+        .where(ChatSession.user_id == user_id, ChatSession.session_id == session_id)
+    )
+    return (await db.execute(stmt)).first()
+
+
+async def get_session_pk(db: AsyncSession, user_id: int, session_id: str) -> Optional[int]:
+    """소유권 확인 + PK만 조회 (메시지/에이전트 로드 없음)"""
+    stmt = lambda_stmt(lambda: select(ChatSession.id).where(
+        ChatSession.user_id == user_id, ChatSession.session_id == session_id
+    ))
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
 async def create_session(db: AsyncSession, user_id: int, title: str = "새로운 대화",
                           session_id: str = None, agent_pk: int = None) -> ChatSession:
     s = ChatSession(
@@ -63,61 +112,106 @@ async def create_session(db: AsyncSession, user_id: int, title: str = "새로운
     )
     db.add(s)
     await db.commit()
-    await db.refresh(s)
     return s
 
 
 async def update_session(db: AsyncSession, user_id: int, session_id: str, updates: dict) -> Optional[ChatSession]:
-    s = await get_session(db, user_id, session_id)
-    if not s:
-        return None
-    for k, v in updates.items():
-        if hasattr(s, k):
-            setattr(s, k, v)
+    values = {k: v for k, v in updates.items() if k in ChatSession.__table__.columns}
+    if not values:
+        return await get_session(db, user_id, session_id)
+    # 단일 UPDATE ... RETURNING (관계 eager load 없이 컬럼만 반환)
+    stmt = (
+        update(ChatSession)
+        .where(ChatSession.user_id == user_id, ChatSession.session_id == session_id)
+        .values(**values)
+        .returning(ChatSession)
+        .options(*_get_no_messages_options())
+    )
+    s = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    await db.refresh(s)
     return s
 
 
 async def delete_session(db: AsyncSession, user_id: int, session_id: str) -> bool:
-    stmt = select(ChatSession).where(
-        ChatSession.user_id == user_id, ChatSession.session_id == session_id
+    # 단일 DELETE ... RETURNING — 메시지는 FK ON DELETE CASCADE로 DB가 삭제 (파이썬으로 로드하지 않음)
+    stmt = (
+        delete(ChatSession)
+        .where(ChatSession.user_id == user_id, ChatSession.session_id == session_id)
+        .returning(ChatSession.id)
     )
-    result = await db.execute(stmt)
-    s = result.scalar_one_or_none()
-    if not s:
-        return False
-    await db.delete(s)
+    deleted = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    return True
+    return deleted is not None
 
 
 # ============================================================
 # 메시지 CRUD
 # ============================================================
 
+def _touch_session_stmt(session_pk: int):
+    """메시지 추가 시 세션 updated_at 갱신 (목록 정렬 + 히스토리 캐시 리비전)"""
+    return update(ChatSession).where(ChatSession.id == session_pk).values(updated_at=func.now())
+
+
+def dump_message_meta(meta: Union[str, dict, list, None]) -> Optional[str]:
+    """메타데이터를 저장용 JSON 문자열로 변환 (이미 문자열이면 그대로, 빈 값은 None)"""
+    if meta is None or isinstance(meta, str):
+        return meta or None
+    return orjson.dumps(meta).decode() if meta else None
+
+
 async def add_message(db: AsyncSession, session_pk: int, role: str, content: str,
-                       thinking: str = None, metadata_json: str = None) -> ChatMessage:
+                       thinking: str = None,
+                       metadata_json: Union[str, dict, list, None] = None) -> ChatMessage:
     msg = ChatMessage(
         session_pk=session_pk,
         role=role,
         content=content,
         thinking=thinking,
-        metadata_json=metadata_json,
+        metadata_json=dump_message_meta(metadata_json),
     )
     db.add(msg)
+    await db.execute(_touch_session_stmt(session_pk))
     await db.commit()
-    await db.refresh(msg)
     return msg
 
 
-async def get_messages(db: AsyncSession, session_pk: int, limit: int = 100, offset: int = 0) -> List[ChatMessage]:
-    stmt = (
+async def add_messages_bulk(db: AsyncSession, session_pk: int, rows: List[dict]) -> List[ChatMessage]:
+    """
+    여러 메시지를 단일 INSERT(executemany + RETURNING)와 한 번의 커밋으로 저장합니다.
+    - rows: role/content/thinking/metadata_json 키를 가진 dict 목록 (입력 순서대로 저장)
+    - metadata_json은 문자열 또는 dict/list (dict/list는 저장 시 직렬화)
+    """
+    if not rows:
+        return []
+    params = [
+        {**row, "session_pk": session_pk, "metadata_json": dump_message_meta(row.get("metadata_json"))}
+        for row in rows
+    ]
+    msgs = await ChatMessage.bulk_insert(db, params, returning=True)
+    await db.execute(_touch_session_stmt(session_pk))
+    await db.commit()
+    return msgs
+
+
+def _messages_stmt(session_pk: int, limit: Optional[int], offset: int):
+    return (
         select(ChatMessage)
         .where(ChatMessage.session_pk == session_pk)
         .order_by(ChatMessage.created_at)
         .offset(offset)
         .limit(limit)
     )
-    result = await db.execute(stmt)
+
+
+async def get_messages(db: AsyncSession, session_pk: int, limit: Optional[int] = 100, offset: int = 0) -> List[ChatMessage]:
+    result = await db.execute(_messages_stmt(session_pk, limit, offset))
     return list(result.scalars().all())
+
+
+async def stream_messages(db: AsyncSession, session_pk: int, limit: Optional[int] = 100,
+                          offset: int = 0) -> AsyncIterator[ChatMessage]:
+    """메시지를 서버측 커서로 한 행씩 반환합니다 (직렬화와 DB 읽기를 겹침)."""
+    result = await db.stream_scalars(_messages_stmt(session_pk, limit, offset))
+    async for msg in result:
+        yield msg
@@ -1,15 +1,18 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import lambda_stmt
 from sqlalchemy.future import select
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import get_password_hash
 
 async def get_user_by_email(db: AsyncSession, email: str):
-    result = await db.execute(select(User).where(User.email == email))
+    # 인증 요청마다 호출 — lambda_stmt로 구문 생성/캐시 키 계산을 최초 1회로 한정, email만 재바인딩
+    result = await db.execute(lambda_stmt(lambda: select(User).where(User.email == email)))
     return result.scalars().first()
 
 async def create_user(db: AsyncSession, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, user.password)
     db_user = User(
         email=user.email,
         name=user.name,
@@ -2,6 +2,7 @@ from typing import Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.upsert import upsert_insert
 from app.models.user_settings import UserSettings
 
 
@@ -14,16 +15,24 @@ async def get_user_settings(db: AsyncSession, user_id: int) -> Optional[UserSett
 
 
 async def create_default_settings(db: AsyncSession, user_id: int) -> UserSettings:
-    """기본 사용자 설정을 생성합니다."""
-    settings = UserSettings(user_id=user_id)
-    db.add(settings)
+    """
+    기본 사용자 설정을 생성합니다.
+    - 동시 요청으로 이미 생성된 경우에도 예외 없이 기존 행을 반환 (ON CONFLICT)
+    """
+    stmt = upsert_insert(db, UserSettings).values(user_id=user_id)
+    # no-op 갱신으로 충돌 시에도 RETURNING이 기존 행을 돌려주도록 함
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserSettings.user_id],
+        set_={"user_id": stmt.excluded.user_id},
+    ).returning(UserSettings)
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    settings = result.scalar_one()
     await db.commit()
-    await db.refresh(settings)
     return settings
 
 
 async def get_or_create_settings(db: AsyncSession, user_id: int) -> UserSettings:
-    """사용자 설정을 조회하거나 없으면 기본값을 생성합니다."""
+    """사용자 설정을 조회하거나 없으면 기본값을 생성합니다 (생성 경로는 경합에 안전)."""
     existing = await get_user_settings(db, user_id)
     if existing:
         return existing
@@ -1,2 +1,40 @@
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+
+def user_fk(nullable: bool = False, index: bool = True, **kwargs) -> Column:
+    """
+    users.id 참조 FK (ON DELETE CASCADE). PostgreSQL은 FK 컬럼을 자동 인덱싱하지 않으므로 기본 index=True
+    - user_id가 선두 컬럼인 복합/유니크 인덱스가 이미 있으면 index=False (중복 인덱스 방지)
+    """
+    return Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=nullable, index=index, **kwargs)
+
+
+class TimestampMixin:
+    """created_at / updated_at 공통 컬럼 (둘 다 DB 기본값 now(), updated_at은 ORM UPDATE 시 갱신)"""
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class BulkInsertMixin:
+    """대량 적재 경로용 Core executemany INSERT (ORM 인스턴스/identity map 생성 생략)"""
+
+    @classmethod
+    async def bulk_insert(cls, session: AsyncSession, rows: List[dict],
+                          returning: bool = False) -> Optional[list]:
+        """
+        rows를 단일 executemany INSERT로 적재합니다 (insertmanyvalues 배치, 커밋은 호출 측).
+        returning=True면 입력 순서대로 생성된 ORM 객체 목록을 반환합니다.
+        """
+        if not rows:
+            return [] if returning else None
+        if returning:
+            stmt = insert(cls).returning(cls, sort_by_parameter_order=True)
+            return list((await session.scalars(stmt, rows)).all())
+        await session.execute(insert(cls.__table__), rows)
+        return None
@@ -0,0 +1,62 @@
+"""
+PostgreSQL 선언적 파티셔닝 지원
+- table.info["partition_key"]가 지정된 테이블은 PostgreSQL DDL에서 PK에 파티션 키 컬럼을 덧붙임
+  (파티션 테이블의 PK/UNIQUE는 파티션 키를 포함해야 함). ORM 매핑상의 PK(id)는 그대로 유지
+- chat_messages session_pk HASH 파티션(chat_messages_pN) 생성 — 세션 단위 조회가 파티션 하나로 한정됨
+  (MODULUS는 생성 후 변경 불가 — MESSAGE_PARTITION_COUNT 변경 시 수동 재분할 필요)
+- 기존(비파티션) chat_messages 테이블은 건드리지 않음 — 전환은 수동 마이그레이션 필요
+"""
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import PrimaryKeyConstraint, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.compiler import compiles
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_TABLE = "chat_messages"
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _pk_with_partition_key(constraint, compiler, **kw):
+    table = constraint.table
+    key = table.info.get("partition_key") if table is not None else None
+    if not key:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+    names = [c.name for c in constraint.columns]
+    names += [k for k in key if k not in names]
+    ddl = ""
+    if constraint.name is not None:
+        ddl += f"CONSTRAINT {compiler.preparer.format_constraint(constraint)} "
+    return ddl + "PRIMARY KEY (%s)" % ", ".join(compiler.preparer.quote(n) for n in names)
+
+
+def hash_partitions(count: int) -> List[Tuple[str, int]]:
+    """(파티션명, REMAINDER) 목록 — chat_messages_p0 ~ chat_messages_p{count-1}"""
+    return [(f"{MESSAGE_TABLE}_p{i}", i) for i in range(count)]
+
+
+async def ensure_message_partitions(engine: AsyncEngine, count: Optional[int] = None) -> int:
+    """session_pk HASH 파티션을 생성합니다. 생성 대상 파티션 수 반환 (비대상이면 0)."""
+    if engine.dialect.name != "postgresql":
+        return 0
+    if count is None:
+        count = settings.MESSAGE_PARTITION_COUNT
+
+    async with engine.begin() as conn:
+        strategy = (await conn.execute(text(
+            "SELECT partstrat FROM pg_partitioned_table WHERE partrelid = to_regclass(:t)"
+        ), {"t": MESSAGE_TABLE})).scalar()
+        if strategy != "h":
+            logger.info(f"{MESSAGE_TABLE} is not hash-partitioned - partition setup skipped")
+            return 0
+        # HASH 파티션은 DEFAULT가 없으므로 모든 REMAINDER가 존재해야 INSERT 가능
+        for name, remainder in hash_partitions(count):
+            await conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {MESSAGE_TABLE} "
+                f"FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+            ))
+    return count
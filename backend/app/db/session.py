@@ -1,16 +1,38 @@
+import asyncio
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # DEBUG 모드일 때만 SQL 로깅 (프로덕션에서는 비활성화)
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_use_lifo=True,  # 최근 사용한 커넥션 우선 재사용 (서버측 캐시 유지, 유휴 커넥션은 recycle)
     pool_pre_ping=True,  # 연결 상태 확인
-    pool_recycle=3600,   # 1시간마다 연결 재활용
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    insertmanyvalues_page_size=1000,  # executemany INSERT를 1000행 단위 다중 VALUES로 묶음
 )
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+
+async def prewarm_pool():
+    """풀 크기만큼 커넥션을 미리 열어 첫 요청들의 연결 수립 지연을 제거합니다."""
+    conns = await asyncio.gather(
+        *(engine.connect() for _ in range(settings.DB_POOL_SIZE)),
+        return_exceptions=True,
+    )
+    opened = [c for c in conns if not isinstance(c, BaseException)]
+    await asyncio.gather(*(c.close() for c in opened))
+    logger.info(f"DB pool prewarmed: {len(opened)}/{settings.DB_POOL_SIZE} connections")
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -0,0 +1,54 @@
+"""
+공용 SQLAlchemy 컬럼 타입
+"""
+from typing import Dict
+
+from sqlalchemy import JSON, BigInteger, Integer, SmallInteger, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+
+
+class LowerString(TypeDecorator):
+    """바인딩 시 소문자로 정규화되는 문자열 (INSERT/UPDATE/WHERE 비교 모두 적용)"""
+
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.lower() if isinstance(value, str) else value
+
+
+class CodedString(TypeDecorator):
+    """
+    고정된 문자열 값 집합을 SMALLINT 코드로 저장 (애플리케이션에는 문자열 그대로 노출)
+    - 대용량 테이블의 저카디널리티 VARCHAR 컬럼 행 폭 축소용
+    - 코드 값은 저장 포맷이므로 기존 항목의 번호를 바꾸지 말 것 (새 값은 뒤에 추가)
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, codes: Dict[str, int]):
+        super().__init__()
+        self.codes = tuple(codes.items())  # 문장 캐시 키용 (해시 가능)
+        self._codes = dict(codes)
+        self._names = {v: k for k, v in codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"Unknown value {value!r} (expected one of {sorted(self._codes)})")
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self._names[value]
+
+
+# PostgreSQL은 JSONB (@> 포함 검색 + GIN 인덱스), 테스트용 SQLite는 JSON. None은 SQL NULL로 저장
+JSONBCompat = JSONB(none_as_null=True).with_variant(JSON(none_as_null=True), "sqlite")
+
+
+# 대용량 테이블 PK (21억 행 한도 해제). SQLite는 INTEGER PRIMARY KEY여야 자동 증가하므로 Integer
+BigIntCompat = BigInteger().with_variant(Integer, "sqlite")
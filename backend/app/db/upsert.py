@@ -0,0 +1,15 @@
+"""
+INSERT ... ON CONFLICT 헬퍼
+- 운영(PostgreSQL)과 테스트(SQLite) 모두 동일한 on_conflict_do_update/do_nothing API 제공
+- SELECT 후 INSERT/UPDATE 하던 2-RTT 패턴을 단일 문장으로 대체
+"""
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def upsert_insert(db: AsyncSession, model):
+    """세션이 연결된 DB 방언에 맞는 INSERT 구문 (on_conflict_* 지원) 반환"""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return pg_insert(model)
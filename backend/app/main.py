@@ -10,9 +10,12 @@ from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
 from app.api.api import api_router
-from app.db.session import engine
+from app.db.session import engine, prewarm_pool
 from app.db.base import Base
+from app.db.partitions import ensure_message_partitions
 from app.services.cache_service import get_cache_service
+from app.services.health import close_health_clients, probe, probe_all
+from app.services.http_client import close_http_client
 
 # 모든 모델 import (create_all에 필요)
 import app.models.user  # noqa: F401
@@ -69,10 +72,220 @@ async def lifespan(app: FastAPI):
                 await conn.execute(text(
                     "ALTER TABLE agents ADD COLUMN IF NOT EXISTS default_tools TEXT"
                 ))
-            logger.info("DB migration: dense_weight, tool_calls_json, schema_metadata, custom_model, agent_type, default_tools columns ensured")
+                await conn.execute(text(
+                    "ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS masked_key VARCHAR(20)"
+                ))
+                # TimestampMixin: updated_at도 INSERT 시 now()로 채움
+                for table in ("conversation_feedbacks", "training_datasets"):
+                    await conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN updated_at SET DEFAULT now()"))
+            logger.info("DB migration: dense_weight, tool_calls_json, schema_metadata, custom_model, agent_type, default_tools, masked_key columns, updated_at defaults ensured")
         except Exception as e:
             logger.warning(f"DB auto-migration skipped: {e}")
 
+        # 1-1-0. conversation_feedbacks 불리언 → flags 비트필드 전환은 옛 컬럼을 DROP하므로
+        # 앱 기동 시 실행하지 않음 — `python migrate_db.py --pack-feedback-flags`로 1회 수동 실행
+        try:
+            from sqlalchemy import text
+            async with engine.connect() as conn:
+                legacy = (await conn.execute(text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'conversation_feedbacks' AND column_name = 'is_verified'"
+                ))).scalar()
+            if legacy:
+                logger.warning(
+                    "conversation_feedbacks still has boolean flag columns - "
+                    "run `python migrate_db.py --pack-feedback-flags`"
+                )
+        except Exception as e:
+            logger.warning(f"conversation_feedbacks flags check skipped: {e}")
+
+        # 1-1-1. 복합 인덱스 (기존 테이블에는 create_all이 인덱스를 추가하지 않음)
+        try:
+            from sqlalchemy import text
+            from app.models.conversation_feedback import FLAG_INCLUDED
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_conn ON db_connections (user_id, conn_id)"
+                ))
+                await conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_mcp_server ON mcp_servers (user_id, server_id)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_mcp_user_sort ON mcp_servers (user_id, sort_order)"
+                ))
+                # 필터 + 정렬 경로용 복합 인덱스
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_sessions_listing ON chat_sessions (user_id, updated_at) "
+                    "INCLUDE (id, session_id, title, created_at, agent_pk)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_msg_session_created ON chat_messages (session_pk, created_at)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_fb_listing ON conversation_feedbacks (user_id, created_at) "
+                    "INCLUDE (rating, flags)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_feedback_session_idx ON conversation_feedbacks (session_id, message_index)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_files_kb_uploaded ON knowledge_files (kb_pk, uploaded_at)"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_agents_user_sort ON agents (user_id, sort_order, created_at)"
+                ))
+                # 필터 조건이 고정된 조회용 부분 인덱스
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_mcp_enabled ON mcp_servers (user_id, priority) WHERE enabled = true"
+                ))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_fb_training ON conversation_feedbacks (dataset_id) "
+                    f"WHERE (flags & {FLAG_INCLUDED}) <> 0"
+                ))
+                # 선두 컬럼 인덱스가 없던 FK (CASCADE / SET NULL 시 자식 테이블 전체 스캔 방지)
+                for table, column in (
+                    ("chat_sessions", "agent_pk"),
+                    ("conversation_feedbacks", "dataset_id"),
+                    ("training_datasets", "user_id"),
+                    ("finetuning_jobs", "user_id"),
+                    ("finetuning_jobs", "dataset_id"),
+                    ("external_services", "user_id"),
+                ):
+                    await conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"
+                    ))
+                # 복합/유니크 인덱스의 선두 컬럼과 겹치는 단일 컬럼 인덱스 제거 (쓰기 증폭 감소)
+                for redundant in (
+                    "ix_chat_messages_id",
+                    "ix_api_keys_user_id",
+                    "ix_knowledge_bases_kb_id",
+                    "ix_knowledge_files_kb_pk",
+                    "ix_agents_agent_id",
+                    "ix_conversation_feedbacks_session_id",
+                    # INCLUDE 커버링 인덱스(ix_sessions_listing, ix_fb_listing)로 대체
+                    "ix_sessions_user_updated", "ix_feedback_user_created",
+                    # PK에 index=True로 중복 생성됐던 인덱스
+                    "ix_users_id", "ix_user_settings_id", "ix_api_keys_id", "ix_agents_id",
+                    "ix_chat_sessions_id", "ix_knowledge_bases_id", "ix_knowledge_files_id",
+                    "ix_mcp_servers_id", "ix_db_connections_id", "ix_external_services_id",
+                    "ix_conversation_feedbacks_id", "ix_training_datasets_id", "ix_finetuning_jobs_id",
+                ):
+                    await conn.execute(text(f"DROP INDEX IF EXISTS {redundant}"))
+            logger.info("DB migration: composite indexes ensured, redundant indexes dropped")
+        except Exception as e:
+            logger.warning(f"DB index migration skipped (check for duplicate rows): {e}")
+
+        # 1-1-1-1. 대용량 테이블 PK INTEGER → BIGINT (기존 SERIAL 시퀀스도 bigint 범위로 확장)
+        # 테이블 재작성 + ACCESS EXCLUSIVE 락이므로 아직 integer인 경우에만 1회 실행 (인덱스 DDL과 별도 트랜잭션)
+        for table in ("chat_messages", "conversation_feedbacks"):
+            try:
+                from sqlalchemy import text
+                async with engine.begin() as conn:
+                    await conn.execute(text(f"""
+                        DO $$ BEGIN
+                            -- 워커 동시 기동 시 한 워커만 검사/변경 (락 획득 후 재조회로 중복 실행 방지)
+                            PERFORM pg_advisory_xact_lock(hashtext('{table}.id bigint'));
+                            IF (SELECT data_type FROM information_schema.columns
+                                WHERE table_name = '{table}' AND column_name = 'id') = 'integer' THEN
+                                ALTER TABLE {table} ALTER COLUMN id TYPE bigint;
+                                ALTER SEQUENCE IF EXISTS {table}_id_seq AS bigint;
+                            END IF;
+                        END $$
+                    """))
+                logger.info(f"DB migration: {table}.id is bigint")
+            except Exception as e:
+                logger.warning(f"{table}.id bigint migration skipped: {e}")
+
+        # 1-1-2. conversation_feedbacks.kb_ids TEXT → JSONB (+ GIN 인덱스)
+        try:
+            from sqlalchemy import text
+            async with engine.begin() as conn:
+                await conn.execute(text("""
+                    DO $$ BEGIN
+                        IF (SELECT data_type FROM information_schema.columns
+                            WHERE table_name = 'conversation_feedbacks' AND column_name = 'kb_ids') = 'text' THEN
+                            ALTER TABLE conversation_feedbacks
+                                ALTER COLUMN kb_ids TYPE jsonb USING NULLIF(kb_ids, '')::jsonb;
+                        END IF;
+                    END $$
+                """))
+                await conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_fb_kb_ids_gin ON conversation_feedbacks "
+                    "USING gin (kb_ids jsonb_path_ops)"
+                ))
+            logger.info("DB migration: conversation_feedbacks.kb_ids is jsonb")
+        except Exception as e:
+            logger.warning(f"kb_ids jsonb migration skipped (check for invalid JSON rows): {e}")
+
+        # 1-1-3. conversation_feedbacks 본문 TOAST 설정 (신규 테이블은 모델 DDL 이벤트로 적용)
+        try:
+            from sqlalchemy import text
+            async with engine.begin() as conn:
+                await conn.execute(text("ALTER TABLE conversation_feedbacks SET (toast_tuple_target = 128)"))
+                await conn.execute(text(
+                    "ALTER TABLE conversation_feedbacks ALTER COLUMN user_message SET COMPRESSION lz4, "
+                    "ALTER COLUMN ai_message SET COMPRESSION lz4"
+                ))
+            logger.info("DB migration: conversation_feedbacks toast settings ensured")
+        except Exception as e:
+            logger.warning(f"conversation_feedbacks toast migration skipped (lz4 requires PostgreSQL 14+): {e}")
+
+        # 1-1-4. 데이터셋 통계 트리거 설치 + 기존 카운터 재계산
+        try:
+            from sqlalchemy import text
+            from app.models.conversation_feedback import DATASET_COUNT_TRIGGER_DDL, FLAG_VERIFIED, FLAG_INCLUDED
+            async with engine.begin() as conn:
+                for stmt in DATASET_COUNT_TRIGGER_DDL:
+                    await conn.execute(text(stmt))
+                await conn.execute(text(f"""
+                    UPDATE training_datasets d SET
+                        total_examples = c.total, verified_examples = c.verified
+                    FROM (
+                        SELECT td.id,
+                               count(f.id) AS total,
+                               count(f.id) FILTER (WHERE (f.flags & {FLAG_VERIFIED}) <> 0) AS verified
+                        FROM training_datasets td
+                        LEFT JOIN conversation_feedbacks f
+                               ON f.dataset_id = td.id AND (f.flags & {FLAG_INCLUDED}) <> 0
+                        GROUP BY td.id
+                    ) c
+                    WHERE d.id = c.id
+                """))
+            logger.info("DB migration: dataset count trigger installed")
+        except Exception as e:
+            logger.warning(f"Dataset count trigger migration skipped: {e}")
+
+        # 1-1-5. chat_messages.role VARCHAR → SMALLINT 코드 (MESSAGE_ROLE_CODES)
+        try:
+            from sqlalchemy import text
+            async with engine.begin() as conn:
+                await conn.execute(text("""
+                    DO $$ BEGIN
+                        IF (SELECT data_type FROM information_schema.columns
+                            WHERE table_name = 'chat_messages' AND column_name = 'role') = 'character varying' THEN
+                            ALTER TABLE chat_messages ALTER COLUMN role TYPE smallint
+                                USING CASE role WHEN 'user' THEN 1 WHEN 'assistant' THEN 2 WHEN 'system' THEN 3 END;
+                        END IF;
+                    END $$
+                """))
+            logger.info("DB migration: chat_messages.role is smallint")
+        except Exception as e:
+            logger.warning(f"chat_messages.role migration skipped (check for unknown roles): {e}")
+
+    # 1-1-6. chat_messages HASH 파티션 생성 (PostgreSQL 파티션 테이블일 때만 동작)
+    # HASH 파티션은 DEFAULT가 없으므로 첫 INSERT 전에 모든 파티션이 있어야 함
+    try:
+        await ensure_message_partitions(engine)
+    except Exception as e:
+        logger.warning(f"Message partition setup skipped: {e}")
+
+    # 1-2. DB 커넥션 풀 예열
+    if settings.DB_POOL_PREWARM:
+        try:
+            await prewarm_pool()
+        except Exception as e:
+            logger.warning(f"DB pool prewarm skipped: {e}")
+
     # 2. Redis 연결
     cache = get_cache_service()
     redis_connected = await cache.connect()
@@ -93,9 +306,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"MCP cleanup error: {e}")
 
+    # BM25 어휘 구축 프로세스 풀 종료
+    from app.services.bm25_processor import shutdown_vocab_pool
+    shutdown_vocab_pool()
+
     # Redis 연결 해제
     await cache.disconnect()
 
+    # 공유 HTTP 클라이언트 / 헬스 프로브 클라이언트 종료
+    await close_http_client()
+    await close_health_clients()
+
     # DB 연결 해제
     await engine.dispose()
     logger.info("Shutdown complete")
@@ -155,52 +376,16 @@ async def health_check():
     }
 
 
-@app.get("/health/{service}")
-async def health_check_service(service: str):
-    """개별 서비스 연결 테스트"""
-    if service == "redis":
-        cache = get_cache_service()
-        if cache.is_connected:
-            try:
-                await cache._client.ping()
-                return {"status": "connected", "service": "redis", "detail": "Redis 연결 성공"}
-            except Exception as e:
-                return {"status": "disconnected", "service": "redis", "detail": f"Redis ping 실패: {e}"}
-        return {"status": "disconnected", "service": "redis", "detail": "Redis에 연결되어 있지 않습니다."}
-
-    elif service == "neo4j":
-        try:
-            from neo4j import GraphDatabase
-            driver = GraphDatabase.driver(
-                settings.NEO4J_URL,
-                auth=(settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD)
-            )
-            driver.verify_connectivity()
-            driver.close()
-            return {"status": "connected", "service": "neo4j", "detail": "Neo4j 연결 성공"}
-        except Exception as e:
-            return {"status": "disconnected", "service": "neo4j", "detail": f"Neo4j 연결 실패: {e}"}
-
-    elif service == "qdrant":
-        try:
-            from qdrant_client import QdrantClient
-            client = QdrantClient(url=settings.QDRANT_URL, timeout=5)
-            client.get_collections()
-            return {"status": "connected", "service": "qdrant", "detail": "Qdrant 연결 성공"}
-        except Exception as e:
-            return {"status": "disconnected", "service": "qdrant", "detail": f"Qdrant 연결 실패: {e}"}
+@app.get("/health/all")
+async def health_check_all():
+    """모든 외부 서비스 연결을 동시에 확인"""
+    return {"services": await probe_all()}
 
-    elif service == "ollama":
-        try:
-            import httpx
-            async with httpx.AsyncClient(timeout=5) as client:
-                resp = await client.get(f"{settings.OLLAMA_BASE_URL}/api/tags")
-                if resp.status_code == 200:
-                    models_list = resp.json().get("models", [])
-                    names = [m.get("name", "") for m in models_list[:5]]
-                    return {"status": "connected", "service": "ollama", "detail": f"Ollama 연결 성공 (모델: {', '.join(names)})"}
-            return {"status": "disconnected", "service": "ollama", "detail": "Ollama 응답 오류"}
-        except Exception as e:
-            return {"status": "disconnected", "service": "ollama", "detail": f"Ollama 연결 실패: {e}"}
 
-    return {"status": "error", "service": service, "detail": f"알 수 없는 서비스: {service}"}
+@app.get("/health/{service}")
+async def health_check_service(service: str):
+    """개별 서비스 연결 테스트 (프로브 클라이언트 재사용, 1초 캐시)"""
+    result = await probe(service)
+    if result is None:
+        return {"status": "error", "service": service, "detail": f"알 수 없는 서비스: {service}"}
+    return result
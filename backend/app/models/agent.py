@@ -2,22 +2,23 @@
 에이전트 모델
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint
+    Column, Integer, String, Text, Boolean, UniqueConstraint, Index, Identity
 )
-from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, TimestampMixin, user_fk
 
 
-class Agent(Base):
+class Agent(TimestampMixin, Base):
     __tablename__ = "agents"
     __table_args__ = (
         UniqueConstraint("user_id", "agent_id", name="uq_user_agent"),
+        # list_agents 정렬 (sort_order, created_at)과 일치
+        Index("ix_agents_user_sort", "user_id", "sort_order", "created_at"),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    agent_id = Column(String(100), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    agent_id = Column(String(100), nullable=False)  # 조회는 항상 user_id와 함께 → uq_user_agent 사용
+    user_id = user_fk(index=False)  # ix_agents_user_sort 선두 컬럼
     name = Column(String(200), nullable=False)
     description = Column(Text, default="")
     model = Column(String(100), default="gemma3:12b")
@@ -28,9 +29,8 @@ class Agent(Base):
     published = Column(Boolean, default=True)
     default_tools = Column(Text, default=None)  # JSON: {"rag":true,"web_search":false,...}
     sort_order = Column(Integer, default=0)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="agents")
-    sessions = relationship("ChatSession", back_populates="agent", cascade="save-update, merge", passive_deletes=True)
+    sessions = relationship("ChatSession", back_populates="agent", cascade="save-update, merge", passive_deletes=True,
+                            lazy="raise_on_sql")
@@ -1,16 +1,18 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint, Identity
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, user_fk
+from app.db.types import LowerString
 
 
 class ApiKey(Base):
     __tablename__ = "api_keys"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    provider = Column(String(50), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    user_id = user_fk(index=False)  # uq_user_provider 선두 컬럼
+    provider = Column(LowerString(50), nullable=False)  # 바인딩 시 소문자 정규화
     encrypted_key = Column(Text, nullable=False)
+    masked_key = Column(String(20), nullable=True)  # 목록 표시용 (복호화 없이 조회)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     __table_args__ = (
@@ -2,41 +2,61 @@
 채팅 세션 + 메시지 모델
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, ForeignKey
+    Column, Integer, String, Text, DateTime, ForeignKey, Index, Identity
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.types import BigIntCompat, CodedString
+from app.db.base import Base, BulkInsertMixin, TimestampMixin, user_fk
+from app.db import partitions  # noqa: F401  파티션 키를 PK에 포함하는 PostgreSQL DDL 훅 등록
 
+# chat_messages.role 저장 코드 (저장 포맷 — 번호 변경 금지)
+MESSAGE_ROLE_CODES = {"user": 1, "assistant": 2, "system": 3}
 
-class ChatSession(Base):
-    __tablename__ = "chat_sessions"
 
-    id = Column(Integer, primary_key=True, index=True)
+class ChatSession(TimestampMixin, Base):
+    __tablename__ = "chat_sessions"
+    __table_args__ = (
+        # 사용자별 최신순 목록 (B-tree 역방향 스캔으로 DESC 정렬 처리)
+        # INCLUDE: list_sessions가 읽는 나머지 컬럼까지 담아 힙 접근 없는 index-only scan
+        Index("ix_sessions_listing", "user_id", "updated_at",
+              postgresql_include=["id", "session_id", "title", "created_at", "agent_pk"]),
+    )
+    # 서버 기본값(created_at 등)을 INSERT/UPDATE ... RETURNING으로 즉시 채움 (후속 SELECT/refresh 불필요)
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, Identity(), primary_key=True)
     session_id = Column(String(100), unique=True, nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    agent_pk = Column(Integer, ForeignKey("agents.id", ondelete="SET NULL"), nullable=True)
+    user_id = user_fk(index=False)  # ix_sessions_listing 선두 컬럼
+    agent_pk = Column(Integer, ForeignKey("agents.id", ondelete="SET NULL"), nullable=True, index=True)
     title = Column(String(500), default="새로운 대화")
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
+    # agent는 세션과 거의 항상 함께 쓰이는 다대일 참조 → LEFT OUTER JOIN으로 같은 SELECT에서 로드
     user = relationship("User", back_populates="sessions")
-    agent = relationship("Agent", back_populates="sessions")
+    agent = relationship("Agent", back_populates="sessions", lazy="joined")
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan",
-                            order_by="ChatMessage.created_at")
+                            passive_deletes=True, order_by=lambda: ChatMessage.created_at, lazy="selectin")
 
 
-class ChatMessage(Base):
+class ChatMessage(BulkInsertMixin, Base):
     __tablename__ = "chat_messages"
-
-    id = Column(Integer, primary_key=True, index=True)
-    session_pk = Column(Integer, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
-    role = Column(String(20), nullable=False)  # user | assistant | system
+    __table_args__ = (
+        # 세션별 시간순 메시지 조회 (정렬 없이 인덱스 순서로 반환)
+        Index("ix_msg_session_created", "session_pk", "created_at"),
+        # PostgreSQL: session_pk HASH 파티션 (chat_messages_pN, app.db.partitions에서 생성)
+        # - 메시지 조회/로더는 모두 session_pk 조건 → 파티션 하나의 (session_pk, created_at) 인덱스만 탐색
+        {"postgresql_partition_by": "HASH (session_pk)", "info": {"partition_key": ("session_pk",)}},
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(BigIntCompat, Identity(), primary_key=True)  # PK 인덱스로 충분 (별도 인덱스 X)
+    session_pk = Column(Integer, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)  # 파티션 키
+    role = Column(CodedString(MESSAGE_ROLE_CODES), nullable=False)  # SMALLINT 저장, 문자열로 노출
     content = Column(Text, default="")
     thinking = Column(Text, nullable=True)
     metadata_json = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     session = relationship("ChatSession", back_populates="messages")
@@ -1,21 +1,113 @@
 """
 대화 피드백 모델 - 파인튜닝을 위한 학습 데이터 수집
 """
+from typing import List
+
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float
+    Column, Integer, SmallInteger, String, Text, Boolean, DateTime, ForeignKey, Float, Index, Identity,
+    DDL, case, event, insert, literal_column, null, text
 )
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, BulkInsertMixin, TimestampMixin, user_fk
+from app.db.types import BigIntCompat, JSONBCompat
+
+
+# ConversationFeedback.flags 비트 — 불리언 5개(+ is_positive NULL 여부)를 SMALLINT 1개에 패킹
+FLAG_WEB = 1
+FLAG_DEEP = 2
+FLAG_VERIFIED = 4
+FLAG_INCLUDED = 8
+FLAG_POSITIVE = 16
+FLAG_POSITIVE_SET = 32  # is_positive가 NULL이 아님
+
+_FLAG_BITS = {
+    "used_web_search": FLAG_WEB,
+    "used_deep_think": FLAG_DEEP,
+    "is_verified": FLAG_VERIFIED,
+    "is_included_in_training": FLAG_INCLUDED,
+}
+
+
+def pack_flags(row: dict) -> dict:
+    """hybrid 불리언 키(used_web_search, is_positive 등)를 flags 값으로 합친 새 dict 반환 (Core INSERT용)"""
+    row = dict(row)
+    flags = row.pop("flags", 0) or 0
+    for key, bit in _FLAG_BITS.items():
+        if row.pop(key, False):
+            flags |= bit
+    positive = row.pop("is_positive", None)
+    if positive is not None:
+        flags |= FLAG_POSITIVE_SET | (FLAG_POSITIVE if positive else 0)
+    row["flags"] = flags
+    return row
+
+
+def _masked(cls, mask: int):
+    # 비트 상수를 바인드 파라미터가 아닌 리터럴로 렌더 (부분 인덱스 ix_fb_training 술어와 일치시키기 위함)
+    return cls.flags.bitwise_and(literal_column(str(mask)))
+
+
+def _flag_property(bit: int) -> hybrid_property:
+    """flags의 한 비트를 bool 속성으로 노출 (SQL 식: flags & bit <> 0, 대량 UPDATE 지원)"""
+
+    def fget(self) -> bool:
+        return bool((self.flags or 0) & bit)
+
+    def fset(self, value) -> None:
+        self.flags = ((self.flags or 0) | bit) if value else ((self.flags or 0) & ~bit)
+
+    def expr(cls):
+        return _masked(cls, bit) != literal_column("0")
+
+    def update_expr(cls, value):
+        return [(cls.flags, cls.flags.bitwise_or(bit) if value else cls.flags.bitwise_and(~bit))]
+
+    return hybrid_property(fget, fset, expr=expr, update_expr=update_expr)
+
+
+def _tristate_flag_property(bit: int, set_bit: int) -> hybrid_property:
+    """NULL 허용 bool (set_bit이 꺼져 있으면 None)"""
+
+    def fget(self):
+        flags = self.flags or 0
+        return bool(flags & bit) if flags & set_bit else None
+
+    def fset(self, value) -> None:
+        flags = (self.flags or 0) & ~(bit | set_bit)
+        if value is not None:
+            flags |= set_bit | (bit if value else 0)
+        self.flags = flags
+
+    def expr(cls):
+        zero = literal_column("0")
+        return case((_masked(cls, set_bit) == zero, null()), else_=_masked(cls, bit) != zero)
 
+    return hybrid_property(fget, fset, expr=expr)
 
-class ConversationFeedback(Base):
+
+class ConversationFeedback(BulkInsertMixin, TimestampMixin, Base):
     """대화 피드백 - AI 응답에 대한 사용자 평가"""
     __tablename__ = "conversation_feedbacks"
+    __table_args__ = (
+        # 사용자별 최신순 목록 + 통계(count/avg rating/positive) — INCLUDE로 통계는 index-only scan
+        Index("ix_fb_listing", "user_id", "created_at", postgresql_include=["rating", "flags"]),
+        Index("ix_feedback_session_idx", "session_id", "message_index"),  # 세션 내 메시지 단위 조회
+        # kb_ids @> '["kb"]' 포함 검색 전용 (jsonb_path_ops: @>만 지원하지만 인덱스가 더 작음)
+        Index("ix_fb_kb_ids_gin", "kb_ids", postgresql_using="gin", postgresql_ops={"kb_ids": "jsonb_path_ops"}),
+        # 데이터셋 내보내기 (dataset_id = ? AND is_included_in_training) — 학습 포함 행만 인덱싱
+        Index("ix_fb_training", "dataset_id", postgresql_where=text(f"(flags & {FLAG_INCLUDED}) <> 0")),
+        # 질문/응답 본문(수 KB)을 TOAST로 밀어내 힙 행을 좁게 유지 (본문을 읽지 않는 목록/통계 스캔 가속)
+        {"postgresql_with": {"toast_tuple_target": 128}},
+    )
+    # created_at/updated_at을 INSERT/UPDATE ... RETURNING으로 받아 커밋 후 refresh 생략
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    session_id = Column(String(100), nullable=False, index=True)
+    id = Column(BigIntCompat, Identity(), primary_key=True)
+    user_id = user_fk(index=False)  # ix_fb_listing 선두 컬럼
+    session_id = Column(String(100), nullable=False)  # ix_feedback_session_idx 선두 컬럼
 
     # 메시지 식별
     message_index = Column(Integer, nullable=False)  # 세션 내 메시지 순서
@@ -24,40 +116,62 @@ class ConversationFeedback(Base):
 
     # 평가 데이터
     rating = Column(Integer, nullable=True)  # 1-5 별점 (optional)
-    is_positive = Column(Boolean, nullable=True)  # 👍/👎 (optional)
     feedback_text = Column(Text, nullable=True)  # 자유 텍스트 피드백
 
     # 컨텍스트 메타데이터
     agent_id = Column(String(100), nullable=True)  # 사용한 에이전트
     model_name = Column(String(100), nullable=True)  # 사용한 모델
-    kb_ids = Column(Text, nullable=True)  # JSON array of KB IDs
-    used_web_search = Column(Boolean, default=False)
-    used_deep_think = Column(Boolean, default=False)
+    kb_ids = Column(JSONBCompat, nullable=True)  # KB ID 배열 (JSONB)
     tool_calls_json = Column(Text, nullable=True)  # JSON: [{"name":"web_search","input":{...},"output":"...","duration_ms":123}]
 
     # 품질 지표
     response_time_ms = Column(Integer, nullable=True)  # 응답 시간 (밀리초)
     tokens_used = Column(Integer, nullable=True)  # 토큰 사용량 (추정치)
 
-    # 학습 데이터 관리
-    is_verified = Column(Boolean, default=False)  # 품질 검증 완료 여부
-    is_included_in_training = Column(Boolean, default=False)  # 학습 데이터셋 포함 여부
-    dataset_id = Column(Integer, ForeignKey("training_datasets.id", ondelete="SET NULL"), nullable=True)
+    # 불리언 플래그 (FLAG_* 비트) — 아래 hybrid 속성으로 읽기/쓰기/필터
+    flags = Column(SmallInteger, nullable=False, default=0, server_default=text("0"))
+    used_web_search = _flag_property(FLAG_WEB)
+    used_deep_think = _flag_property(FLAG_DEEP)
+    is_positive = _tristate_flag_property(FLAG_POSITIVE, FLAG_POSITIVE_SET)  # 👍/👎 (optional)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # 학습 데이터 관리
+    is_verified = _flag_property(FLAG_VERIFIED)  # 품질 검증 완료 여부
+    is_included_in_training = _flag_property(FLAG_INCLUDED)  # 학습 데이터셋 포함 여부
+    dataset_id = Column(Integer, ForeignKey("training_datasets.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Relationships
     user = relationship("User", back_populates="conversation_feedbacks")
     dataset = relationship("TrainingDataset", back_populates="feedbacks")
 
+    @classmethod
+    async def bulk_create(cls, session: AsyncSession, rows: List[dict]) -> List[int]:
+        """
+        피드백 여러 건을 단일 executemany INSERT ... RETURNING id로 적재합니다 (커밋은 호출 측).
+        rows는 모델 속성명 dict (불리언 플래그 포함), 반환 id는 입력 순서와 같습니다.
+        """
+        if not rows:
+            return []
+        stmt = insert(cls).returning(cls.id, sort_by_parameter_order=True)
+        return list((await session.scalars(stmt, [pack_flags(r) for r in rows])).all())
+
 
-class TrainingDataset(Base):
+# 본문 컬럼 TOAST 압축을 pglz 대신 lz4로 (PostgreSQL 14+, 압축/해제가 수 배 빠름)
+event.listen(
+    ConversationFeedback.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE %(table)s ALTER COLUMN user_message SET COMPRESSION lz4, "
+        "ALTER COLUMN ai_message SET COMPRESSION lz4"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+class TrainingDataset(TimestampMixin, Base):
     """학습 데이터셋 - 파인튜닝용 데이터 모음"""
     __tablename__ = "training_datasets"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    user_id = user_fk()
     name = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
 
@@ -66,7 +180,7 @@ class TrainingDataset(Base):
     min_rating = Column(Integer, default=3)  # 최소 별점 (필터링용)
     only_positive = Column(Boolean, default=True)  # 👍만 포함
 
-    # 통계
+    # 통계 — conversation_feedbacks 트리거가 유지 (DATASET_COUNT_TRIGGER_DDL, 앱에서 갱신 X)
     total_examples = Column(Integer, default=0)
     verified_examples = Column(Integer, default=0)
 
@@ -74,21 +188,84 @@ class TrainingDataset(Base):
     is_exported = Column(Boolean, default=False)
     export_path = Column(String(500), nullable=True)  # JSONL 파일 경로
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-
     # Relationships
     user = relationship("User", back_populates="training_datasets")
-    feedbacks = relationship("ConversationFeedback", back_populates="dataset")
+    feedbacks = relationship("ConversationFeedback", back_populates="dataset", passive_deletes=True,
+                             lazy="raise_on_sql")
+
+
+# 데이터셋 통계 트리거: 학습 포함(FLAG_INCLUDED) 피드백의 INSERT/UPDATE/DELETE 시
+# training_datasets.total_examples / verified_examples를 같은 트랜잭션에서 증감
+_COUNTED_FLAGS = FLAG_VERIFIED | FLAG_INCLUDED
+_PG_DATASET_COUNT_DDL = (
+    f"""
+    CREATE OR REPLACE FUNCTION fb_dataset_counts() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.dataset_id IS NOT DISTINCT FROM NEW.dataset_id
+           AND (OLD.flags & {_COUNTED_FLAGS}) = (NEW.flags & {_COUNTED_FLAGS}) THEN
+            RETURN NULL;  -- 통계와 무관한 플래그 변경
+        END IF;
+        IF TG_OP <> 'INSERT' AND OLD.dataset_id IS NOT NULL AND (OLD.flags & {FLAG_INCLUDED}) <> 0 THEN
+            UPDATE training_datasets
+               SET total_examples = COALESCE(total_examples, 0) - 1,
+                   verified_examples = COALESCE(verified_examples, 0) - ((OLD.flags & {FLAG_VERIFIED}) <> 0)::int
+             WHERE id = OLD.dataset_id;
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.dataset_id IS NOT NULL AND (NEW.flags & {FLAG_INCLUDED}) <> 0 THEN
+            UPDATE training_datasets
+               SET total_examples = COALESCE(total_examples, 0) + 1,
+                   verified_examples = COALESCE(verified_examples, 0) + ((NEW.flags & {FLAG_VERIFIED}) <> 0)::int
+             WHERE id = NEW.dataset_id;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_fb_dataset_counts ON conversation_feedbacks",
+    """
+    CREATE TRIGGER trg_fb_dataset_counts
+    AFTER INSERT OR DELETE OR UPDATE OF dataset_id, flags
+    ON conversation_feedbacks FOR EACH ROW EXECUTE FUNCTION fb_dataset_counts()
+    """,
+)
+
+# SQLite (테스트 DB)용 동일 동작 트리거
+_SQLITE_DEC = f"""
+    UPDATE training_datasets
+       SET total_examples = COALESCE(total_examples, 0) - 1,
+           verified_examples = COALESCE(verified_examples, 0) - ((OLD.flags & {FLAG_VERIFIED}) <> 0)
+     WHERE id = OLD.dataset_id AND (OLD.flags & {FLAG_INCLUDED}) <> 0;
+"""
+_SQLITE_INC = f"""
+    UPDATE training_datasets
+       SET total_examples = COALESCE(total_examples, 0) + 1,
+           verified_examples = COALESCE(verified_examples, 0) + ((NEW.flags & {FLAG_VERIFIED}) <> 0)
+     WHERE id = NEW.dataset_id AND (NEW.flags & {FLAG_INCLUDED}) <> 0;
+"""
+_SQLITE_DATASET_COUNT_DDL = (
+    f"CREATE TRIGGER IF NOT EXISTS trg_fb_counts_ins AFTER INSERT ON conversation_feedbacks BEGIN {_SQLITE_INC} END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_fb_counts_del AFTER DELETE ON conversation_feedbacks BEGIN {_SQLITE_DEC} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_fb_counts_upd AFTER UPDATE OF dataset_id, flags ON conversation_feedbacks "
+    f"WHEN OLD.dataset_id IS NOT NEW.dataset_id OR (OLD.flags & {_COUNTED_FLAGS}) <> (NEW.flags & {_COUNTED_FLAGS}) "
+    f"BEGIN {_SQLITE_DEC} {_SQLITE_INC} END",
+)
+
+# 기존 DB 마이그레이션(main.py)에서 재사용
+DATASET_COUNT_TRIGGER_DDL = _PG_DATASET_COUNT_DDL
+
+for _stmt in _PG_DATASET_COUNT_DDL:
+    event.listen(ConversationFeedback.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+for _stmt in _SQLITE_DATASET_COUNT_DDL:
+    event.listen(ConversationFeedback.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
 
 
 class FineTuningJob(Base):
     """파인튜닝 작업 - Ollama/OpenAI 학습 작업 관리"""
     __tablename__ = "finetuning_jobs"
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    dataset_id = Column(Integer, ForeignKey("training_datasets.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    user_id = user_fk()
+    dataset_id = Column(Integer, ForeignKey("training_datasets.id", ondelete="CASCADE"), nullable=False, index=True)
 
     job_id = Column(String(100), unique=True, nullable=False, index=True)
     job_name = Column(String(200), nullable=False)
@@ -125,4 +302,4 @@ class FineTuningJob(Base):
 
     # Relationships
     user = relationship("User", back_populates="finetuning_jobs")
-    dataset = relationship("TrainingDataset")
+    dataset = relationship("TrainingDataset", lazy="joined")  # 다대일 → 같은 SELECT
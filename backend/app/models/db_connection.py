@@ -2,18 +2,21 @@
 DB 커넥션 모델 (Text-to-SQL용)
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, ForeignKey
+    Column, Integer, String, Text, DateTime, UniqueConstraint, Identity
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, user_fk
 
 
 class DbConnection(Base):
     __tablename__ = "db_connections"
+    __table_args__ = (
+        UniqueConstraint("user_id", "conn_id", name="uq_user_conn"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    user_id = user_fk(index=False)  # uq_user_conn 선두 컬럼
     conn_id = Column(String(100), nullable=False)
     name = Column(String(200), nullable=False)
     db_type = Column(String(20), nullable=False)  # postgresql | mysql | sqlite
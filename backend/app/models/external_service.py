@@ -2,18 +2,18 @@
 외부 서비스 모델 (Qdrant/PostgreSQL 등)
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+    Column, Integer, String, Text, Boolean, DateTime, Identity
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, user_fk
 
 
 class ExternalService(Base):
     __tablename__ = "external_services"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    user_id = user_fk()
     service_id = Column(String(100), nullable=False)
     name = Column(String(200), nullable=False)
     service_type = Column(String(30), nullable=False)  # qdrant | postgresql | pinecone
@@ -2,22 +2,22 @@
 지식 베이스 + 파일 메타데이터 모델
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Float, ForeignKey, UniqueConstraint
+    Column, Integer, String, Text, DateTime, Float, ForeignKey, UniqueConstraint, Index, Identity
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, BulkInsertMixin, TimestampMixin, user_fk
 
 
-class KnowledgeBase(Base):
+class KnowledgeBase(TimestampMixin, Base):
     __tablename__ = "knowledge_bases"
     __table_args__ = (
         UniqueConstraint("user_id", "kb_id", name="uq_user_kb"),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
-    kb_id = Column(String(100), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    kb_id = Column(String(100), nullable=False)  # 조회는 항상 user_id와 함께 → uq_user_kb 사용
+    user_id = user_fk(index=False)  # uq_user_kb 선두 컬럼
     name = Column(String(200), nullable=False)
     description = Column(Text, default="")
     chunk_size = Column(Integer, default=512)
@@ -25,19 +25,24 @@ class KnowledgeBase(Base):
     external_service_id = Column(String(100), nullable=True, default=None)
     chunking_method = Column(String(20), default="fixed")       # fixed | semantic
     semantic_threshold = Column(Float, default=0.75)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="knowledge_bases")
-    files = relationship("KnowledgeFile", back_populates="knowledge_base", cascade="all, delete-orphan")
+    files = relationship("KnowledgeFile", back_populates="knowledge_base", cascade="all, delete-orphan",
+                         passive_deletes=True, lazy="raise_on_sql")
 
 
-class KnowledgeFile(Base):
+class KnowledgeFile(BulkInsertMixin, Base):
     __tablename__ = "knowledge_files"
+    __table_args__ = (
+        # KB별 최신 업로드순 파일 목록
+        Index("ix_files_kb_uploaded", "kb_pk", "uploaded_at"),
+    )
+    # uploaded_at 서버 기본값을 INSERT ... RETURNING으로 바로 받음
+    __mapper_args__ = {"eager_defaults": True}
 
-    id = Column(Integer, primary_key=True, index=True)
-    kb_pk = Column(Integer, ForeignKey("knowledge_bases.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    kb_pk = Column(Integer, ForeignKey("knowledge_bases.id", ondelete="CASCADE"), nullable=False)  # ix_files_kb_uploaded 선두 컬럼
     filename = Column(String(500), nullable=False)
     original_filename = Column(String(500), nullable=False)
     file_size_bytes = Column(Integer, default=0)
@@ -47,4 +52,4 @@ class KnowledgeFile(Base):
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    knowledge_base = relationship("KnowledgeBase", back_populates="files")
+    knowledge_base = relationship("KnowledgeBase", back_populates="files", lazy="joined")  # 다대일 → 같은 SELECT
@@ -2,18 +2,24 @@
 MCP 서버 모델
 """
 from sqlalchemy import (
-    Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+    Column, Integer, String, Text, Boolean, DateTime, Index, UniqueConstraint, Identity, text
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, user_fk
 
 
 class McpServer(Base):
     __tablename__ = "mcp_servers"
+    __table_args__ = (
+        UniqueConstraint("user_id", "server_id", name="uq_user_mcp_server"),
+        Index("ix_mcp_user_sort", "user_id", "sort_order"),  # 목록 조회 ORDER BY 커버
+        # 채팅 요청마다 실행되는 활성 서버 조회 (enabled 행만 담는 부분 인덱스)
+        Index("ix_mcp_enabled", "user_id", "priority", postgresql_where=text("enabled = true")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, Identity(), primary_key=True)
+    user_id = user_fk(index=False)  # uq_user_mcp_server 선두 컬럼
     server_id = Column(String(100), nullable=False)
     name = Column(String(200), nullable=False)
     server_type = Column(String(30), nullable=False)  # sse | streamableHttp | stdio
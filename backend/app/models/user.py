@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Identity
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -6,7 +6,7 @@ from app.db.base import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, Identity(), primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -14,14 +14,27 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    settings = relationship("UserSettings", back_populates="user", uselist=False, cascade="all, delete-orphan")
-    api_keys = relationship("ApiKey", back_populates="user", cascade="all, delete-orphan")
-    knowledge_bases = relationship("KnowledgeBase", back_populates="user", cascade="all, delete-orphan")
-    agents = relationship("Agent", back_populates="user", cascade="all, delete-orphan")
-    sessions = relationship("ChatSession", back_populates="user", cascade="all, delete-orphan")
-    mcp_servers = relationship("McpServer", back_populates="user", cascade="all, delete-orphan")
-    db_connections = relationship("DbConnection", back_populates="user", cascade="all, delete-orphan")
-    external_services = relationship("ExternalService", back_populates="user", cascade="all, delete-orphan")
-    conversation_feedbacks = relationship("ConversationFeedback", back_populates="user", cascade="all, delete-orphan")
-    training_datasets = relationship("TrainingDataset", back_populates="user", cascade="all, delete-orphan")
-    finetuning_jobs = relationship("FineTuningJob", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    # lazy="raise_on_sql": 암묵적 지연 로딩(N+1) 금지 - 필요한 곳에서 selectinload()로 명시
+    # passive_deletes=True: 자식 행 정리는 FK ON DELETE CASCADE에 위임 (삭제 시 자식 로드 X)
+    settings = relationship("UserSettings", back_populates="user", uselist=False, cascade="all, delete-orphan",
+                            passive_deletes=True, lazy="raise_on_sql")
+    api_keys = relationship("ApiKey", back_populates="user", cascade="all, delete-orphan",
+                            passive_deletes=True, lazy="raise_on_sql")
+    knowledge_bases = relationship("KnowledgeBase", back_populates="user", cascade="all, delete-orphan",
+                                   passive_deletes=True, lazy="raise_on_sql")
+    agents = relationship("Agent", back_populates="user", cascade="all, delete-orphan",
+                          passive_deletes=True, lazy="raise_on_sql")
+    sessions = relationship("ChatSession", back_populates="user", cascade="all, delete-orphan",
+                            passive_deletes=True, lazy="raise_on_sql")
+    mcp_servers = relationship("McpServer", back_populates="user", cascade="all, delete-orphan",
+                               passive_deletes=True, lazy="raise_on_sql")
+    db_connections = relationship("DbConnection", back_populates="user", cascade="all, delete-orphan",
+                                  passive_deletes=True, lazy="raise_on_sql")
+    external_services = relationship("ExternalService", back_populates="user", cascade="all, delete-orphan",
+                                     passive_deletes=True, lazy="raise_on_sql")
+    conversation_feedbacks = relationship("ConversationFeedback", back_populates="user", cascade="all, delete-orphan",
+                                          passive_deletes=True, lazy="raise_on_sql")
+    training_datasets = relationship("TrainingDataset", back_populates="user", cascade="all, delete-orphan",
+                                     passive_deletes=True, lazy="raise_on_sql")
+    finetuning_jobs = relationship("FineTuningJob", back_populates="user", cascade="all, delete-orphan",
+                                   passive_deletes=True, lazy="raise_on_sql")
\ No newline at end of file
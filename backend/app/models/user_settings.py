@@ -1,14 +1,13 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, DateTime, Text
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Boolean, Float, Text, Identity
 from sqlalchemy.orm import relationship
-from app.db.base import Base
+from app.db.base import Base, TimestampMixin, user_fk
 
 
-class UserSettings(Base):
+class UserSettings(TimestampMixin, Base):
     __tablename__ = "user_settings"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False, index=True)
+    id = Column(Integer, Identity(), primary_key=True)
+    user_id = user_fk(unique=True)
 
     # LLM 설정
     llm_model = Column(String(100), default="gemma3:12b")
@@ -38,7 +37,4 @@ class UserSettings(Base):
     storage_type = Column(String(20), default="minio")
     bucket_name = Column(String(100), default="rag-ai-bucket")
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-
     user = relationship("User", back_populates="settings")
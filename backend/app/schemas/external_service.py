@@ -1,24 +1,17 @@
 """
 외부 서비스 스키마
 """
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
 from datetime import datetime
 
-_ALLOWED_SERVICE_TYPES = {"qdrant", "postgresql", "pinecone"}
+ServiceType = Literal["qdrant", "postgresql", "pinecone"]
 
 
 class ExternalServiceCreate(BaseModel):
     service_id: str
     name: str
-    service_type: str  # qdrant | postgresql | pinecone
-
-    @field_validator("service_type")
-    @classmethod
-    def validate_service_type(cls, v: str) -> str:
-        if v not in _ALLOWED_SERVICE_TYPES:
-            raise ValueError(f"service_type must be one of {_ALLOWED_SERVICE_TYPES}")
-        return v
+    service_type: ServiceType
     url: Optional[str] = ""
     api_key: Optional[str] = None
     username: Optional[str] = ""
@@ -52,8 +45,7 @@ class ExternalServiceResponse(BaseModel):
     has_password: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ExternalServiceListResponse(BaseModel):
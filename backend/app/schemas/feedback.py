@@ -1,10 +1,15 @@
 """
 대화 피드백 스키마
 """
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Literal, Optional, List, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 
+import orjson
+
+# 학습 데이터 내보내기 형식 (데이터셋/파인튜닝 작업/내보내기 API 공용)
+DatasetFormat = Literal["chat", "completion", "instruction", "tool_calling"]
+
 
 class FeedbackCreate(BaseModel):
     """피드백 생성 요청"""
@@ -21,16 +26,42 @@ class FeedbackCreate(BaseModel):
     # 컨텍스트 메타데이터
     agent_id: Optional[str] = None
     model_name: Optional[str] = None
-    kb_ids: Optional[str] = None  # JSON string
+    kb_ids: Optional[Union[List[str], str]] = Field(None, description="KB ID 목록 (배열 또는 JSON 문자열)")
     used_web_search: bool = False
     used_deep_think: bool = False
     tool_calls_json: Optional[str] = Field(None, description="도구 호출 JSON 데이터")
 
+    @field_validator("kb_ids")
+    @classmethod
+    def parse_kb_ids(cls, v):
+        """JSON 문자열로 온 kb_ids를 배열로 변환 (JSONB 컬럼에 배열로 저장)"""
+        if not isinstance(v, str):
+            return v
+        if not v.strip():
+            return None
+        try:
+            parsed = orjson.loads(v)
+        except orjson.JSONDecodeError:
+            raise ValueError("kb_ids must be a JSON array of strings")
+        if not isinstance(parsed, list) or not all(isinstance(k, str) for k in parsed):
+            raise ValueError("kb_ids must be a JSON array of strings")
+        return parsed
+
     # 품질 지표
     response_time_ms: Optional[int] = None
     tokens_used: Optional[int] = None
 
 
+class FeedbackBatchCreate(BaseModel):
+    """피드백 일괄 생성 요청 (가져오기/오프라인 수집용)"""
+    feedbacks: List[FeedbackCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class FeedbackBatchResponse(BaseModel):
+    """피드백 일괄 생성 응답 (입력 순서대로 생성된 ID)"""
+    ids: List[int]
+
+
 class FeedbackUpdate(BaseModel):
     """피드백 수정 요청"""
     rating: Optional[int] = Field(None, ge=1, le=5)
@@ -60,6 +91,14 @@ class FeedbackResponse(BaseModel):
     used_deep_think: bool
     tool_calls_json: Optional[str] = None
 
+    @field_validator("kb_ids", mode="before")
+    @classmethod
+    def dump_kb_ids(cls, v):
+        """JSONB 배열을 기존 응답 형식(JSON 문자열)으로 유지"""
+        if v is None or isinstance(v, str):
+            return v
+        return orjson.dumps(v).decode()
+
     response_time_ms: Optional[int] = None
     tokens_used: Optional[int] = None
 
@@ -70,8 +109,7 @@ class FeedbackResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FeedbackListResponse(BaseModel):
@@ -87,7 +125,7 @@ class TrainingDatasetCreate(BaseModel):
     """학습 데이터셋 생성 요청"""
     name: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = None
-    format_type: str = Field(default="chat", pattern="^(chat|completion|instruction|tool_calling)$")
+    format_type: DatasetFormat = "chat"
     min_rating: int = Field(default=3, ge=1, le=5)
     only_positive: bool = True
 
@@ -108,8 +146,7 @@ class TrainingDatasetResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DatasetListResponse(BaseModel):
@@ -1,18 +1,20 @@
 """
 파인튜닝 작업 스키마
 """
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
+from app.schemas.feedback import DatasetFormat
+
 
 class FineTuningJobCreate(BaseModel):
     """파인튜닝 작업 생성 요청"""
     dataset_id: int = Field(..., description="학습할 데이터셋 ID")
     job_name: str = Field(..., min_length=1, max_length=200, description="작업 이름")
     base_model: str = Field(..., description="기본 모델 (예: llama3.1, gpt-3.5-turbo)")
-    provider: str = Field(default="ollama", pattern="^(ollama|unsloth)$")
-    format_type: str = Field(default="chat", pattern="^(chat|completion|instruction|tool_calling)$")
+    provider: Literal["ollama", "unsloth"] = "ollama"
+    format_type: DatasetFormat = "chat"
 
     # 하이퍼파라미터
     learning_rate: float = Field(default=2e-5, gt=0, le=1e-3)
@@ -41,8 +43,7 @@ class FineTuningJobResponse(BaseModel):
     completed_at: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FineTuningJobListResponse(BaseModel):
@@ -1,9 +1,11 @@
 """
 채팅 세션 + 메시지 Pydantic 스키마
+- 캐시 등 원본 JSON 문자열은 json.loads 후 검증하지 말고 model_validate_json /
+  TypeAdapter.validate_json으로 바로 검증 (직렬화도 model_dump_json / dump_json)
 """
-from typing import Optional, List
+from typing import Literal, Optional, List, Union
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SessionCreate(BaseModel):
@@ -17,10 +19,11 @@ class SessionUpdate(BaseModel):
 
 
 class MessageCreate(BaseModel):
-    role: str = Field(..., pattern=r"^(user|assistant|system)$")
+    role: Literal["user", "assistant", "system"]
     content: str = Field("", max_length=100000)
     thinking: Optional[str] = Field(None, max_length=100000)
-    metadata_json: Optional[str] = None
+    # JSON 문자열 또는 객체 (객체는 서버에서 직렬화하여 저장)
+    metadata_json: Optional[Union[str, dict, list]] = None
 
 
 class MessageResponse(BaseModel):
@@ -31,8 +34,7 @@ class MessageResponse(BaseModel):
     metadata_json: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SessionResponse(BaseModel):
@@ -44,8 +46,7 @@ class SessionResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SessionDetailResponse(SessionResponse):
@@ -46,3 +46,50 @@ class ApiKeyResponse(BaseModel):
 
 class ApiKeysListResponse(BaseModel):
     keys: List[ApiKeyResponse]
+
+
+class OllamaModelInfo(BaseModel):
+    name: str
+    size_gb: float = 0
+    parameter_size: str = ""
+    family: str = ""
+    quantization: str = ""
+    is_korean: bool = False
+
+
+class OllamaModelsResponse(BaseModel):
+    models: List[OllamaModelInfo]
+    ollama_url: str
+    error: Optional[str] = None
+
+
+class AvailableModelInfo(BaseModel):
+    name: str
+    display_name: str
+    provider: str
+    type: str
+    is_korean: Optional[bool] = None  # Ollama 로컬 모델만 해당
+
+
+class AvailableModelsResponse(BaseModel):
+    models: List[AvailableModelInfo]
+    total: int
+
+
+class McpServerInfo(BaseModel):
+    server_id: str
+    name: str
+    server_type: str
+    url: Optional[str] = ""
+    command: Optional[str] = ""
+    headers_json: Optional[str] = None
+    priority: Optional[int] = 0
+    enabled: Optional[bool] = True
+    sort_order: Optional[int] = 0
+    # backward-compat
+    id: str
+    type: str
+
+
+class McpServerListResponse(BaseModel):
+    servers: List[McpServerInfo]
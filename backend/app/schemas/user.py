@@ -1,5 +1,9 @@
 import re
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+
+# 비밀번호 강도 검사용 (모듈 로드 시 1회 컴파일)
+_HAS_LETTER = re.compile(r'[A-Za-z]').search
+_HAS_DIGIT = re.compile(r'\d').search
 
 
 class UserBase(BaseModel):
@@ -16,9 +20,9 @@ class UserCreate(UserBase):
         """비밀번호 강도 검증"""
         if len(v) < 8:
             raise ValueError('비밀번호는 최소 8자 이상이어야 합니다.')
-        if not re.search(r'[A-Za-z]', v):
+        if not _HAS_LETTER(v):
             raise ValueError('비밀번호에는 최소 하나의 영문자가 포함되어야 합니다.')
-        if not re.search(r'\d', v):
+        if not _HAS_DIGIT(v):
             raise ValueError('비밀번호에는 최소 하나의 숫자가 포함되어야 합니다.')
         return v
 
@@ -27,8 +31,7 @@ class UserResponse(UserBase):
     id: int
     is_active: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserSettingsResponse(BaseModel):
@@ -20,8 +20,7 @@ class UserSettingsResponse(BaseModel):
     storage_type: str
     bucket_name: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserSettingsUpdate(BaseModel):
@@ -29,15 +28,15 @@ class UserSettingsUpdate(BaseModel):
     embedding_model: Optional[str] = Field(None, max_length=100)
     vlm_model: Optional[str] = Field(None, max_length=100)
     enable_multimodal: Optional[bool] = None
-    retrieval_mode: Optional[str] = Field(None, pattern=r"^(hybrid|vector|graph)$")
+    retrieval_mode: Optional[Literal["hybrid", "vector", "graph"]] = None
     search_top_k: Optional[int] = Field(None, ge=1, le=20)
     use_rerank: Optional[bool] = None
-    search_mode: Optional[str] = Field(None, pattern=r"^(dense|sparse|hybrid)$")
+    search_mode: Optional[Literal["dense", "sparse", "hybrid"]] = None
     dense_weight: Optional[float] = Field(None, ge=0.0, le=1.0)
     use_multimodal_search: Optional[bool] = None
     system_prompt: Optional[str] = Field(None, max_length=5000)
     custom_model: Optional[str] = Field(None, max_length=200)
-    theme: Optional[str] = Field(None, pattern=r"^(Light|Dark)$")
+    theme: Optional[Literal["Light", "Dark"]] = None
     active_search_provider_id: Optional[str] = Field(None, max_length=50)
     storage_type: Optional[str] = Field(None, max_length=20)
     bucket_name: Optional[str] = Field(None, max_length=100)
@@ -2,38 +2,152 @@
 BM25 Sparse Vector Processor
 BM25 알고리즘을 사용하여 sparse vector를 생성합니다.
 """
+import heapq
 import logging
+import multiprocessing
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from functools import lru_cache
-from typing import List, Dict
-from rank_bm25 import BM25Okapi
+from itertools import chain
+from operator import itemgetter
+from typing import Any, List, Dict, Optional, Tuple
+
+import numpy as np
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_BM25_CACHE_SIZE = 8  # 코퍼스별 BM25 인덱스 캐시 (LRU)
+_UINT8_SCALE = 255.0  # uint8 양자화 시 TF(0~1) 배율 — 모든 벡터에 동일하므로 순위 불변
+_TOKENIZE_CACHE_SIZE = 4096
+_TOKENIZE_CACHE_MAX_LEN = 50_000  # 이보다 긴 텍스트는 캐시하지 않음 (대용량 입력으로 캐시 점유 방지)
+_PARALLEL_VOCAB_MIN_DOCS = 500  # 이하 문서 수는 프로세스 풀 오버헤드가 더 큼 → 직렬 처리
+_VOCAB_WORKERS = os.cpu_count() or 1
+
+_vocab_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _tokenize_uncached(text: str) -> List[str]:
+    # 간단한 공백 기반 토큰화 + 소문자 변환 (str.split()은 빈 토큰을 만들지 않음)
+    # 이미 소문자인 텍스트는 lower() 사본 생성 생략
+    # 향후 개선: spaCy ko_core_news_sm 사용
+    return (text if text.islower() else text.lower()).split()
+
+
+def _document_frequencies(texts: List[str]) -> Counter:
+    # 문서 빈도(DF) — 문서당 중복 제거한 토큰을 Counter(C 구현)로 한 번에 집계
+    # (dict.fromkeys(...).keys()는 Mapping이 아니므로 C 경로 + 첫 등장 순서 유지)
+    df = Counter()
+    for text in texts:
+        df.update(dict.fromkeys(_tokenize_uncached(text)).keys())
+    return df
+
+
+def _get_vocab_pool() -> ProcessPoolExecutor:
+    """어휘 구축용 프로세스 풀 (최초 대용량 ingest 시 생성, 이후 재사용)"""
+    global _vocab_pool
+    if _vocab_pool is None:
+        # torch 등 스레드를 가진 부모 프로세스 fork 회피
+        _vocab_pool = ProcessPoolExecutor(
+            max_workers=_VOCAB_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _vocab_pool
+
+
+def shutdown_vocab_pool(wait: bool = True) -> None:
+    """어휘 구축용 프로세스 풀 종료 (앱 종료 시 / 풀 손상 시 다음 호출에서 재생성)"""
+    global _vocab_pool
+    pool, _vocab_pool = _vocab_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _parallel_document_frequencies(texts: List[str]) -> Counter:
+    """문서를 워커 수만큼 연속 구간으로 나눠 구간별 DF를 병렬 집계 후 병합 (구간 순서대로 병합해 첫 등장 순서 유지)"""
+    size = -(-len(texts) // _VOCAB_WORKERS)
+    shards = [texts[i:i + size] for i in range(0, len(texts), size)]
+    df = Counter()
+    for part in _get_vocab_pool().map(_document_frequencies, shards):
+        df.update(part)
+    return df
+
+
+def _empty_sparse() -> Tuple[np.ndarray, np.ndarray]:
+    return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+
+@lru_cache(maxsize=_TOKENIZE_CACHE_SIZE)
+def _tokenize_cached(text: str) -> Tuple[str, ...]:
+    # 캐시 값은 공유되므로 불변 튜플로 보관
+    return tuple(_tokenize_uncached(text))
+
+
+class _PostingsBM25:
+    """
+    Okapi BM25 점수를 term별 (문서 id, 가중치) 열로 미리 계산한 CSC 형태 인덱스
+
+    rank_bm25.BM25Okapi.get_scores는 쿼리 term마다 전체 문서를 파이썬으로 순회(O(Q·D))하지만,
+    여기서는 idf·tf 포화·길이 정규화를 구축 시 한 번에 곱해 두고 쿼리 시에는 해당 term 열의
+    가중치만 NumPy로 더함. 점수는 BM25Okapi와 동일 (음수 idf → epsilon × 평균 idf 하한 포함).
+    """
+
+    _EPSILON = 0.25  # BM25Okapi 기본값
+
+    def __init__(self, tokenized_docs: List[List[str]], k1: float, b: float):
+        num_docs = len(tokenized_docs)
+        doc_len = np.fromiter(map(len, tokenized_docs), dtype=np.int64, count=num_docs)
+        tokens = list(chain.from_iterable(tokenized_docs))
+        term_ids = {t: i for i, t in enumerate(dict.fromkeys(tokens))}
+        num_terms = len(term_ids)
+
+        # (term, 문서) 쌍을 term 우선 정수 키로 만들어 unique → term별로 정렬된 (문서, tf) = CSC 열
+        cols = np.fromiter(map(term_ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        rows = np.repeat(np.arange(num_docs, dtype=np.int64), doc_len)
+        keys, tf = np.unique(cols * num_docs + rows, return_counts=True)
+        cols, rows = np.divmod(keys, num_docs)
+
+        df = np.bincount(cols, minlength=num_terms)
+        idf = np.log(num_docs - df + 0.5) - np.log(df + 0.5)
+        idf[idf < 0] = self._EPSILON * idf.mean()
+        norm = k1 * (1 - b + b * doc_len / doc_len.mean())
+        tf = tf.astype(np.float64)
+
+        self._term_ids = term_ids
+        self._doc_ids = rows
+        self._weights = idf[cols] * (tf * (k1 + 1) / (tf + norm[rows]))
+        self._indptr = np.zeros(num_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=self._indptr[1:])
+        self._num_docs = num_docs
+
+    def get_scores(self, query_tokens: List[str]) -> np.ndarray:
+        scores = np.zeros(self._num_docs)
+        indptr = self._indptr
+        for token in query_tokens:  # 중복 term은 BM25Okapi와 같이 중복 가산
+            col = self._term_ids.get(token)
+            if col is None:
+                continue
+            start, end = indptr[col], indptr[col + 1]
+            scores[self._doc_ids[start:end]] += self._weights[start:end]
+        return scores
+
 
 class BM25Processor:
     """BM25 기반 sparse vector 생성기"""
 
-    _instance = None
-    _initialized = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
     def __init__(self):
-        if BM25Processor._initialized:
-            return
-        BM25Processor._initialized = True
-
         # BM25 파라미터 (Okapi BM25)
         self.k1 = getattr(settings, 'BM25_K1', 1.5)  # Term saturation (기본값: 1.5)
         self.b = getattr(settings, 'BM25_B', 0.75)   # Length normalization (기본값: 0.75)
         self.vocab_size_limit = getattr(settings, 'BM25_VOCAB_SIZE', 10000)
+        self.value_dtype = getattr(settings, 'BM25_VALUE_DTYPE', 'float32')
+
+        # 같은 문서 집합에 대한 반복 쿼리 시 토큰화/인덱스 구축 생략
+        # hash(문서 튜플) → (문서 튜플, BM25 인덱스) — 적중 시 튜플 비교로 해시 충돌 배제
+        self._bm25_cache: "OrderedDict[int, Tuple[tuple, Any]]" = OrderedDict()
 
-        logger.info(f"BM25Processor initialized (singleton) - k1={self.k1}, b={self.b}")
+        logger.info(f"BM25Processor initialized - k1={self.k1}, b={self.b}")
 
     def tokenize(self, text: str) -> List[str]:
         """
@@ -47,15 +161,10 @@ class BM25Processor:
         """
         if not text:
             return []
-
-        # 간단한 공백 기반 토큰화 + 소문자 변환
-        # 향후 개선: spaCy ko_core_news_sm 사용
-        tokens = text.lower().split()
-
-        # 특수문자 제거 (선택적)
-        # tokens = [re.sub(r'[^\w\s]', '', token) for token in tokens if token]
-
-        return [t for t in tokens if t]  # 빈 토큰 제거
+        if len(text) > _TOKENIZE_CACHE_MAX_LEN:
+            return _tokenize_uncached(text)
+        # 같은 쿼리/청크의 반복 토큰화는 LRU 캐시 적중 (호출 측 변경에 대비해 리스트 사본 반환)
+        return list(_tokenize_cached(text))
 
     def build_vocabulary(self, texts: List[str]) -> Dict[str, int]:
         """
@@ -67,57 +176,80 @@ class BM25Processor:
         Returns:
             어휘 사전 {term: index}
         """
-        vocab = {}
-        for text in texts:
-            tokens = self.tokenize(text)
-            for token in tokens:
-                if token not in vocab:
-                    vocab[token] = len(vocab)
-
-        # 어휘 크기 제한 (상위 N개만)
-        if len(vocab) > self.vocab_size_limit:
-            logger.warning(
-                f"Vocabulary size ({len(vocab)}) exceeds limit ({self.vocab_size_limit}). "
-                "Consider using IDF-based pruning."
+        df = None
+        if len(texts) > _PARALLEL_VOCAB_MIN_DOCS and _VOCAB_WORKERS > 1:
+            try:
+                df = _parallel_document_frequencies(texts)
+            except Exception as e:
+                # BrokenProcessPool 등으로 손상된 풀은 버리고 다음 호출에서 새로 생성
+                shutdown_vocab_pool(wait=False)
+                logger.warning(f"Parallel vocabulary build failed, falling back to serial: {e}")
+        if df is None:
+            df = _document_frequencies(texts)
+
+        terms = list(df)
+        if len(terms) > self.vocab_size_limit:
+            # IDF(log N/df) 기반 가지치기: DF가 낮은(IDF가 높은) N개 유지, 순서는 첫 등장 순
+            keep = {t for t, _ in heapq.nsmallest(self.vocab_size_limit, df.items(), key=itemgetter(1))}
+            logger.info(
+                f"Vocabulary size ({len(terms)}) exceeds limit ({self.vocab_size_limit}) - "
+                f"pruned {len(terms) - len(keep)} low-IDF terms"
             )
-            # 간단한 제한: 첫 N개만 유지 (실제로는 IDF 기반 필터링 권장)
-            vocab = dict(list(vocab.items())[:self.vocab_size_limit])
+            terms = [t for t in terms if t in keep]
 
-        return vocab
+        return {term: i for i, term in enumerate(terms)}
 
     def compute_sparse_vector(
         self,
         text: str,
-        vocab: Dict[str, int]
-    ) -> Dict[int, float]:
+        vocab: Dict[str, int],
+        normalize: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         BM25 기반 sparse vector 생성
 
         Args:
             text: 문서 텍스트
             vocab: 어휘 사전 {term: index}
+            normalize: True면 TF를 문서 길이로 나누고 저장 datatype으로 양자화 (저장용).
+                False면 원시 term count 그대로 (쿼리용) — 쿼리 길이 배율은 모든 문서 점수에
+                동일하게 곱해지므로 순위가 변하지 않음. 저장 벡터는 Qdrant 내적에 길이 정규화가
+                없으므로 반드시 normalize=True
 
         Returns:
-            Sparse vector {term_index: tf_score}
+            Sparse vector (term_index int32 배열, tf_score float32 배열) — 어휘에 없으면 길이 0
         """
         if not text or not vocab:
-            return {}
+            return _empty_sparse()
 
         tokens = self.tokenize(text)
         if not tokens:
-            return {}
-
-        # TF (Term Frequency) 계산
-        sparse = {}
-        doc_len = len(tokens)
-
-        for token in set(tokens):  # 중복 제거
-            if token in vocab:
-                idx = vocab[token]
-                tf = tokens.count(token) / doc_len  # Normalized TF
-                sparse[idx] = tf
-
-        return sparse
+            return _empty_sparse()
+
+        # TF (Term Frequency) 계산 — Counter 1회 순회 (토큰별 list.count 반복 X)
+        # 어휘에 있는 term만 C 구현 keys-view 교집합으로 추림 (토큰별 파이썬 조회 X)
+        # dict 대신 인덱스/값 배열(SoA)로 반환해 청크당 박싱된 int/float 할당 제거
+        counts = Counter(tokens)
+        terms = counts.keys() & vocab.keys()
+        if not terms:
+            return _empty_sparse()
+
+        n = len(terms)
+        indices = np.fromiter(map(vocab.__getitem__, terms), dtype=np.int32, count=n)
+        values = np.fromiter(map(counts.__getitem__, terms), dtype=np.float32, count=n)
+        if not normalize:
+            return indices, values
+        values *= 1.0 / len(tokens)  # Normalized TF
+        return indices, self._quantize(values)
+
+    def _quantize(self, values: np.ndarray) -> np.ndarray:
+        """TF 값을 컬렉션 sparse 인덱스 datatype에 맞게 축소 (유효 정밀도 2자리 내외면 충분)"""
+        if self.value_dtype == "float16":
+            return values.astype(np.float16)
+        if self.value_dtype == "uint8":
+            # 등장한 term이 0으로 사라지지 않도록 최소 1
+            return np.clip(np.rint(values * _UINT8_SCALE), 1, 255).astype(np.uint8)
+        return values
 
     def compute_bm25_scores(
         self,
@@ -136,17 +268,51 @@ class BM25Processor:
         Returns:
             각 문서의 BM25 점수 리스트
         """
-        # 모든 문서 토큰화
-        tokenized_docs = [self.tokenize(doc) for doc in documents]
+        return self.compute_bm25_scores_batch([query], documents, vocab)[0].tolist()
 
-        # BM25 모델 생성
-        bm25 = BM25Okapi(tokenized_docs, k1=self.k1, b=self.b)
+    def compute_bm25_scores_batch(
+        self,
+        queries: List[str],
+        documents: List[str],
+        vocab: Dict[str, int]
+    ) -> np.ndarray:
+        """
+        여러 쿼리의 BM25 점수를 한 번에 계산 (문서 토큰화/인덱스 구축은 1회)
 
-        # 쿼리 토큰화 및 점수 계산
-        query_tokens = self.tokenize(query)
-        scores = bm25.get_scores(query_tokens)
+        Args:
+            queries: 쿼리 텍스트 리스트 (예: 멀티 쿼리 확장)
+            documents: 문서 리스트
+            vocab: 어휘 사전
 
-        return scores.tolist()
+        Returns:
+            (쿼리 수, 문서 수) 형태의 점수 행렬
+        """
+        if not queries or not documents:
+            return np.zeros((len(queries), len(documents)))
+
+        bm25 = self._get_bm25_index(documents)
+        get_scores = bm25.get_scores
+        return np.stack([np.asarray(get_scores(tokens)) for tokens in map(self.tokenize, queries)])
+
+    def _build_bm25_index(self, tokenized_docs: List[List[str]]) -> _PostingsBM25:
+        """BM25 인덱스 생성 — get_scores(query_tokens) → 문서별 점수 ndarray (빈 쿼리는 0점)"""
+        return _PostingsBM25(tokenized_docs, k1=self.k1, b=self.b)
+
+    def _get_bm25_index(self, documents: List[str]):
+        """문서 집합의 BM25 인덱스 (캐시 적중 시 재토큰화/재구축 없음)"""
+        docs = tuple(documents)
+        key = hash(docs)  # str 해시는 객체에 캐시되므로 문서 길이와 무관하게 저렴
+        cached = self._bm25_cache.get(key)
+        if cached is not None and cached[0] == docs:
+            self._bm25_cache.move_to_end(key)
+            return cached[1]
+
+        # 바운드 메서드 1회 조회 후 map (문서별 속성 조회/컴프리헨션 프레임 X)
+        bm25 = self._build_bm25_index(list(map(self.tokenize, docs)))
+        self._bm25_cache[key] = (docs, bm25)
+        if len(self._bm25_cache) > _BM25_CACHE_SIZE:
+            self._bm25_cache.popitem(last=False)
+        return bm25
 
 
 @lru_cache()
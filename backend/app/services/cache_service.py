@@ -7,7 +7,7 @@ Redis 캐시 서비스
 import json
 import hashlib
 import logging
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Union
 from functools import lru_cache
 from datetime import datetime, timedelta
 
@@ -22,19 +22,7 @@ logger = logging.getLogger(__name__)
 class CacheService:
     """Redis 기반 캐시 서비스"""
 
-    _instance: Optional["CacheService"] = None
-    _initialized: bool = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
     def __init__(self):
-        if CacheService._initialized:
-            return
-        CacheService._initialized = True
-
         self._pool: Optional[ConnectionPool] = None
         self._client: Optional[redis.Redis] = None
         self._connected: bool = False
@@ -321,6 +309,31 @@ class CacheService:
             logger.error(f"대화 저장 실패: {e}")
             return False
 
+    def _session_history_key(self, user_id: int, session_id: str, revision: int) -> str:
+        # 사용자 범위 + updated_at 리비전 → 세션이 갱신되면 자연스럽게 새 키로 이동
+        return f"sess:{user_id}:{session_id}:{revision}"
+
+    async def get_session_history(
+        self,
+        user_id: int,
+        session_id: str,
+        revision: int
+    ) -> Optional[str]:
+        """세션 메시지 히스토리 캐시 조회 (원본 JSON 문자열 — 호출 측에서 validate_json으로 파싱)"""
+        return await self.get(self._session_history_key(user_id, session_id, revision))
+
+    async def set_session_history(
+        self,
+        user_id: int,
+        session_id: str,
+        revision: int,
+        messages: Union[str, bytes],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """세션 메시지 히스토리 캐시 저장 (dump_json으로 직렬화된 JSON)"""
+        key = self._session_history_key(user_id, session_id, revision)
+        return await self.set(key, messages, ttl or settings.SESSION_HISTORY_CACHE_TTL)
+
     async def clear_conversation(self, session_id: str) -> bool:
         """대화 히스토리 삭제"""
         return await self.delete(f"conv:{session_id}")
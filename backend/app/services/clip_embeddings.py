@@ -2,9 +2,10 @@
 CLIP Embedding Service
 - Image embedding (CLIP image encoder)
 - Text embedding for cross-modal search (CLIP text encoder)
-- Singleton pattern with device detection
+- Shared instance via get_clip_embeddings() with device detection
 """
 import logging
+import os
 from functools import lru_cache
 from typing import List
 from pathlib import Path
@@ -16,21 +17,9 @@ logger = logging.getLogger(__name__)
 
 
 class ClipEmbeddings:
-    """CLIP 임베딩 서비스 (싱글톤)"""
-
-    _instance = None
-    _initialized = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    """CLIP 임베딩 서비스 (get_clip_embeddings()로 단일 인스턴스 공유)"""
 
     def __init__(self):
-        if ClipEmbeddings._initialized:
-            return
-        ClipEmbeddings._initialized = True
-
         # Device detection (same as BGE)
         self.device = self._get_device()
 
@@ -72,8 +61,11 @@ class ClipEmbeddings:
                 from app.core.config import settings
 
                 logger.info(f"[CLIP] 모델 로딩 시작: {settings.CLIP_MODEL}")
-                self._model = CLIPModel.from_pretrained(settings.CLIP_MODEL).to(self.device)
-                self._model.eval()
+                model = CLIPModel.from_pretrained(settings.CLIP_MODEL).to(self.device)
+                model.eval()
+                if settings.CLIP_COMPILE:
+                    self._compile_encoders(model)
+                self._model = model
                 logger.info(f"[CLIP] 모델 로딩 완료 - 디바이스: {self.device}, 차원: 512")
             except Exception as e:
                 logger.error(f"[CLIP] 모델 로딩 실패: {e}")
@@ -81,6 +73,53 @@ class ClipEmbeddings:
 
         return self._model
 
+    def _compile_encoders(self, model) -> None:
+        """
+        vision/text 인코더에 torch.compile 적용 후 더미 입력으로 워밍업
+
+        배치 크기/토큰 길이가 요청마다 달라지므로 dynamic=True로 컴파일 (CUDA graph를 쓰는
+        reduce-overhead는 새 shape마다 재캡처되어 제외). 컴파일은 첫 호출 시 일어나므로
+        모델 로딩 시점에 워밍업해 요청 경로에서 제외.
+        MPS/구버전 torch는 건너뛰고, 컴파일/워밍업 실패 시 eager 인코더로 되돌림.
+        """
+        from app.core.config import settings
+
+        if str(self.device).startswith("mps") or not hasattr(torch, "compile"):
+            logger.info(f"[CLIP] torch.compile 미지원 환경 ({self.device}) - eager 모드 사용")
+            return
+        if settings.CLIP_COMPILE_CACHE_DIR:
+            os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", settings.CLIP_COMPILE_CACHE_DIR)
+
+        vision_model, text_model = model.vision_model, model.text_model
+        try:
+            model.vision_model = torch.compile(vision_model, dynamic=True, fullgraph=False)
+            model.text_model = torch.compile(text_model, dynamic=True, fullgraph=False)
+            self._warmup(model)
+            logger.info("[CLIP] torch.compile 적용 완료 (vision/text 인코더)")
+        except Exception as e:
+            model.vision_model, model.text_model = vision_model, text_model
+            logger.warning(f"[CLIP] torch.compile 실패 - eager 모드 사용: {e}")
+
+    def _warmup(self, model) -> None:
+        """
+        단건(batch 1)과 배치(CLIP_BATCH_SIZE) 입력으로 인코더를 실행
+
+        크기 1은 별도 그래프로 특수화되므로 둘 다 실행해야 이후 배치 크기/토큰 길이에서
+        재컴파일이 일어나지 않음. 텍스트는 padding=True 기준 짧은 길이와 최대 길이(77)를 함께 사용.
+        """
+        from app.core.config import settings
+
+        size = model.config.vision_config.image_size
+        max_len = model.config.text_config.max_position_embeddings
+        with torch.no_grad():
+            for batch in sorted({1, max(settings.CLIP_BATCH_SIZE, 2)}):
+                model.get_image_features(pixel_values=torch.zeros(batch, 3, size, size, device=self.device))
+                for seq_len in (8, max_len):
+                    model.get_text_features(
+                        input_ids=torch.zeros(batch, seq_len, dtype=torch.long, device=self.device),
+                        attention_mask=torch.ones(batch, seq_len, dtype=torch.long, device=self.device),
+                    )
+
     @property
     def processor(self):
         """CLIP 프로세서 (지연 로딩)"""
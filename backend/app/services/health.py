@@ -0,0 +1,129 @@
+"""
+외부 의존 서비스 헬스 프로브
+- Qdrant / Neo4j 클라이언트는 프로세스당 1개를 재사용 (프로브마다 연결 생성 X)
+- Ollama는 공유 httpx 클라이언트 사용
+- 서비스별 결과를 짧게 캐시하여 헬스체크 폭주(스크레이핑/liveness) 시 업스트림 호출 흡수
+- probe_all()은 모든 서비스를 동시에 확인 (지연 = 가장 느린 서비스)
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.services.cache_service import get_cache_service
+from app.services.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+_PROBE_CACHE_TTL = 1.0  # 초
+_OLLAMA_TAGS_URL = f"{settings.OLLAMA_BASE_URL}/api/tags"
+
+# service -> (checked_at, result)
+_probe_cache: Dict[str, tuple] = {}
+
+_qdrant_client = None
+_neo4j_driver = None
+
+
+def _get_qdrant_client():
+    global _qdrant_client
+    if _qdrant_client is None:
+        from qdrant_client import QdrantClient
+        _qdrant_client = QdrantClient(url=settings.QDRANT_URL, timeout=5)
+    return _qdrant_client
+
+
+def _get_neo4j_driver():
+    global _neo4j_driver
+    if _neo4j_driver is None:
+        from neo4j import GraphDatabase
+        _neo4j_driver = GraphDatabase.driver(
+            settings.NEO4J_URL,
+            auth=(settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD),
+        )
+    return _neo4j_driver
+
+
+async def probe_redis() -> dict:
+    cache = get_cache_service()
+    if not cache.is_connected:
+        return {"status": "disconnected", "service": "redis", "detail": "Redis에 연결되어 있지 않습니다."}
+    try:
+        await cache._client.ping()
+        return {"status": "connected", "service": "redis", "detail": "Redis 연결 성공"}
+    except Exception as e:
+        return {"status": "disconnected", "service": "redis", "detail": f"Redis ping 실패: {e}"}
+
+
+async def probe_neo4j() -> dict:
+    try:
+        await asyncio.to_thread(_get_neo4j_driver().verify_connectivity)
+        return {"status": "connected", "service": "neo4j", "detail": "Neo4j 연결 성공"}
+    except Exception as e:
+        return {"status": "disconnected", "service": "neo4j", "detail": f"Neo4j 연결 실패: {e}"}
+
+
+async def probe_qdrant() -> dict:
+    try:
+        await asyncio.to_thread(_get_qdrant_client().get_collections)
+        return {"status": "connected", "service": "qdrant", "detail": "Qdrant 연결 성공"}
+    except Exception as e:
+        return {"status": "disconnected", "service": "qdrant", "detail": f"Qdrant 연결 실패: {e}"}
+
+
+async def probe_ollama() -> dict:
+    try:
+        resp = await get_http_client().get(_OLLAMA_TAGS_URL, timeout=5)
+        if resp.status_code == 200:
+            models_list = resp.json().get("models", [])
+            names = [m.get("name", "") for m in models_list[:5]]
+            return {"status": "connected", "service": "ollama", "detail": f"Ollama 연결 성공 (모델: {', '.join(names)})"}
+        return {"status": "disconnected", "service": "ollama", "detail": "Ollama 응답 오류"}
+    except Exception as e:
+        return {"status": "disconnected", "service": "ollama", "detail": f"Ollama 연결 실패: {e}"}
+
+
+PROBES: Dict[str, Callable[[], Awaitable[dict]]] = {
+    "redis": probe_redis,
+    "neo4j": probe_neo4j,
+    "qdrant": probe_qdrant,
+    "ollama": probe_ollama,
+}
+
+
+async def probe(service: str) -> Optional[dict]:
+    """단일 서비스 프로브 (1초 캐시). 알 수 없는 서비스면 None."""
+    fn = PROBES.get(service)
+    if fn is None:
+        return None
+    cached = _probe_cache.get(service)
+    if cached is not None and time.monotonic() - cached[0] < _PROBE_CACHE_TTL:
+        return cached[1]
+    result = await fn()
+    _probe_cache[service] = (time.monotonic(), result)
+    return result
+
+
+async def probe_all() -> Dict[str, dict]:
+    """모든 서비스를 동시에 프로브합니다."""
+    names = list(PROBES)
+    results = await asyncio.gather(*(probe(name) for name in names))
+    return dict(zip(names, results))
+
+
+async def close_health_clients():
+    """재사용 중인 프로브 클라이언트 종료"""
+    global _qdrant_client, _neo4j_driver
+    if _neo4j_driver is not None:
+        try:
+            await asyncio.to_thread(_neo4j_driver.close)
+        except Exception as e:
+            logger.warning(f"Neo4j health driver close error: {e}")
+        _neo4j_driver = None
+    if _qdrant_client is not None:
+        try:
+            _qdrant_client.close()
+        except Exception as e:
+            logger.warning(f"Qdrant health client close error: {e}")
+        _qdrant_client = None
@@ -0,0 +1,34 @@
+"""
+공유 HTTP 클라이언트
+- 프로세스당 하나의 httpx.AsyncClient를 재사용 (keep-alive 커넥션 풀)
+- 요청마다 클라이언트를 생성/종료하며 발생하는 TCP 핸드셰이크 비용 제거
+- 애플리케이션 종료 시 close_http_client()로 정리
+"""
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 AsyncClient 반환 (최초 호출 시 생성). 요청별 timeout은 호출 측에서 지정."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _client
+
+
+async def close_http_client():
+    """공유 AsyncClient 종료"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Shared HTTP client closed")
+    _client = None
@@ -289,9 +289,9 @@ async def t2sql_agent_node(state: dict) -> dict:
 
     try:
         from app.services.t2sql_service import get_t2sql_service
-        from app.api.endpoints.settings import get_db_connection_for_user, _build_connection_uri
+        from app.api.endpoints.settings import get_db_connection_for_user_standalone, _build_connection_uri
 
-        conn = await get_db_connection_for_user(state["user_id"], state["db_connection_id"])
+        conn = await get_db_connection_for_user_standalone(state["user_id"], state["db_connection_id"])
         if not conn:
             await _emit(state, {
                 "type": "content",
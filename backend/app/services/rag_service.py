@@ -154,7 +154,7 @@ class RAGService:
 
         try:
             from app.crud.api_key import get_api_key_for_user, get_api_keys_for_user
-            from app.core.encryption import decrypt_value
+            from app.core.encryption import adecrypt_value
 
             # provider 이름으로 직접 조회, 없으면 부분 매칭 시도
             # (프론트엔드에서 'google gemini'로 저장될 수 있음)
@@ -172,7 +172,7 @@ class RAGService:
                 return ChatOllama(model=self.default_model, temperature=temperature, timeout=120)
 
             # API 키 복호화
-            api_key = decrypt_value(api_key_row.encrypted_key)
+            api_key = await adecrypt_value(api_key_row.encrypted_key)
 
             # Provider별 LLM 인스턴스 생성
             if provider == "openai":
@@ -466,8 +466,8 @@ class RAGService:
         """API 키 기반 웹 검색 (Serper / Brave / Tavily)"""
         import asyncio as _asyncio
 
-        from app.api.endpoints.settings import get_api_key_for_user
-        api_key = await get_api_key_for_user(user_id, provider) if user_id else None
+        from app.api.endpoints.settings import get_api_key_for_user_standalone
+        api_key = await get_api_key_for_user_standalone(user_id, provider) if user_id else None
         if not api_key:
             logger.warning(f"{provider} API key not found, falling back to DuckDuckGo")
             # DuckDuckGo 폴백 (동기 → run_in_executor)
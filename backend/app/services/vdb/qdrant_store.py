@@ -12,12 +12,47 @@ from typing import Any, Dict, List, Optional
 from langchain_core.documents import Document
 from langchain_qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
 
+from app.core.config import settings
 from app.services.vdb.base import BaseVectorStore
 
 logger = logging.getLogger(__name__)
 
 
+def scalar_quantization_config() -> Optional[models.ScalarQuantization]:
+    """컬렉션 생성용 int8 스칼라 양자화 설정 (비활성화 시 None)"""
+    if not settings.QDRANT_SCALAR_QUANTIZATION:
+        return None
+    return models.ScalarQuantization(
+        scalar=models.ScalarQuantizationConfig(
+            type=models.ScalarType.INT8,
+            always_ram=True,
+        )
+    )
+
+
+def sparse_index_params() -> models.SparseIndexParams:
+    """컬렉션 생성용 sparse 인덱스 설정 (값 datatype은 BM25_VALUE_DTYPE과 일치)"""
+    return models.SparseIndexParams(
+        on_disk=False,  # 빠른 검색을 위해 메모리 사용
+        datatype=models.Datatype(settings.BM25_VALUE_DTYPE),
+    )
+
+
+def quantization_search_params() -> Optional[models.SearchParams]:
+    """양자화 벡터로 후보 검색 후 원본 벡터로 rescore하는 검색 파라미터"""
+    if not settings.QDRANT_SCALAR_QUANTIZATION:
+        return None
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(
+            ignore=False,
+            rescore=True,
+            oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING,
+        )
+    )
+
+
 class QdrantStore(BaseVectorStore):
     """Qdrant 벡터 DB 구현체 (Dense + Sparse 하이브리드 검색 지원)"""
 
@@ -48,25 +83,26 @@ class QdrantStore(BaseVectorStore):
         if not self.client.collection_exists(self.collection_name):
             logger.info(f"Creating multimodal collection: {self.collection_name}")
             try:
+                quantization = scalar_quantization_config()
                 self.client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config={
                         "dense": models.VectorParams(
                             size=self.embedding_dimension,  # 1024 for BGE-m3
                             distance=models.Distance.COSINE,
+                            on_disk=quantization is not None,
                         ),
                         "clip": models.VectorParams(
                             size=512,  # CLIP ViT-B/32
                             distance=models.Distance.COSINE,
+                            on_disk=quantization is not None,
                         )
                     },
                     sparse_vectors_config={
-                        "text-sparse": models.SparseVectorParams(
-                            index=models.SparseIndexParams(
-                                on_disk=False  # 빠른 검색을 위해 메모리 사용
-                            )
-                        )
+                        "text-sparse": models.SparseVectorParams(index=sparse_index_params())
                     },
+                    # int8 양자화 벡터는 RAM, 원본 벡터는 디스크 (rescore용)
+                    quantization_config=quantization,
                 )
                 logger.info(f"Created collection with triple vectors: {self.collection_name}")
             except Exception as e:
@@ -144,7 +180,7 @@ class QdrantStore(BaseVectorStore):
         vs = self._build_vector_store()
         user_filter = self._build_user_filter()
 
-        search_kwargs: Dict[str, Any] = {"k": top_k}
+        search_kwargs: Dict[str, Any] = {"k": top_k, "search_params": quantization_search_params()}
         if user_filter:
             search_kwargs["filter"] = user_filter
 
@@ -200,9 +236,9 @@ class QdrantStore(BaseVectorStore):
                 logger.warning(f"No vocabulary for {self.collection_name}, falling back to dense search")
                 return await self.search(query, top_k)
 
-            sparse_vector = bm25.compute_sparse_vector(query, vocab)
+            sparse_indices, sparse_values = bm25.compute_sparse_vector(query, vocab, normalize=False)
 
-            if not sparse_vector:
+            if not sparse_indices.size:
                 logger.warning("Failed to compute sparse vector, falling back to dense search")
                 return await self.search(query, top_k)
 
@@ -218,13 +254,14 @@ class QdrantStore(BaseVectorStore):
                 limit=oversample,
                 with_payload=True,
                 with_vectors=False,
+                search_params=quantization_search_params(),
             )
 
             sparse_results = self.client.query_points(
                 collection_name=self.collection_name,
                 query=models.SparseVector(
-                    indices=list(sparse_vector.keys()),
-                    values=list(sparse_vector.values()),
+                    indices=sparse_indices.tolist(),
+                    values=sparse_values.tolist(),
                 ),
                 using="text-sparse",
                 query_filter=user_filter,
@@ -300,9 +337,9 @@ class QdrantStore(BaseVectorStore):
                 logger.warning(f"No vocabulary for {self.collection_name}, cannot perform sparse search")
                 return []
 
-            sparse_vector = bm25.compute_sparse_vector(query, vocab)
+            sparse_indices, sparse_values = bm25.compute_sparse_vector(query, vocab, normalize=False)
 
-            if not sparse_vector:
+            if not sparse_indices.size:
                 logger.warning("Failed to compute sparse vector")
                 return []
 
@@ -312,8 +349,8 @@ class QdrantStore(BaseVectorStore):
             results = self.client.query_points(
                 collection_name=self.collection_name,
                 query=models.SparseVector(
-                    indices=list(sparse_vector.keys()),
-                    values=list(sparse_vector.values())
+                    indices=sparse_indices.tolist(),
+                    values=sparse_values.tolist()
                 ),
                 using="text-sparse",
                 query_filter=user_filter,
@@ -353,10 +390,11 @@ class QdrantStore(BaseVectorStore):
 
         Returns:
             검색된 Document 리스트
+
+        Raises:
+            UnexpectedResponse: 컬렉션이 없는 경우 (404) — 조회 경로에서는 컬렉션을 생성하지 않음
         """
         try:
-            self._ensure_collection()
-
             # 사용자 필터
             user_filter = self._build_user_filter()
 
@@ -385,6 +423,7 @@ class QdrantStore(BaseVectorStore):
                 with_payload=True,
                 with_vectors=False,
                 score_threshold=0.0,
+                search_params=quantization_search_params(),
             )
 
             # Document 객체로 변환
@@ -398,6 +437,11 @@ class QdrantStore(BaseVectorStore):
             logger.debug(f"Multimodal search returned {len(docs)} documents (content_type={content_type_filter})")
             return docs
 
+        except UnexpectedResponse as e:
+            if e.status_code == 404:
+                raise
+            logger.error(f"Multimodal search failed: {e}")
+            return []
         except Exception as e:
             logger.error(f"Multimodal search failed: {e}")
             return []
@@ -424,7 +468,8 @@ class QdrantStore(BaseVectorStore):
 
             # 어휘 업데이트 (기존 + 새 문서)
             vocab = await self._load_vocabulary()
-            new_vocab = bm25.build_vocabulary(texts)
+            # 대용량 ingest 시 프로세스 풀 대기로 이벤트 루프를 막지 않도록 스레드에서 실행
+            new_vocab = await asyncio.to_thread(bm25.build_vocabulary, texts)
 
             # 기존 어휘와 병합 (새 term에 새 index 할당)
             for term in new_vocab:
@@ -444,23 +489,19 @@ class QdrantStore(BaseVectorStore):
 
             # 3. Qdrant에 dual vectors 저장
             points = []
-            for i, (text, meta, dense_emb, sparse_vec) in enumerate(
+            for i, (text, meta, dense_emb, (sparse_indices, sparse_values)) in enumerate(
                 zip(texts, metadatas or [{}] * len(texts), dense_embeddings, sparse_vectors)
             ):
                 point_id = str(uuid.uuid4())
 
-                # Sparse vector 변환
-                sparse_indices = list(sparse_vec.keys())
-                sparse_values = list(sparse_vec.values())
-
                 points.append(
                     models.PointStruct(
                         id=point_id,
                         vector={
                             "dense": dense_emb,
                             "text-sparse": models.SparseVector(
-                                indices=sparse_indices,
-                                values=sparse_values
+                                indices=sparse_indices.tolist(),
+                                values=sparse_values.tolist()
                             )
                         },
                         payload={
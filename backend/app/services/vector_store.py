@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 import logging
 from functools import lru_cache
@@ -6,6 +7,9 @@ from qdrant_client import QdrantClient, models
 from langchain_huggingface import HuggingFaceEmbeddings
 from app.core.config import settings
 from app.core.device import get_device
+from app.services.vdb.qdrant_store import (
+    quantization_search_params, scalar_quantization_config, sparse_index_params,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,23 +54,25 @@ class VectorStoreService:
     def _create_collection(self, client: QdrantClient, collection_name: str):
         """triple vector 컬렉션 생성 (dense + clip + text-sparse)"""
         logger.info(f"Creating collection: {collection_name}")
+        quantization = scalar_quantization_config()
         client.create_collection(
             collection_name=collection_name,
             vectors_config={
                 "dense": models.VectorParams(
                     size=self.embedding_dimension,
                     distance=models.Distance.COSINE,
+                    on_disk=quantization is not None,
                 ),
                 "clip": models.VectorParams(
                     size=512,  # CLIP ViT-B/32
                     distance=models.Distance.COSINE,
+                    on_disk=quantization is not None,
                 )
             },
             sparse_vectors_config={
-                "text-sparse": models.SparseVectorParams(
-                    index=models.SparseIndexParams(on_disk=False)
-                )
+                "text-sparse": models.SparseVectorParams(index=sparse_index_params())
             },
+            quantization_config=quantization,
         )
 
     def get_retriever(self, kb_id: str, user_id: int, top_k: int = 4,
@@ -96,7 +102,7 @@ class VectorStoreService:
 
         dense_retriever = vector_store.as_retriever(
             search_type="similarity",
-            search_kwargs={"k": top_k, "filter": user_filter}
+            search_kwargs={"k": top_k, "filter": user_filter, "search_params": quantization_search_params()}
         )
 
         return dense_retriever
@@ -124,7 +130,7 @@ class VectorStoreService:
             vocab = json.loads(vocab_json) if vocab_json else {}
 
             # 새 문서로 어휘 확장
-            new_vocab = bm25.build_vocabulary(texts)
+            new_vocab = await asyncio.to_thread(bm25.build_vocabulary, texts)
             for term in new_vocab:
                 if term not in vocab:
                     vocab[term] = len(vocab)
@@ -138,14 +144,14 @@ class VectorStoreService:
 
             # Dual vector 포인트 생성
             points = []
-            for i, (text, meta, dense_emb, sparse_vec) in enumerate(
+            for i, (text, meta, dense_emb, (sparse_indices, sparse_values)) in enumerate(
                 zip(texts, metadatas, dense_embeddings, sparse_vectors)
             ):
                 point_vectors = {"dense": dense_emb}
-                if sparse_vec:
+                if sparse_indices.size:
                     point_vectors["text-sparse"] = models.SparseVector(
-                        indices=list(sparse_vec.keys()),
-                        values=list(sparse_vec.values()),
+                        indices=sparse_indices.tolist(),
+                        values=sparse_values.tolist(),
                     )
 
                 points.append(models.PointStruct(
@@ -1,8 +1,11 @@
 """
 데이터베이스 마이그레이션 스크립트
 - 기존 테이블에 새 컬럼 추가
+- --pack-feedback-flags: conversation_feedbacks 불리언 5개 → flags 비트필드 (옛 컬럼 DROP, 되돌릴 수 없음)
 """
 import asyncio
+import sys
+
 import asyncpg
 from app.core.config import settings
 
@@ -89,5 +92,60 @@ async def add_columns():
         await conn.close()
 
 
+async def pack_feedback_flags():
+    """conversation_feedbacks 불리언 5개 → flags SMALLINT 비트필드 (FLAG_* 비트)
+
+    옛 컬럼을 DROP하므로 백업 후 1회 실행. 옛 컬럼에 걸린 부분 인덱스/통계 트리거도 제거하며,
+    다음 앱 기동 시 flags 기준으로 재생성됨.
+    """
+    from app.models.conversation_feedback import (
+        FLAG_WEB, FLAG_DEEP, FLAG_VERIFIED, FLAG_INCLUDED, FLAG_POSITIVE, FLAG_POSITIVE_SET,
+    )
+
+    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(db_url)
+
+    try:
+        print("\nPacking conversation_feedbacks booleans into flags...")
+        async with conn.transaction():
+            # 동시 실행 방지 (락 획득 후 컬럼 존재 여부 확인)
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('conversation_feedbacks.flags'))")
+            exists = await conn.fetchval("""
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'conversation_feedbacks' AND column_name = 'is_verified'
+            """)
+            if not exists:
+                print("[SKIP] Already migrated")
+                return
+
+            await conn.execute("DROP TRIGGER IF EXISTS trg_fb_dataset_counts ON conversation_feedbacks")
+            await conn.execute("DROP INDEX IF EXISTS ix_fb_training")
+            await conn.execute("""
+                ALTER TABLE conversation_feedbacks
+                ADD COLUMN IF NOT EXISTS flags smallint NOT NULL DEFAULT 0
+            """)
+            await conn.execute(f"""
+                UPDATE conversation_feedbacks SET flags =
+                      CASE WHEN used_web_search THEN {FLAG_WEB} ELSE 0 END
+                    + CASE WHEN used_deep_think THEN {FLAG_DEEP} ELSE 0 END
+                    + CASE WHEN is_verified THEN {FLAG_VERIFIED} ELSE 0 END
+                    + CASE WHEN is_included_in_training THEN {FLAG_INCLUDED} ELSE 0 END
+                    + CASE WHEN is_positive THEN {FLAG_POSITIVE} ELSE 0 END
+                    + CASE WHEN is_positive IS NOT NULL THEN {FLAG_POSITIVE_SET} ELSE 0 END
+            """)
+            await conn.execute("""
+                ALTER TABLE conversation_feedbacks
+                    DROP COLUMN used_web_search, DROP COLUMN used_deep_think,
+                    DROP COLUMN is_verified, DROP COLUMN is_included_in_training,
+                    DROP COLUMN is_positive
+            """)
+        print("[OK] Packed into flags (restart the app to recreate ix_fb_training / trg_fb_dataset_counts)")
+
+    finally:
+        await conn.close()
+
+
 if __name__ == "__main__":
     asyncio.run(add_columns())
+    if "--pack-feedback-flags" in sys.argv:
+        asyncio.run(pack_feedback_flags())
@@ -75,6 +75,13 @@ async def db_session(test_engine, setup_database):
         # 트랜잭션이 끝나면 자동 롤백
 
 
+@pytest.fixture
+def flush_on_commit(db_session):
+    """CRUD의 commit을 flush로 대체 (테스트 세션은 외부 트랜잭션 안에서 동작 → 종료 시 롤백 유지)"""
+    with patch.object(db_session, "commit", db_session.flush):
+        yield db_session
+
+
 # ============================================================
 # FastAPI 테스트 클라이언트
 # ============================================================
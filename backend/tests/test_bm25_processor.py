@@ -0,0 +1,188 @@
+"""
+bm25_processor.py 단위 테스트
+- 토큰화
+- 어휘 구축 (DF/IDF 가지치기, 병렬 DF 집계)
+- sparse vector (TF)
+- BM25 점수 (코퍼스 인덱스 캐시, 멀티 쿼리 배치)
+"""
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.bm25_processor import BM25Processor
+
+
+@pytest.fixture
+def bm25():
+    """테스트용 BM25Processor 인스턴스 (get_bm25_processor 캐시와 별개)"""
+    return BM25Processor()
+
+
+class TestTokenize:
+    """토큰화 테스트"""
+
+    def test_lowercases_and_splits(self, bm25):
+        assert bm25.tokenize("Hello  World\n한국어 Ünïcode") == ["hello", "world", "한국어", "ünïcode"]
+
+    def test_lowercase_input_unchanged(self, bm25):
+        assert bm25.tokenize("already lower text") == ["already", "lower", "text"]
+
+    def test_repeated_text_hits_cache(self, bm25):
+        from app.services.bm25_processor import _tokenize_cached
+
+        first = bm25.tokenize("Cache Me")
+        hits = _tokenize_cached.cache_info().hits
+        first.append("mutated")
+        assert bm25.tokenize("Cache Me") == ["cache", "me"]
+        assert _tokenize_cached.cache_info().hits == hits + 1
+
+    def test_long_text_bypasses_cache(self, bm25):
+        from app.services.bm25_processor import _TOKENIZE_CACHE_MAX_LEN, _tokenize_cached
+
+        misses = _tokenize_cached.cache_info().misses
+        assert len(bm25.tokenize("a " * _TOKENIZE_CACHE_MAX_LEN)) == _TOKENIZE_CACHE_MAX_LEN
+        assert _tokenize_cached.cache_info().misses == misses
+
+    def test_empty(self, bm25):
+        assert bm25.tokenize("") == []
+        assert bm25.tokenize("   \t\n") == []
+
+
+class TestBuildVocabulary:
+    """어휘 구축 테스트"""
+
+    def test_first_appearance_order(self, bm25):
+        assert bm25.build_vocabulary(["b a b", "c a"]) == {"b": 0, "a": 1, "c": 2}
+
+    def test_prunes_low_idf_terms(self, bm25):
+        bm25.vocab_size_limit = 2
+        # "the"는 모든 문서에 등장 (IDF 최저) → 제거
+        vocab = bm25.build_vocabulary(["the cat", "the dog", "the"])
+        assert vocab == {"cat": 0, "dog": 1}
+
+    def test_parallel_matches_serial(self, bm25):
+        from concurrent.futures import ThreadPoolExecutor
+
+        texts = [f"t{i % 7} shared t{i % 3} x{i}" for i in range(20)]
+        serial = bm25.build_vocabulary(texts)
+        with ThreadPoolExecutor(max_workers=3) as pool, \
+                patch("app.services.bm25_processor._PARALLEL_VOCAB_MIN_DOCS", 0), \
+                patch("app.services.bm25_processor._VOCAB_WORKERS", 3), \
+                patch("app.services.bm25_processor._get_vocab_pool", return_value=pool):
+            parallel = bm25.build_vocabulary(texts)
+        assert list(parallel.items()) == list(serial.items())
+
+    def test_process_pool_matches_serial(self, bm25):
+        from app.services.bm25_processor import shutdown_vocab_pool
+
+        texts = [f"t{i % 7} shared t{i % 3} x{i}" for i in range(20)]
+        serial = bm25.build_vocabulary(texts)
+        try:
+            with patch("app.services.bm25_processor._PARALLEL_VOCAB_MIN_DOCS", 0), \
+                    patch("app.services.bm25_processor._VOCAB_WORKERS", 2):
+                parallel = bm25.build_vocabulary(texts)
+        finally:
+            shutdown_vocab_pool()
+        assert list(parallel.items()) == list(serial.items())
+
+    def test_broken_pool_is_reset(self, bm25):
+        from concurrent.futures.process import BrokenProcessPool
+        import app.services.bm25_processor as mod
+
+        broken = MagicMock()
+        broken.map.side_effect = BrokenProcessPool("worker died")
+        with patch.object(mod, "_vocab_pool", broken), \
+                patch.object(mod, "_PARALLEL_VOCAB_MIN_DOCS", 0), \
+                patch.object(mod, "_VOCAB_WORKERS", 2):
+            vocab = bm25.build_vocabulary(["b a", "c"])
+            assert mod._vocab_pool is None
+        assert vocab == {"b": 0, "a": 1, "c": 2}
+        broken.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+
+class TestSparseVector:
+    """sparse vector 생성 테스트"""
+
+    def test_normalized_tf(self, bm25):
+        vocab = {"a": 0, "b": 1, "c": 2}
+        bm25.value_dtype = "float32"
+        indices, values = bm25.compute_sparse_vector("a b a z", vocab)
+        assert (indices.dtype, values.dtype) == (np.int32, np.float32)
+        assert dict(zip(indices.tolist(), values.tolist())) == {0: 0.5, 1: 0.25}
+
+    @pytest.mark.parametrize("dtype, expected", [
+        ("float16", {0: 0.5, 1: 0.25}),
+        ("uint8", {0: 128, 1: 64}),
+    ])
+    def test_quantized_values(self, bm25, dtype, expected):
+        bm25.value_dtype = dtype
+        indices, values = bm25.compute_sparse_vector("a b a z", {"a": 0, "b": 1})
+        assert values.dtype == np.dtype(dtype)
+        assert dict(zip(indices.tolist(), values.tolist())) == expected
+
+    def test_query_mode_keeps_raw_counts(self, bm25):
+        bm25.value_dtype = "uint8"
+        indices, values = bm25.compute_sparse_vector("a b a z", {"a": 0, "b": 1}, normalize=False)
+        assert values.dtype == np.float32
+        assert dict(zip(indices.tolist(), values.tolist())) == {0: 2.0, 1: 1.0}
+
+    def test_uint8_keeps_rare_terms(self, bm25):
+        bm25.value_dtype = "uint8"
+        _, values = bm25.compute_sparse_vector("a " + "b " * 999, {"a": 0})
+        assert values.tolist() == [1]
+
+    def test_empty_inputs(self, bm25):
+        for text, vocab in [("", {"a": 0}), ("a", {}), ("z", {"a": 0})]:
+            indices, values = bm25.compute_sparse_vector(text, vocab)
+            assert indices.size == values.size == 0
+
+
+class TestBM25Scores:
+    """BM25 점수 / 인덱스 캐시 테스트"""
+
+    def test_scores_rank_matching_doc_first(self, bm25):
+        docs = ["apple banana", "cherry date", "elder fig"]
+        scores = bm25.compute_bm25_scores("apple", docs, {})
+        assert len(scores) == 3 and scores[0] > scores[1]
+
+    def test_batch_matches_single_queries(self, bm25):
+        docs = ["apple banana", "cherry date", "elder fig"]
+        with patch.object(bm25, "_build_bm25_index", wraps=bm25._build_bm25_index) as build:
+            scores = bm25.compute_bm25_scores_batch(["apple", "fig date"], docs, {})
+        build.assert_called_once()
+        assert scores.shape == (2, 3)
+        assert scores[1].tolist() == bm25.compute_bm25_scores("fig date", docs, {})
+        assert bm25.compute_bm25_scores_batch([], docs, {}).shape == (0, 3)
+        assert bm25.compute_bm25_scores_batch(["apple"], [], {}).shape == (1, 0)
+
+    def test_postings_index_matches_bm25okapi(self, bm25):
+        import random
+        from app.services.bm25_processor import _PostingsBM25
+
+        # 참조 구현과의 비교용 (런타임 의존성 아님 — 미설치 시 건너뜀)
+        BM25Okapi = pytest.importorskip("rank_bm25").BM25Okapi
+
+        rng = random.Random(0)
+        words = [f"w{i}" for i in range(30)]
+        corpus = [rng.choices(words, k=rng.randint(1, 15)) for _ in range(40)]
+        index = _PostingsBM25(corpus, k1=bm25.k1, b=bm25.b)
+        okapi = BM25Okapi(corpus, k1=bm25.k1, b=bm25.b)
+        for query in (["w1"], ["w2", "w2", "w7"], ["w0", "missing"], []):
+            assert np.allclose(index.get_scores(query), okapi.get_scores(query))
+
+    def test_index_reused_for_same_corpus(self, bm25):
+        docs = ["apple banana", "cherry date", "elder fig"]
+        with patch.object(bm25, "tokenize", wraps=bm25.tokenize) as tok:
+            bm25.compute_bm25_scores("apple", docs, {})
+            bm25.compute_bm25_scores("cherry", list(docs), {})
+        assert tok.call_count == len(docs) + 2  # 코퍼스 1회 + 쿼리 2회
+
+    def test_cache_is_bounded(self, bm25):
+        from app.services.bm25_processor import _BM25_CACHE_SIZE
+
+        for i in range(_BM25_CACHE_SIZE + 3):
+            bm25.compute_bm25_scores("q", [f"doc {i}", "other"], {})
+        assert len(bm25._bm25_cache) == _BM25_CACHE_SIZE
+
+    def test_blank_query_scores_zero(self, bm25):
+        assert bm25.compute_bm25_scores("   ", ["apple pie", "fig"], {}) == [0.0, 0.0]
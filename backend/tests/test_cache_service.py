@@ -13,11 +13,7 @@ from app.services.cache_service import CacheService
 
 @pytest.fixture
 def cache_service():
-    """테스트용 CacheService 인스턴스 (싱글톤 우회)"""
-    # 싱글톤 상태 초기화
-    CacheService._instance = None
-    CacheService._initialized = False
-
+    """테스트용 CacheService 인스턴스 (get_cache_service 캐시와 별개)"""
     service = CacheService()
     # Redis 미연결 상태로 시작
     service._connected = False
@@ -203,10 +199,3 @@ class TestConversationHistory:
         """미연결 시 False"""
         result = await cache_service.clear_conversation("session1")
         assert result is False
-
-    @pytest.fixture(autouse=True)
-    def cleanup(self):
-        """테스트 후 싱글톤 정리"""
-        yield
-        CacheService._instance = None
-        CacheService._initialized = False
@@ -0,0 +1,81 @@
+"""
+encryption.py 단위 테스트
+- AES-GCM(v2) 암복호화 왕복 + 기존 Fernet 토큰 호환
+- 일괄 복호화 (빈 값/손상된 토큰 처리)
+"""
+from app.core.encryption import encrypt_value, decrypt_value, decrypt_values
+
+
+class TestEncryption:
+    """암복호화 테스트"""
+
+    def test_round_trip(self):
+        token = encrypt_value("sk-secret")
+        assert token != "sk-secret"
+        assert decrypt_value(token) == "sk-secret"
+
+    def test_new_tokens_are_v2(self):
+        token = encrypt_value("sk-secret")
+        assert token.startswith("v2:")
+        assert encrypt_value("sk-secret") != token  # 호출마다 새 nonce
+
+    def test_legacy_fernet_token_still_decrypts(self):
+        from app.core.encryption import get_fernet
+        legacy = get_fernet().encrypt(b"sk-legacy").decode()
+        assert legacy.startswith("gAAAA")
+        assert decrypt_value(legacy) == "sk-legacy"
+        assert decrypt_values([legacy]) == ["sk-legacy"]
+
+    def test_tampered_v2_token_rejected(self):
+        token = encrypt_value("sk-secret")
+        tampered = token[:-4] + ("AAAA" if token[-4:] != "AAAA" else "BBBB")
+        assert decrypt_values([tampered, "v2:!!"]) == [None, None]
+
+    def test_decrypt_values_keeps_order_and_handles_invalid(self):
+        a, b = encrypt_value("a"), encrypt_value("b")
+        assert decrypt_values([a, None, "not-a-token", b, ""]) == ["a", None, None, "b", None]
+
+
+class TestKeyCache:
+    """파생 키 디스크 캐시 테스트"""
+
+    def test_derived_key_cached_in_configured_dir(self, tmp_path, monkeypatch):
+        from app.core import encryption
+
+        monkeypatch.setattr(encryption.settings, "ENCRYPTION_KEY_CACHE_DIR", str(tmp_path))
+        first = encryption._derive_or_load_key(b"secret")
+        files = list(tmp_path.glob("ai-rag-fernet-*.key"))
+        assert len(files) == 1
+        assert oct(files[0].stat().st_mode & 0o777) == "0o600"
+
+        monkeypatch.setattr(encryption, "_pbkdf2", lambda secret: (_ for _ in ()).throw(AssertionError))
+        assert encryption._derive_or_load_key(b"secret") == first
+
+    def test_no_cache_without_setting(self, tmp_path, monkeypatch):
+        from app.core import encryption
+
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        monkeypatch.setattr(encryption.settings, "ENCRYPTION_KEY_CACHE_DIR", None)
+        assert encryption._key_cache_path(b"secret") is None
+        assert encryption._derive_or_load_key(b"secret") == encryption._pbkdf2(b"secret")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_ignores_cache_readable_by_others(self, tmp_path, monkeypatch):
+        from app.core import encryption
+
+        monkeypatch.setattr(encryption.settings, "ENCRYPTION_KEY_CACHE_DIR", str(tmp_path))
+        path = encryption._key_cache_path(b"secret")
+        path.write_bytes(b"x" * 32)
+        path.chmod(0o644)
+        assert encryption._derive_or_load_key(b"secret") == encryption._pbkdf2(b"secret")
+
+
+class TestAsyncWrappers:
+    """워커 스레드 래퍼 테스트"""
+
+    async def test_round_trip(self):
+        from app.core.encryption import aencrypt_value, adecrypt_value, adecrypt_values
+
+        token = await aencrypt_value("sk-async")
+        assert await adecrypt_value(token) == "sk-async"
+        assert await adecrypt_values(iter([token, None])) == ["sk-async", None]
@@ -0,0 +1,172 @@
+"""
+feedback.py API 엔드포인트 테스트
+- 데이터셋 빌드 (단일 UPDATE + 트리거 통계)
+- flags 비트필드 hybrid 속성
+- 일괄 생성 (INSERT ... RETURNING id)
+- 파인튜닝 작업 목록
+"""
+import pytest
+
+from sqlalchemy import func, select
+
+import app.main  # noqa: F401  모든 모델 등록 (테이블/트리거 생성)
+from app.models.conversation_feedback import (
+    FLAG_POSITIVE, FLAG_POSITIVE_SET, FLAG_WEB, ConversationFeedback, FineTuningJob, TrainingDataset,
+)
+
+
+def _feedback(i: int, **kw) -> ConversationFeedback:
+    return ConversationFeedback(
+        user_id=1, session_id=f"fb-sess-{i}", message_index=i,
+        user_message="q", ai_message="a", **kw,
+    )
+
+
+@pytest.fixture
+async def dataset(db_session):
+    ds = TrainingDataset(user_id=1, name="ds", min_rating=4, only_positive=False)
+    db_session.add(ds)
+    await db_session.flush()
+    return ds
+
+
+class TestFeedbackFlags:
+    """불리언 컬럼 → flags 비트필드 테스트"""
+
+    def test_properties_pack_into_flags(self):
+        fb = _feedback(0, used_web_search=True, is_positive=False)
+        assert fb.flags == FLAG_WEB | FLAG_POSITIVE_SET
+        assert (fb.used_web_search, fb.used_deep_think, fb.is_positive) == (True, False, False)
+        fb.is_positive = None
+        assert fb.flags == FLAG_WEB and fb.is_positive is None
+
+    async def test_sql_expressions(self, db_session):
+        db_session.add_all([
+            _feedback(30, is_positive=True),
+            _feedback(31, is_positive=False),
+            _feedback(32),
+        ])
+        await db_session.flush()
+
+        def count(*where):
+            return db_session.scalar(select(func.count()).select_from(ConversationFeedback).where(
+                ConversationFeedback.session_id.like("fb-sess-3_"), *where
+            ))
+
+        assert await count(ConversationFeedback.is_positive == True) == 1
+        assert await count(ConversationFeedback.is_positive == False) == 1
+        assert await count(ConversationFeedback.is_positive.is_(None)) == 1
+        raw = await db_session.scalar(
+            select(ConversationFeedback.flags).where(ConversationFeedback.session_id == "fb-sess-30")
+        )
+        assert raw == FLAG_POSITIVE | FLAG_POSITIVE_SET
+
+
+class TestFeedbackBatch:
+    """피드백 일괄 생성 테스트"""
+
+    async def test_batch_returns_ids_in_order(self, authenticated_client, db_session, flush_on_commit):
+        payload = {"feedbacks": [
+            {"session_id": "fb-batch", "message_index": i, "user_message": "q", "ai_message": "a",
+             "is_positive": i % 2 == 0, "used_web_search": True, "kb_ids": ["kb1"]}
+            for i in range(3)
+        ]}
+        resp = await authenticated_client.post("/api/v1/training/feedback/batch", json=payload)
+
+        assert resp.status_code == 200
+        ids = resp.json()["ids"]
+        rows = (await db_session.execute(
+            select(ConversationFeedback).where(ConversationFeedback.id.in_(ids))
+            .order_by(ConversationFeedback.id)
+        )).scalars().all()
+        assert [r.id for r in rows] == ids
+        assert [r.message_index for r in rows] == [0, 1, 2]
+        assert [r.is_positive for r in rows] == [True, False, True]
+        assert all(r.used_web_search and r.kb_ids == ["kb1"] for r in rows)
+
+    async def test_batch_requires_rating_data(self, authenticated_client):
+        payload = {"feedbacks": [{"session_id": "s", "message_index": 0, "user_message": "q", "ai_message": "a"}]}
+        resp = await authenticated_client.post("/api/v1/training/feedback/batch", json=payload)
+        assert resp.status_code == 400
+
+
+class TestDatasetCounts:
+    """training_datasets 통계 트리거 테스트"""
+
+    async def test_build_counts_via_trigger(self, authenticated_client, db_session, dataset, flush_on_commit):
+        db_session.add_all([
+            _feedback(1, rating=5, is_verified=True),
+            _feedback(2, rating=4),
+            _feedback(3, rating=2),
+        ])
+        await db_session.flush()
+
+        resp = await authenticated_client.post(f"/api/v1/training/datasets/{dataset.id}/build")
+
+        assert resp.status_code == 200
+        body = resp.json()["dataset"]
+        assert (body["total_examples"], body["verified_examples"]) == (2, 1)
+
+    async def test_update_and_delete_adjust_counts(self, db_session, dataset):
+        fb = _feedback(10, rating=5, dataset_id=dataset.id, is_included_in_training=True)
+        db_session.add(fb)
+        await db_session.flush()
+        await db_session.refresh(dataset)
+        assert (dataset.total_examples, dataset.verified_examples) == (1, 0)
+
+        fb.is_verified = True
+        await db_session.flush()
+        await db_session.refresh(dataset)
+        assert (dataset.total_examples, dataset.verified_examples) == (1, 1)
+
+        await db_session.delete(fb)
+        await db_session.flush()
+        await db_session.refresh(dataset)
+        assert (dataset.total_examples, dataset.verified_examples) == (0, 0)
+
+
+class TestDatasetExport:
+    """데이터셋 JSONL 내보내기 (스트리밍) 테스트"""
+
+    async def test_export_streams_rows(self, authenticated_client, db_session, dataset, flush_on_commit):
+        import orjson
+
+        db_session.add_all([
+            _feedback(20 + i, rating=5, dataset_id=dataset.id, is_included_in_training=True)
+            for i in range(3)
+        ])
+        await db_session.flush()
+        ds_id = dataset.id
+        db_session.expire_all()  # 트리거가 갱신한 total_examples를 다시 읽도록
+
+        resp = await authenticated_client.get(
+            f"/api/v1/training/datasets/{ds_id}/export", params={"format": "completion"}
+        )
+
+        assert resp.status_code == 200
+        lines = [orjson.loads(line) for line in resp.content.splitlines()]
+        assert lines == [{"prompt": "q", "completion": "a"}] * 3
+
+    async def test_export_empty_dataset(self, authenticated_client, dataset):
+        resp = await authenticated_client.get(f"/api/v1/training/datasets/{dataset.id}/export")
+        assert resp.status_code == 400
+
+
+class TestFineTuningJobList:
+    """파인튜닝 작업 목록 (TypeAdapter 일괄 검증) 테스트"""
+
+    async def test_lists_own_jobs(self, authenticated_client, db_session, dataset):
+        db_session.add_all([
+            FineTuningJob(user_id=1, dataset_id=dataset.id, job_id=f"ft-list-{i}",
+                          job_name=f"job {i}", base_model="llama3.1")
+            for i in range(2)
+        ])
+        await db_session.flush()
+
+        resp = await authenticated_client.get("/api/v1/finetuning/jobs")
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] == 2
+        assert {j["job_id"] for j in body["jobs"]} == {"ft-list-0", "ft-list-1"}
+        assert all(j["status"] == "pending" and j["progress"] == 0 for j in body["jobs"])
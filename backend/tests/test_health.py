@@ -0,0 +1,74 @@
+"""
+헬스 프로브 테스트
+- 서비스별 1초 캐시
+- /health/all 동시 프로브
+"""
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services import health
+
+
+@pytest.fixture(autouse=True)
+def _reset_probe_cache():
+    health._probe_cache.clear()
+    yield
+    health._probe_cache.clear()
+
+
+class TestProbeCache:
+    """프로브 결과 캐시 테스트"""
+
+    async def test_repeated_probe_served_from_cache(self):
+        fn = AsyncMock(return_value={"status": "connected", "service": "redis"})
+        with patch.dict(health.PROBES, {"redis": fn}):
+            first = await health.probe("redis")
+            second = await health.probe("redis")
+
+        assert first == second
+        assert fn.await_count == 1
+
+    async def test_expired_entry_probes_again(self):
+        fn = AsyncMock(return_value={"status": "connected", "service": "redis"})
+        health._probe_cache["redis"] = (time.monotonic() - 10, {"status": "stale"})
+        with patch.dict(health.PROBES, {"redis": fn}):
+            result = await health.probe("redis")
+
+        assert result["status"] == "connected"
+        fn.assert_awaited_once()
+
+    async def test_unknown_service(self):
+        assert await health.probe("nope") is None
+
+
+class TestProbeAll:
+    """전체 서비스 동시 프로브 테스트"""
+
+    async def test_probes_run_concurrently(self):
+        async def slow(name):
+            await asyncio.sleep(0.1)
+            return {"status": "connected", "service": name}
+
+        probes = {name: (lambda n=name: slow(n)) for name in health.PROBES}
+        with patch.dict(health.PROBES, probes):
+            started = time.monotonic()
+            results = await health.probe_all()
+            elapsed = time.monotonic() - started
+
+        assert set(results) == set(probes)
+        assert elapsed < 0.3  # 순차 실행이면 0.4초 이상
+
+    async def test_health_all_endpoint(self, async_client):
+        results = {"redis": {"status": "connected", "service": "redis"}}
+        with patch("app.main.probe_all", AsyncMock(return_value=results)):
+            resp = await async_client.get("/health/all")
+
+        assert resp.status_code == 200
+        assert resp.json() == {"services": results}
+
+    async def test_unknown_service_endpoint(self, async_client):
+        resp = await async_client.get("/health/unknown")
+        assert resp.json()["status"] == "error"
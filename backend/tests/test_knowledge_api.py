@@ -4,6 +4,8 @@ knowledge.py API 엔드포인트 테스트
 - 파일 검증 (확장자, 크기)
 """
 import io
+from contextlib import contextmanager
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import status
@@ -141,3 +143,409 @@ class TestUploadEndpoint:
             assert response.status_code == status.HTTP_200_OK
             data = response.json()
             assert data["kb_id"] == "default_kb"
+
+
+class TestChunksEndpoint:
+    """청크 조회 엔드포인트 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def clear_total_cache(self):
+        from app.api.endpoints.knowledge import _total_cache
+        _total_cache.clear()
+        yield
+        _total_cache.clear()
+
+    @staticmethod
+    @contextmanager
+    def _override_vector_service(svc):
+        from app.main import app
+        from app.services.vector_store import get_vector_store_service
+
+        app.dependency_overrides[get_vector_store_service] = lambda: svc
+        try:
+            yield svc
+        finally:
+            app.dependency_overrides.pop(get_vector_store_service, None)
+
+    @staticmethod
+    def _mock_vector_service(points, total=2):
+        client = MagicMock()
+        client.collection_exists.return_value = True
+        client.count.return_value = MagicMock(count=total)
+        client.scroll.return_value = (points, None)
+        svc = MagicMock()
+        svc.get_client.return_value = client
+        return svc
+
+    @staticmethod
+    def _point(pid, text, content_type="text"):
+        return MagicMock(
+            id=pid,
+            payload={
+                "page_content": text,
+                "metadata": {"source": "a.pdf", "chunk_index": pid, "content_type": content_type},
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_chunks_json(self, authenticated_client):
+        """기본 JSON 응답"""
+        svc = self._mock_vector_service([self._point(1, "hello"), self._point(2, "world")])
+        with self._override_vector_service(svc), \
+             patch("app.api.endpoints.knowledge.resolve_qdrant_client", AsyncMock(return_value=None)):
+            response = await authenticated_client.get("/api/v1/knowledge/kb1/chunks")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [c["text"] for c in data["chunks"]] == ["hello", "world"]
+        assert data["total"] == 2
+        assert data["next_offset"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_chunks_ndjson_stream(self, authenticated_client):
+        """stream=true 시 NDJSON 행 + done 라인"""
+        import json
+
+        svc = self._mock_vector_service([self._point(1, "hello"), self._point(2, "img", "image")])
+        with self._override_vector_service(svc), \
+             patch("app.api.endpoints.knowledge.resolve_qdrant_client", AsyncMock(return_value=None)):
+            response = await authenticated_client.get("/api/v1/knowledge/kb1/chunks?stream=true")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(l) for l in response.text.splitlines() if l]
+        assert [l["type"] for l in lines] == ["chunk", "chunk", "done"]
+        assert lines[1]["chunk"]["content_type"] == "image"
+        assert "image_path" in lines[1]["chunk"]
+        assert lines[-1] == {"type": "done", "total": 2, "next_offset": None, "kb_id": "kb1"}
+
+    @pytest.mark.asyncio
+    async def test_get_chunks_total_cached(self, authenticated_client):
+        """연속 페이지 요청 시 count RPC는 한 번만 호출"""
+        svc = self._mock_vector_service([self._point(1, "hello")], total=7)
+        client = svc.get_client.return_value
+        with self._override_vector_service(svc), \
+             patch("app.api.endpoints.knowledge.resolve_qdrant_client", AsyncMock(return_value=None)):
+            first = await authenticated_client.get("/api/v1/knowledge/kb1/chunks")
+            second = await authenticated_client.get("/api/v1/knowledge/kb1/chunks?offset=abc")
+
+        assert first.json()["total"] == 7
+        assert second.json()["total"] == 7
+        assert client.count.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_file_chunks_invalidates_total(self, authenticated_client):
+        """파일 청크 삭제 시 total 캐시 무효화"""
+        from app.api.endpoints.knowledge import _total_cache, _set_cached_total
+
+        _set_cached_total(1, "kb1", None, 10)
+        _set_cached_total(1, "kb1", "a.pdf", 3)
+        _set_cached_total(1, "kb2", None, 5)
+
+        svc = self._mock_vector_service([], total=3)
+        with self._override_vector_service(svc), \
+             patch("app.api.endpoints.knowledge.resolve_qdrant_client", AsyncMock(return_value=None)):
+            response = await authenticated_client.delete("/api/v1/knowledge/kb1/files?source=a.pdf")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(_total_cache) == [(1, "kb2", None)]
+
+    @pytest.mark.asyncio
+    async def test_upload_invalidates_total_cache(self, authenticated_client):
+        """업로드 시 해당 KB의 청크 수 캐시 무효화"""
+        from app.api.endpoints.knowledge import _total_cache, _set_cached_total
+
+        _set_cached_total(1, "test_kb", None, 10)
+        _set_cached_total(1, "other_kb", None, 5)
+        with patch("app.api.endpoints.knowledge.get_ingestion_service") as mock_svc:
+            mock_ingestion = AsyncMock()
+            mock_ingestion.save_file = AsyncMock(return_value=("/tmp/test.pdf", "test.pdf"))
+            mock_svc.return_value = mock_ingestion
+            response = await authenticated_client.post(
+                "/api/v1/knowledge/upload",
+                files={"file": ("test.pdf", io.BytesIO(b"%PDF-1.4"), "application/pdf")},
+                data={"kb_id": "test_kb"},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(_total_cache) == [(1, "other_kb", None)]
+
+    @pytest.mark.asyncio
+    async def test_delete_base_invalidates_total(self, authenticated_client):
+        """KB 삭제 시 해당 KB의 청크 수 캐시 제거"""
+        from app.api.endpoints.knowledge import _total_cache, _set_cached_total
+
+        _set_cached_total(1, "kb1", None, 10)
+        _set_cached_total(1, "kb2", None, 5)
+
+        svc = self._mock_vector_service([])
+        with patch("app.api.endpoints.knowledge.get_vector_store_service", return_value=svc), \
+             patch("app.api.endpoints.knowledge.crud_delete_kb", AsyncMock(return_value=True)), \
+             patch("app.api.endpoints.knowledge.resolve_qdrant_client", AsyncMock(return_value=None)):
+            response = await authenticated_client.delete("/api/v1/knowledge/bases/kb1")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert list(_total_cache) == [(1, "kb2", None)]
+
+    @pytest.mark.asyncio
+    async def test_get_chunks_search(self, authenticated_client):
+        """검색어 지정 시 시맨틱 검색 결과 + score 반환"""
+        point = self._point(1, "hello")
+        point.score = 0.91234
+        svc = self._mock_vector_service([], total=4)
+        svc.embeddings.embed_query.return_value = [0.1, 0.2]
+        client = svc.get_client.return_value
+        client.query_points.return_value = MagicMock(points=[point])
+        with self._override_vector_service(svc), \
+             patch("app.api.endpoints.knowledge.resolve_qdrant_client", AsyncMock(return_value=None)):
+            response = await authenticated_client.get("/api/v1/knowledge/kb1/chunks?search=hi")
+
+        data = response.json()
+        assert data["total"] == 4
+        assert data["chunks"][0]["score"] == 0.9123
+        svc.embeddings.embed_query.assert_called_once_with("hi")
+        assert client.query_points.call_args.kwargs["query"] == [0.1, 0.2]
+        # 양자화 사용 시 oversampling + 원본 벡터 rescore
+        assert "search_params" in client.query_points.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_get_chunks_missing_collection(self, authenticated_client):
+        """컬렉션이 없으면 사전 확인 없이 404 예외를 빈 결과로 변환"""
+        from qdrant_client.http.exceptions import UnexpectedResponse
+
+        svc = self._mock_vector_service([])
+        client = svc.get_client.return_value
+        client.count.side_effect = UnexpectedResponse(404, "Not Found", b"{}", {})
+        with self._override_vector_service(svc), \
+             patch("app.api.endpoints.knowledge.resolve_qdrant_client", AsyncMock(return_value=None)):
+            response = await authenticated_client.get("/api/v1/knowledge/kb1/chunks")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"chunks": [], "total": 0, "next_offset": None, "kb_id": "kb1"}
+        client.collection_exists.assert_not_called()
+
+
+class TestImageSearchSingleFlight:
+    """이미지 검색 single-flight 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_result(self):
+        """동일 key 동시 요청은 factory를 한 번만 실행"""
+        import asyncio
+        from app.api.endpoints.knowledge import _single_flight, _inflight_image_searches
+
+        calls = 0
+        release = asyncio.Event()
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return ["result"]
+
+        tasks = [asyncio.create_task(_single_flight(("sha", 1), factory)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert results == [["result"]] * 3
+        assert ("sha", 1) not in _inflight_image_searches
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_waiters(self):
+        """실패 시 대기 중인 요청에도 예외 전달"""
+        import asyncio
+        from app.api.endpoints.knowledge import _single_flight
+
+        release = asyncio.Event()
+
+        async def factory():
+            await release.wait()
+            raise RuntimeError("boom")
+
+        tasks = [asyncio.create_task(_single_flight(("sha", 2), factory)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_leader_cancel_does_not_abort_waiters(self):
+        """먼저 시작한 요청이 취소돼도 대기 요청은 결과를 받음"""
+        import asyncio
+        from app.api.endpoints.knowledge import _single_flight
+
+        release = asyncio.Event()
+
+        async def factory():
+            await release.wait()
+            return ["result"]
+
+        leader = asyncio.create_task(_single_flight(("sha", 3), factory))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(_single_flight(("sha", 3), factory))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+
+        assert await follower == ["result"]
+        assert leader.cancelled()
+
+
+class TestKnownCollections:
+    """컬렉션 존재 확인 캐시 테스트"""
+
+    def setup_method(self):
+        from app.api.endpoints.knowledge import _known_collections
+        _known_collections.clear()
+
+    def test_cached_by_name_across_clients(self):
+        """같은 이름이면 클라이언트가 달라도 TTL 내에는 RPC 생략"""
+        from app.api.endpoints.knowledge import _collection_exists
+
+        first, second = MagicMock(), MagicMock()
+        first.collection_exists.return_value = True
+
+        assert _collection_exists(first, "kb_a")
+        assert _collection_exists(second, "kb_a")
+        second.collection_exists.assert_not_called()
+
+    def test_rechecks_after_ttl(self):
+        """TTL이 지나면 다시 확인하고, 없으면 항목 제거"""
+        from app.api.endpoints import knowledge
+
+        client = MagicMock()
+        client.collection_exists.return_value = True
+        assert knowledge._collection_exists(client, "kb_a")
+
+        client.collection_exists.return_value = False
+        with patch.object(knowledge.time, "time", return_value=knowledge.time.time() + 61):
+            assert not knowledge._collection_exists(client, "kb_a")
+        assert "kb_a" not in knowledge._known_collections
+
+    @pytest.mark.asyncio
+    async def test_multimodal_search_raises_not_found(self):
+        """조회 경로는 컬렉션을 만들지 않고 404를 호출자에게 전달"""
+        from qdrant_client.http.exceptions import UnexpectedResponse
+        from app.services.vdb.qdrant_store import QdrantStore
+
+        client = MagicMock()
+        client.query_points.side_effect = UnexpectedResponse(404, "Not Found", b"{}", {})
+        store = QdrantStore.__new__(QdrantStore)
+        store.client, store.collection_name, store.user_id = client, "kb_gone", None
+
+        with pytest.raises(UnexpectedResponse):
+            await store.multimodal_search(query_vector=[0.1], top_k=1)
+        client.create_collection.assert_not_called()
+
+
+class TestImageStoreCache:
+    """이미지 검색 QdrantStore 캐시 (TTL + LRU) 테스트"""
+
+    def setup_method(self):
+        from app.api.endpoints.knowledge import _image_store_cache
+        _image_store_cache.clear()
+
+    def test_reuses_store_and_evicts_least_recent(self):
+        """같은 (컬렉션, 사용자)는 재사용하고, 최대 크기를 넘으면 가장 오래 안 쓴 항목 제거"""
+        from app.api.endpoints import knowledge
+
+        client = MagicMock()
+        with patch("app.services.vdb.qdrant_store.QdrantStore") as store_cls, \
+             patch.object(knowledge, "_IMAGE_STORE_MAXSIZE", 2):
+            store_cls.side_effect = lambda **kw: MagicMock(client=kw["client"])
+            a = knowledge._get_image_search_store(client, "kb_a", 1, None)
+            knowledge._get_image_search_store(client, "kb_b", 1, None)
+            assert knowledge._get_image_search_store(client, "kb_a", 1, None) is a
+            knowledge._get_image_search_store(client, "kb_c", 1, None)
+
+        assert list(knowledge._image_store_cache) == [("kb_a", 1), ("kb_c", 1)]
+
+    def test_expired_entries_swept_on_insert(self):
+        """새 항목 추가 시 TTL이 지난 항목 정리"""
+        from app.api.endpoints import knowledge
+
+        client = MagicMock()
+        with patch("app.services.vdb.qdrant_store.QdrantStore") as store_cls:
+            store_cls.side_effect = lambda **kw: MagicMock(client=kw["client"])
+            knowledge._get_image_search_store(client, "kb_a", 1, None)
+            with patch.object(knowledge.time, "time", return_value=knowledge.time.time() + 301):
+                knowledge._get_image_search_store(client, "kb_b", 1, None)
+
+        assert list(knowledge._image_store_cache) == [("kb_b", 1)]
+
+
+@pytest.fixture
+def all_models():
+    """모든 ORM 모델 매퍼 등록 (관계 문자열 참조 해석용)"""
+    import app.main  # noqa: F401
+
+
+class TestListBases:
+    """KB 목록 (파일 수 포함) 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_file_count_per_base(self, db_session, all_models):
+        from app.crud.knowledge_base import list_knowledge_bases
+        from app.models.knowledge_base import KnowledgeBase, KnowledgeFile
+
+        kb_full = KnowledgeBase(kb_id="count-full", user_id=42, name="full")
+        kb_empty = KnowledgeBase(kb_id="count-empty", user_id=42, name="empty")
+        db_session.add_all([kb_full, kb_empty])
+        await db_session.flush()
+        db_session.add_all([
+            KnowledgeFile(kb_pk=kb_full.id, filename=f"f{i}.txt", original_filename=f"f{i}.txt")
+            for i in range(3)
+        ])
+        await db_session.flush()
+
+        rows = await list_knowledge_bases(db_session, 42)
+
+        counts = {r["kb_id"]: r["file_count"] for r in rows}
+        assert counts == {"count-full": 3, "count-empty": 0}
+
+
+class TestUpdateBase:
+    """KB 부분 업데이트 (UPDATE ... RETURNING) 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_update_returns_row_and_ignores_unknown_keys(self, db_session, all_models, flush_on_commit):
+        from app.crud.knowledge_base import update_knowledge_base
+        from app.models.knowledge_base import KnowledgeBase
+
+        db_session.add(KnowledgeBase(kb_id="upd-1", user_id=43, name="before"))
+        await db_session.flush()
+
+        kb = await update_knowledge_base(
+            db_session, 43, "upd-1", {"name": "after", "not_a_column": 1}
+        )
+        missing = await update_knowledge_base(db_session, 43, "nope", {"name": "x"})
+
+        assert kb.name == "after" and kb.kb_id == "upd-1"
+        assert kb.updated_at is not None
+        assert missing is None
+
+
+class TestBulkInsert:
+    """KnowledgeFile.bulk_insert (Core executemany) 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_rows(self, db_session, all_models):
+        from app.crud.knowledge_base import get_files_for_kb
+        from app.models.knowledge_base import KnowledgeBase, KnowledgeFile
+
+        kb = KnowledgeBase(kb_id="bulk-1", user_id=44, name="bulk")
+        db_session.add(kb)
+        await db_session.flush()
+
+        rows = [
+            {"kb_pk": kb.id, "filename": f"f{i}.txt", "original_filename": f"f{i}.txt", "status": "completed"}
+            for i in range(3)
+        ]
+        assert await KnowledgeFile.bulk_insert(db_session, rows) is None
+        assert await KnowledgeFile.bulk_insert(db_session, []) is None
+
+        files = await get_files_for_kb(db_session, kb.id)
+        assert sorted(f.filename for f in files) == ["f0.txt", "f1.txt", "f2.txt"]
@@ -0,0 +1,42 @@
+"""
+chat_messages 파티셔닝 테스트
+- PostgreSQL DDL (PK에 파티션 키 포함, PARTITION BY)
+- HASH 파티션 목록
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateTable
+
+import app.main  # noqa: F401  모든 모델 등록
+from app.db.partitions import ensure_message_partitions, hash_partitions
+from app.models.chat_session import ChatMessage, ChatSession
+
+
+class TestPartitionDDL:
+    """파티션 테이블 DDL 테스트"""
+
+    def test_postgresql_ddl_includes_partition_key(self):
+        ddl = str(CreateTable(ChatMessage.__table__).compile(dialect=postgresql.dialect()))
+        assert "PRIMARY KEY (id, session_pk)" in ddl
+        assert "PARTITION BY HASH (session_pk)" in ddl
+        assert "id BIGINT GENERATED BY DEFAULT AS IDENTITY" in ddl
+
+    def test_other_tables_and_dialects_unchanged(self):
+        pg = str(CreateTable(ChatSession.__table__).compile(dialect=postgresql.dialect()))
+        lite = str(CreateTable(ChatMessage.__table__).compile(dialect=sqlite.dialect()))
+        assert "PRIMARY KEY (id)" in pg and "PARTITION" not in pg
+        assert "PRIMARY KEY (id)" in lite and "PARTITION" not in lite
+
+
+class TestHashPartitions:
+    """HASH 파티션 목록 테스트"""
+
+    def test_one_partition_per_remainder(self):
+        assert hash_partitions(3) == [
+            ("chat_messages_p0", 0),
+            ("chat_messages_p1", 1),
+            ("chat_messages_p2", 2),
+        ]
+
+    async def test_noop_on_sqlite(self):
+        from app.db.session import engine
+        assert await ensure_message_partitions(engine) == 0
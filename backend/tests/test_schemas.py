@@ -2,11 +2,17 @@
 Pydantic 스키마 단위 테스트
 - UserCreate 비밀번호 검증
 - ChatRequest 필드 검증
+- FeedbackCreate / FeedbackResponse kb_ids 변환
+- ExternalServiceCreate / MessageCreate / FineTuningJobCreate Literal 필드
 """
 import pytest
 from pydantic import ValidationError
 from app.schemas.user import UserCreate, UserResponse, Token
 from app.schemas.chat import ChatRequest
+from app.schemas.feedback import FeedbackCreate, FeedbackResponse
+from app.schemas.external_service import ExternalServiceCreate
+from app.schemas.session import MessageCreate
+from app.schemas.finetuning import FineTuningJobCreate
 
 
 class TestUserCreate:
@@ -128,3 +134,59 @@ class TestChatRequest:
         """kb_id 최대 길이 초과 거부"""
         with pytest.raises(ValidationError):
             ChatRequest(message="hello", kb_id="x" * 101)
+
+
+class TestFeedbackKbIds:
+    """kb_ids JSONB 저장/응답 형식 테스트"""
+
+    _BASE = dict(session_id="s", message_index=0, user_message="q", ai_message="a", rating=5)
+
+    def test_json_string_parsed_to_list(self):
+        assert FeedbackCreate(**self._BASE, kb_ids='["kb1","kb2"]').kb_ids == ["kb1", "kb2"]
+        assert FeedbackCreate(**self._BASE, kb_ids=["kb1"]).kb_ids == ["kb1"]
+        assert FeedbackCreate(**self._BASE, kb_ids="").kb_ids is None
+
+    def test_invalid_kb_ids_rejected(self):
+        with pytest.raises(ValidationError):
+            FeedbackCreate(**self._BASE, kb_ids="kb1")
+        with pytest.raises(ValidationError):
+            FeedbackCreate(**self._BASE, kb_ids='{"kb": 1}')
+
+    def test_response_keeps_json_string(self):
+        from datetime import datetime
+        resp = FeedbackResponse(
+            id=1, user_id=1, session_id="s", message_index=0, user_message="q", ai_message="a",
+            kb_ids=["kb1", "kb2"], used_web_search=False, used_deep_think=False,
+            is_verified=False, is_included_in_training=False, created_at=datetime.now(),
+        )
+        assert resp.kb_ids == '["kb1","kb2"]'
+
+    def test_kb_filter_uses_jsonb_containment(self):
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        import app.main  # noqa: F401  모든 모델 등록 (관계 해석)
+        from app.models.conversation_feedback import ConversationFeedback
+
+        stmt = select(ConversationFeedback.id).where(ConversationFeedback.kb_ids.contains(["kb1"]))
+        assert "conversation_feedbacks.kb_ids @>" in str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestLiteralFields:
+    """Literal 필드 검증 테스트"""
+
+    def test_service_type(self):
+        svc = ExternalServiceCreate(service_id="s", name="S", service_type="pinecone")
+        assert svc.service_type == "pinecone"
+        with pytest.raises(ValidationError):
+            ExternalServiceCreate(service_id="s", name="S", service_type="redis")
+
+    def test_message_role(self):
+        assert MessageCreate(role="system").role == "system"
+        with pytest.raises(ValidationError):
+            MessageCreate(role="ai")
+
+    def test_finetuning_choices(self):
+        job = FineTuningJobCreate(dataset_id=1, job_name="j", base_model="m", format_type="tool_calling")
+        assert (job.provider, job.format_type) == ("ollama", "tool_calling")
+        with pytest.raises(ValidationError):
+            FineTuningJobCreate(dataset_id=1, job_name="j", base_model="m", provider="openai")
@@ -24,7 +24,7 @@ class TestPasswordHashing:
         """비밀번호 해싱"""
         hashed = get_password_hash("MyPassword123")
         assert hashed != "MyPassword123"
-        assert hashed.startswith("$2b$")
+        assert hashed.startswith("$argon2id$")
 
     def test_verify_correct_password(self):
         """올바른 비밀번호 검증"""
@@ -50,13 +50,47 @@ class TestPasswordHashing:
         assert verify_password("notempty", hashed) is False
 
 
+class TestHashUpgrade:
+    """bcrypt → argon2id 자동 업그레이드 테스트"""
+
+    def test_legacy_bcrypt_verifies_and_returns_new_hash(self):
+        import bcrypt
+        from app.core.security import verify_and_update_password
+
+        legacy = bcrypt.hashpw(b"LegacyPass1", bcrypt.gensalt(4)).decode()
+        valid, new_hash = verify_and_update_password("LegacyPass1", legacy)
+        assert valid is True
+        assert new_hash.startswith("$argon2id$")
+        assert verify_password("LegacyPass1", new_hash) is True
+
+    def test_current_hash_needs_no_update(self):
+        from app.core.security import verify_and_update_password
+
+        valid, new_hash = verify_and_update_password("NewPass1", get_password_hash("NewPass1"))
+        assert valid is True and new_hash is None
+
+    def test_parallelism_independent_of_host(self):
+        """해시 파라미터가 코어 수에 따라 달라지지 않음 (컨테이너 간 재해시 반복 방지)"""
+        assert "p=4$" in get_password_hash("AnyPass1")
+
+    def test_malformed_bcrypt_hash_fails(self):
+        """손상된 bcrypt 해시는 예외 대신 검증 실패"""
+        assert verify_password("AnyPass1", "$2b$12$broken") is False
+
+
 class TestDummyHash:
     """더미 해시 테스트"""
 
     def test_dummy_hash_format(self):
-        """더미 해시가 bcrypt 형식인지 확인"""
+        """더미 해시가 실제 해시와 같은 argon2id 형식인지 확인"""
         dummy = get_dummy_hash()
-        assert dummy.startswith("$2b$")
+        assert dummy.startswith("$argon2id$")
+
+    def test_dummy_hash_uses_current_parameters(self):
+        """더미 해시가 실제 해시와 같은 파라미터 (검증 시간으로 사용자 존재 여부 구분 불가)"""
+        from app.core.security import _hasher
+
+        assert not _hasher.check_needs_rehash(get_dummy_hash())
 
     def test_dummy_hash_consistent(self):
         """더미 해시가 항상 같은 값인지 확인"""
@@ -68,6 +102,22 @@ class TestDummyHash:
         # 결과는 False여야 하지만 실행 자체는 성공
         assert result is False
 
+    def test_constant_time_verify_unknown_user(self):
+        """사용자 없음(None)이면 더미 해시를 검증하고 항상 실패"""
+        from unittest.mock import patch
+        from app.core import security
+
+        with patch.object(security, "verify_password", wraps=security.verify_password) as spy:
+            assert security.verify_password_constant_time("anything", None) == (False, None)
+        spy.assert_called_once_with("anything", get_dummy_hash())
+
+    def test_constant_time_verify_known_user(self):
+        from app.core.security import verify_password_constant_time
+
+        hashed = get_password_hash("RightPass1")
+        assert verify_password_constant_time("RightPass1", hashed) == (True, None)
+        assert verify_password_constant_time("WrongPass1", hashed)[0] is False
+
 
 class TestJWTToken:
     """JWT 토큰 테스트"""
@@ -124,3 +174,9 @@ class TestJWTToken:
         token = create_access_token(data={"sub": "test@example.com"})
         with pytest.raises(Exception):
             jwt.decode(token, "wrong-key-that-is-incorrect", algorithms=[settings.ALGORITHM])
+
+    def test_token_matches_jose_encoding(self):
+        """수동 HS 서명 토큰이 jose 인코딩과 바이트 단위로 동일"""
+        token = create_access_token(data={"sub": "test@example.com", "role": "admin"})
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        assert token == jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
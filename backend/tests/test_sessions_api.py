@@ -0,0 +1,235 @@
+"""
+sessions.py API 엔드포인트 테스트
+- 메시지 일괄 추가
+- 세션 삭제
+- 세션 상세 히스토리 캐시
+- 메시지 NDJSON 스트리밍
+- 관계 로딩 전략 (raise_on_sql)
+- role SMALLINT 코드 저장
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import app.main  # noqa: F401  모든 모델 등록 (테이블 생성 / 관계 해석)
+from app.api.endpoints import sessions as sessions_ep
+from app.models.chat_session import ChatSession, ChatMessage
+
+
+@pytest.fixture
+async def chat_session(db_session):
+    s = ChatSession(user_id=1, session_id="sess-api-1", title="T")
+    db_session.add(s)
+    await db_session.flush()
+    return s
+
+
+class TestAddMessagesBatch:
+    """메시지 일괄 추가 테스트"""
+
+    async def test_batch_inserts_in_order(self, authenticated_client, db_session, chat_session, flush_on_commit):
+        payload = [
+            {"role": "user", "content": "질문"},
+            {"role": "assistant", "content": "답변", "thinking": "..."},
+        ]
+        resp = await authenticated_client.post(
+            "/api/v1/sessions/sess-api-1/messages/batch", json=payload
+        )
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [m["role"] for m in body] == ["user", "assistant"]
+        assert body[1]["thinking"] == "..."
+        assert body[0]["id"] < body[1]["id"]
+
+    async def test_batch_serializes_object_metadata(self, authenticated_client, db_session, flush_on_commit):
+        db_session.add(ChatSession(user_id=1, session_id="sess-api-meta", title="M"))
+        await db_session.flush()
+        payload = [
+            {"role": "assistant", "content": "a", "metadata_json": {"tool": "검색", "n": 2}},
+            {"role": "assistant", "content": "b", "metadata_json": '{"raw":true}'},
+        ]
+        resp = await authenticated_client.post(
+            "/api/v1/sessions/sess-api-meta/messages/batch", json=payload
+        )
+
+        metas = [json.loads(m["metadata_json"]) for m in resp.json()]
+        assert metas == [{"tool": "검색", "n": 2}, {"raw": True}]
+
+    async def test_batch_unknown_session(self, authenticated_client):
+        resp = await authenticated_client.post(
+            "/api/v1/sessions/missing/messages/batch", json=[{"role": "user", "content": "x"}]
+        )
+        assert resp.status_code == 404
+
+
+class TestDeleteSession:
+    """세션 삭제 (DELETE ... RETURNING) 테스트"""
+
+    async def test_delete_then_missing(self, authenticated_client, db_session, flush_on_commit):
+        db_session.add(ChatSession(user_id=1, session_id="sess-del-1", title="D"))
+        await db_session.flush()
+
+        first = await authenticated_client.delete("/api/v1/sessions/sess-del-1")
+        second = await authenticated_client.delete("/api/v1/sessions/sess-del-1")
+
+        assert first.status_code == 200
+        assert second.status_code == 404
+
+    async def test_delete_other_users_session_is_404(self, authenticated_client, db_session, flush_on_commit):
+        db_session.add(ChatSession(user_id=999, session_id="sess-del-other", title="O"))
+        await db_session.flush()
+
+        resp = await authenticated_client.delete("/api/v1/sessions/sess-del-other")
+
+        assert resp.status_code == 404
+
+
+@pytest.fixture
+def history_cache():
+    cache = MagicMock()
+    cache.get_session_history = AsyncMock(return_value=None)
+    cache.set_session_history = AsyncMock(return_value=True)
+    with patch.object(sessions_ep, "get_cache_service", return_value=cache):
+        yield cache
+
+
+class TestSessionDetailCache:
+    """세션 상세 히스토리 캐시 테스트"""
+
+    async def test_miss_queries_and_stores_history(self, authenticated_client, db_session, history_cache):
+        s = ChatSession(user_id=1, session_id="sess-cache-1", title="C")
+        db_session.add(s)
+        await db_session.flush()
+        db_session.add(ChatMessage(session_pk=s.id, role="user", content="안녕"))
+        await db_session.flush()
+
+        resp = await authenticated_client.get("/api/v1/sessions/sess-cache-1")
+
+        assert resp.status_code == 200
+        assert [m["content"] for m in resp.json()["messages"]] == ["안녕"]
+        user_id, session_id, _, stored = history_cache.set_session_history.await_args.args
+        assert (user_id, session_id) == (1, "sess-cache-1")
+        assert json.loads(stored)[0]["content"] == "안녕"
+
+    async def test_hit_skips_message_query(self, authenticated_client, db_session, history_cache):
+        db_session.add(ChatSession(user_id=1, session_id="sess-cache-2", title="C"))
+        await db_session.flush()
+        history_cache.get_session_history.return_value = json.dumps([{
+            "id": 1, "role": "assistant", "content": "cached",
+            "created_at": "2026-01-01T00:00:00",
+        }])
+
+        with patch.object(sessions_ep, "get_messages", AsyncMock()) as get_messages:
+            resp = await authenticated_client.get("/api/v1/sessions/sess-cache-2")
+
+        get_messages.assert_not_called()
+        history_cache.set_session_history.assert_not_called()
+        assert resp.json()["messages"][0]["content"] == "cached"
+        assert resp.json()["message_count"] == 1
+
+    async def test_corrupt_cache_falls_back_to_db(self, authenticated_client, db_session, history_cache):
+        db_session.add(ChatSession(user_id=1, session_id="sess-cache-3", title="C"))
+        await db_session.flush()
+        history_cache.get_session_history.return_value = '[{"id": "x"'
+
+        resp = await authenticated_client.get("/api/v1/sessions/sess-cache-3")
+
+        assert resp.status_code == 200
+        assert resp.json()["messages"] == []
+        history_cache.set_session_history.assert_awaited_once()
+
+
+class TestStreamMessages:
+    """메시지 NDJSON 스트리밍 테스트"""
+
+    async def test_stream_matches_list(self, authenticated_client, db_session):
+        s = ChatSession(user_id=1, session_id="sess-stream-1", title="S")
+        db_session.add(s)
+        await db_session.flush()
+        db_session.add_all([
+            ChatMessage(session_pk=s.id, role="user", content="q"),
+            ChatMessage(session_pk=s.id, role="assistant", content="a"),
+        ])
+        await db_session.flush()
+
+        listed = (await authenticated_client.get("/api/v1/sessions/sess-stream-1/messages")).json()
+        resp = await authenticated_client.get("/api/v1/sessions/sess-stream-1/messages?stream=true")
+
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [l["message"] for l in lines[:-1]] == listed["messages"]
+        assert lines[-1] == {"type": "done", "session_id": "sess-stream-1", "count": 2}
+
+
+class TestRelationshipLoading:
+    """관계 lazy="raise_on_sql" 테스트"""
+
+    async def test_lazy_access_raises(self, db_session):
+        from sqlalchemy.exc import InvalidRequestError
+        from app.models.user import User
+
+        user = User(email="lazy-raise@example.com", name="L", hashed_password="x")
+        db_session.add(user)
+        await db_session.flush()
+        db_session.expunge_all()
+
+        user = await db_session.get(User, user.id)
+        with pytest.raises(InvalidRequestError):
+            user.sessions
+
+    async def test_get_session_eager_loads_messages(self, db_session, flush_on_commit):
+        from app.crud.session import add_message, get_session
+
+        s = ChatSession(user_id=1, session_id="sess-eager-1", title="E")
+        db_session.add(s)
+        await db_session.flush()
+        await add_message(db_session, s.id, "user", "안녕")
+        db_session.expunge_all()
+
+        s = await get_session(db_session, 1, "sess-eager-1")
+        assert [m.content for m in s.messages] == ["안녕"]
+
+    async def test_update_keeps_messages_loadable_in_same_session(self, db_session, flush_on_commit):
+        from app.crud.session import add_message, get_session, update_session
+
+        s = ChatSession(user_id=1, session_id="sess-upd-1", title="U")
+        db_session.add(s)
+        await db_session.flush()
+        await add_message(db_session, s.id, "user", "hi")
+        await update_session(db_session, 1, "sess-upd-1", {"title": "U2"})
+
+        s = await get_session(db_session, 1, "sess-upd-1")
+        assert s.title == "U2"
+        assert [m.content for m in s.messages] == ["hi"]
+
+    def test_agent_joined_in_same_select(self):
+        from sqlalchemy import select
+
+        sql = str(select(ChatSession).compile())
+        assert "LEFT OUTER JOIN agents" in sql
+
+
+class TestRoleStorage:
+    """chat_messages.role SMALLINT 코드 저장 테스트"""
+
+    async def test_role_stored_as_code_and_read_as_string(self, db_session, flush_on_commit):
+        from sqlalchemy import text
+        from app.crud.session import add_message, get_messages
+
+        s = ChatSession(user_id=1, session_id="sess-role-1", title="R")
+        db_session.add(s)
+        await db_session.flush()
+        await add_message(db_session, s.id, "assistant", "답변")
+
+        raw = (await db_session.execute(
+            text("SELECT role FROM chat_messages WHERE session_pk = :pk"), {"pk": s.id}
+        )).scalar()
+        assert raw == 2
+        assert [m.role for m in await get_messages(db_session, s.id)] == ["assistant"]
+
+    def test_unknown_role_rejected(self):
+        from app.models.chat_session import ChatMessage
+        with pytest.raises(ValueError):
+            ChatMessage.__table__.c.role.type.process_bind_param("tool", None)
@@ -0,0 +1,232 @@
+"""
+settings.py 엔드포인트 헬퍼 단위 테스트
+- Ollama /api/tags TTL 캐시
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from app.api.endpoints import settings as settings_ep
+
+
+@pytest.fixture(autouse=True)
+def _reset_ollama_cache():
+    settings_ep._ollama_cache.update(at=0.0, data=None)
+    yield
+    settings_ep._ollama_cache.update(at=0.0, data=None)
+
+
+@pytest.fixture
+def disconnected_cache():
+    cache = MagicMock()
+    cache.get_json = AsyncMock(return_value=None)
+    cache.set_json = AsyncMock(return_value=False)
+    with patch.object(settings_ep, "get_cache_service", return_value=cache):
+        yield cache
+
+
+def _mock_http_client(get):
+    client = MagicMock()
+    client.get = get
+    return client
+
+
+class TestOllamaTagsCache:
+    """Ollama 모델 목록 캐시 테스트"""
+
+    async def test_second_call_served_from_cache(self, disconnected_cache):
+        """TTL 내 재호출은 업스트림을 다시 호출하지 않음"""
+        resp = MagicMock()
+        resp.json.return_value = {"models": [{"name": "exaone3.5:7.8b"}]}
+        get = AsyncMock(return_value=resp)
+
+        with patch.object(settings_ep, "get_http_client", return_value=_mock_http_client(get)):
+            first = await settings_ep._fetch_ollama_tags()
+            second = await settings_ep._fetch_ollama_tags()
+
+        assert first == second == {"models": [{"name": "exaone3.5:7.8b"}]}
+        assert get.await_count == 1
+
+    async def test_falls_back_to_stale_data_on_connect_error(self, disconnected_cache):
+        """업스트림 연결 실패 시 마지막 캐시 데이터 반환"""
+        settings_ep._ollama_cache.update(at=0.0, data={"models": [{"name": "stale"}]})
+        get = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+        with patch.object(settings_ep, "get_http_client", return_value=_mock_http_client(get)):
+            data = await settings_ep._fetch_ollama_tags()
+
+        assert data == {"models": [{"name": "stale"}]}
+
+    async def test_raises_without_cached_data(self, disconnected_cache):
+        """캐시가 비어 있으면 예외를 그대로 전파"""
+        get = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+        with patch.object(settings_ep, "get_http_client", return_value=_mock_http_client(get)):
+            with pytest.raises(httpx.ConnectError):
+                await settings_ep._fetch_ollama_tags()
+
+
+class TestAvailableModels:
+    """통합 모델 목록 테스트"""
+
+    async def test_provider_tokens_select_catalogs(self):
+        """'Google Gemini'처럼 저장된 프로바이더도 토큰 단위로 매칭"""
+        rows = [MagicMock(provider="Google Gemini"), MagicMock(provider="openai")]
+        with patch.object(settings_ep, "_fetch_ollama_tags", AsyncMock(side_effect=httpx.ConnectError("down"))), \
+             patch.object(settings_ep, "get_api_keys_for_user", AsyncMock(return_value=rows)):
+            resp = await settings_ep.get_available_models(current_user=MagicMock(id=1), db=MagicMock())
+        result = json.loads(resp.body)
+
+        settings_ep.AvailableModelsResponse.model_validate(result)
+        providers = {m["provider"] for m in result["models"]}
+        assert providers == {"google", "openai"}
+        assert result["total"] == len(settings_ep._GOOGLE_MODELS) + len(settings_ep._OPENAI_MODELS)
+
+    async def test_ollama_models_tagged_korean(self):
+        """Ollama 모델 중 한국어 특화 모델에 태그 부여"""
+        tags = {"models": [{"name": "EXAONE3.5:7.8b"}, {"name": "llama3:8b"}]}
+        with patch.object(settings_ep, "_fetch_ollama_tags", AsyncMock(return_value=tags)), \
+             patch.object(settings_ep, "get_api_keys_for_user", AsyncMock(return_value=[])):
+            resp = await settings_ep.get_available_models(current_user=MagicMock(id=1), db=MagicMock())
+        result = json.loads(resp.body)
+
+        assert [m["is_korean"] for m in result["models"]] == [True, False]
+
+
+class TestListApiKeys:
+    """API 키 목록 마스킹 테스트"""
+
+    def test_mask_api_key(self):
+        from app.crud.api_key import mask_api_key
+        assert mask_api_key("sk-abcdefghijkl") == "sk-a***jkl"
+        assert mask_api_key("short") == "***"
+
+    async def test_uses_stored_mask_without_decrypt(self):
+        """masked_key가 저장된 행은 복호화하지 않음"""
+        rows = [MagicMock(provider="openai", masked_key="sk-a***jkl", encrypted_key="x")]
+        with patch.object(settings_ep, "get_api_keys_for_user", AsyncMock(return_value=rows)), \
+             patch.object(settings_ep, "adecrypt_values") as decrypt:
+            result = await settings_ep.list_api_keys(current_user=MagicMock(id=1), db=MagicMock())
+
+        decrypt.assert_not_called()
+        assert result.keys[0].masked_key == "sk-a***jkl"
+
+    async def test_legacy_rows_decrypted_in_one_batch(self):
+        """masked_key가 없는 행은 한 번의 배치 복호화로 마스킹 (실패 시 ***)"""
+        from app.core.encryption import encrypt_value
+
+        rows = [
+            MagicMock(provider="openai", masked_key=None, encrypted_key=encrypt_value("sk-abcdefghijkl")),
+            MagicMock(provider="google", masked_key="AIza***xyz", encrypted_key="x"),
+            MagicMock(provider="anthropic", masked_key=None, encrypted_key="broken"),
+        ]
+        with patch.object(settings_ep, "get_api_keys_for_user", AsyncMock(return_value=rows)), \
+             patch.object(settings_ep, "adecrypt_values", wraps=settings_ep.adecrypt_values) as decrypt:
+            result = await settings_ep.list_api_keys(current_user=MagicMock(id=1), db=MagicMock())
+
+        decrypt.assert_called_once()
+        assert [k.masked_key for k in result.keys] == ["sk-a***jkl", "AIza***xyz", "***"]
+
+
+class TestListEndpoints:
+    """DB 연결 / MCP 서버 목록 엔드포인트 테스트"""
+
+    async def test_list_db_connections_excludes_password(self, authenticated_client, db_session):
+        from app.models.db_connection import DbConnection
+        db_session.add(DbConnection(
+            user_id=1, conn_id="c1", name="analytics", db_type="postgresql",
+            host="db", port=5432, database="dw", username="ro",
+            encrypted_password="secret-ciphertext",
+        ))
+        await db_session.flush()
+
+        resp = await authenticated_client.get("/api/v1/settings/db-connections")
+
+        assert resp.status_code == 200
+        conn = next(c for c in resp.json()["connections"] if c["id"] == "c1")
+        assert conn["id"] == "c1" and conn["database"] == "dw"
+        assert "password" not in conn and "encrypted_password" not in conn
+
+    async def test_list_mcp_servers_sorted_with_compat_keys(self, authenticated_client, db_session):
+        from app.models.mcp_server import McpServer
+        db_session.add_all([
+            McpServer(user_id=1, server_id="b", name="B", server_type="sse", sort_order=1),
+            McpServer(user_id=1, server_id="a", name="A", server_type="stdio", sort_order=0),
+        ])
+        await db_session.flush()
+
+        resp = await authenticated_client.get("/api/v1/settings/mcp-servers")
+
+        servers = [s for s in resp.json()["servers"] if s["server_id"] in ("a", "b")]
+        assert [s["server_id"] for s in servers] == ["a", "b"]
+        assert servers[0]["id"] == "a" and servers[0]["type"] == "stdio"
+
+    async def test_reorder_mcp_servers(self, authenticated_client, db_session, flush_on_commit):
+        from app.models.mcp_server import McpServer
+        db_session.add_all([
+            McpServer(user_id=1, server_id="x", name="X", server_type="sse", sort_order=0),
+            McpServer(user_id=1, server_id="y", name="Y", server_type="sse", sort_order=1),
+            McpServer(user_id=1, server_id="z", name="Z", server_type="sse", sort_order=2),
+        ])
+        await db_session.flush()
+
+        resp = await authenticated_client.put(
+            "/api/v1/settings/mcp-servers/reorder", json={"order": ["z", "x"]}
+        )
+        assert resp.status_code == 200
+
+        servers = (await authenticated_client.get("/api/v1/settings/mcp-servers")).json()["servers"]
+        orders = {s["server_id"]: s["sort_order"] for s in servers if s["server_id"] in ("x", "y", "z")}
+        assert orders == {"z": 0, "x": 1, "y": 1}
+
+    async def test_delete_mcp_server_returning(self, authenticated_client, db_session, flush_on_commit):
+        from app.models.mcp_server import McpServer
+        db_session.add(McpServer(user_id=1, server_id="del1", name="ToDelete", server_type="sse"))
+        await db_session.flush()
+
+        resp = await authenticated_client.delete("/api/v1/settings/mcp-servers/del1")
+        missing = await authenticated_client.delete("/api/v1/settings/mcp-servers/del1")
+
+        assert resp.status_code == 200 and "ToDelete" in resp.json()["message"]
+        assert missing.status_code == 404
+
+
+class TestUpserts:
+    """ON CONFLICT 기반 저장 테스트"""
+
+    async def test_save_api_key_upserts_single_row(self, db_session, flush_on_commit):
+        from app.crud.api_key import save_api_key, get_api_keys_for_user
+        from app.core.encryption import decrypt_value
+
+        first = await save_api_key(db_session, 9101, "OpenAI", "sk-first-000000")
+        second = await save_api_key(db_session, 9101, "openai", "sk-second-11111")
+
+        rows = await get_api_keys_for_user(db_session, 9101)
+        assert first.id == second.id and len(rows) == 1
+        assert decrypt_value(rows[0].encrypted_key) == "sk-second-11111"
+        assert rows[0].masked_key == "sk-s***111"
+
+    async def test_create_default_settings_is_idempotent(self, db_session, flush_on_commit):
+        from app.crud.user_settings import create_default_settings, get_or_create_settings
+
+        created = await create_default_settings(db_session, 9102)
+        again = await create_default_settings(db_session, 9102)
+        fetched = await get_or_create_settings(db_session, 9102)
+
+        assert created.id == again.id == fetched.id
+        assert created.llm_model == "gemma3:12b"
+
+    async def test_cached_lookup_rebinds_parameters(self, db_session, flush_on_commit):
+        """lambda_stmt 조회가 호출마다 새 파라미터로 바인딩됨"""
+        from app.crud.api_key import save_api_key, get_api_key_for_user
+
+        await save_api_key(db_session, 9103, "openai", "sk-openai-0000")
+        await save_api_key(db_session, 9103, "groq", "gsk-groq-00000")
+
+        openai = await get_api_key_for_user(db_session, 9103, "OpenAI")
+        groq = await get_api_key_for_user(db_session, 9103, "groq")
+        missing = await get_api_key_for_user(db_session, 9104, "groq")
+        assert (openai.provider, groq.provider, missing) == ("openai", "groq", None)